@@ -48,6 +48,10 @@ class Settings(BaseSettings):
     # Railway mounts volumes to /data, local dev uses relative paths
     VIDEOS_DIR: str = os.getenv("VIDEOS_DIR", os.path.join("static", "videos"))
     SCREENSHOTS_DIR: str = os.getenv("SCREENSHOTS_DIR", os.path.join("static", "screenshots"))
+    SCREENSHOT_WORKERS: int = int(os.getenv("SCREENSHOT_WORKERS", str(min(4, os.cpu_count() or 1))))  # Concurrent FFmpeg screenshot batches
+    SCREENSHOT_URL_WORKERS: int = int(os.getenv("SCREENSHOT_URL_WORKERS", "4"))  # Parallel FFmpeg processes reading screenshots from a video URL
+    SCREENSHOT_JPEG_QUALITY: int = int(os.getenv("SCREENSHOT_JPEG_QUALITY", "5"))  # FFmpeg -q:v for screenshots (2 = best, 31 = worst)
+    SCREENSHOT_WIDTH: int = int(os.getenv("SCREENSHOT_WIDTH", "1280"))  # Max screenshot width in px (smaller frames are not upscaled)
     STATIC_DIR: str = os.getenv("STATIC_DIR", "static")
 
     # Database Configuration - Support Railway persistent volumes
@@ -55,10 +59,29 @@ class Settings(BaseSettings):
     DATABASE_TYPE: str = os.getenv("DATABASE_TYPE", "sqlite")  # "sqlite" or "firestore"
     FIRESTORE_COLLECTION: str = os.getenv("FIRESTORE_COLLECTION", "transcriptions")
 
+    # Logging Configuration
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+
     # Whisper Model Configuration
     FASTWHISPER_MODEL: str = os.getenv("FASTWHISPER_MODEL", "small")
     FASTWHISPER_DEVICE: str = os.getenv("FASTWHISPER_DEVICE", "cpu")
     FASTWHISPER_COMPUTE_TYPE: str = os.getenv("FASTWHISPER_COMPUTE_TYPE", "int8")
+    FASTWHISPER_CPU_THREADS: int = int(os.getenv("FASTWHISPER_CPU_THREADS", "0"))  # 0 = split CPU cores across model workers
+    # Parallel transcribe() calls (model workers). Each worker is a full model replica,
+    # so CUDA defaults to one to keep a single copy in VRAM
+    WHISPER_CONCURRENCY: int = int(os.getenv("WHISPER_CONCURRENCY", "1" if FASTWHISPER_DEVICE == "cuda" else "2"))
+    WHISPER_BEAM_SIZE: int = int(os.getenv("WHISPER_BEAM_SIZE", "1"))  # Default beam for local endpoints (1 = greedy)
+    WHISPER_BATCH_SIZE: int = int(os.getenv("WHISPER_BATCH_SIZE", "8"))  # VAD windows decoded per batch (0 = sequential)
+
+    # Local Translation Configuration
+    TRANSLATION_WORKERS: int = int(os.getenv("TRANSLATION_WORKERS", "2"))  # Threads serving /translate_local/ batches
+    TRANSLATION_NUM_BEAMS: int = int(os.getenv("TRANSLATION_NUM_BEAMS", "1"))  # Beams for batched segment translation (1 = greedy)
+    TRANSLATION_CACHE_SIZE: int = int(os.getenv("TRANSLATION_CACHE_SIZE", "4096"))  # Cached (language, text) segment translations
+    MARIAN_MODEL_CACHE_SIZE: int = int(os.getenv("MARIAN_MODEL_CACHE_SIZE", "4"))  # MarianMT language models kept in memory (LRU)
+    PRELOAD_TRANSLATION_LANGS: str = os.getenv("PRELOAD_TRANSLATION_LANGS", "")  # Comma-separated, e.g. "es,it"
+    PRELOAD_SUMMARIZATION_MODEL: bool = os.getenv("PRELOAD_SUMMARIZATION_MODEL", "false").lower() == "true"
+    PRELOAD_WHISPER_MODEL: bool = os.getenv("PRELOAD_WHISPER_MODEL", "false").lower() == "true"  # Load + warm Whisper at startup
+    SUMMARY_MIN_CHARS: int = int(os.getenv("SUMMARY_MIN_CHARS", "200"))  # Shorter sections are returned verbatim
 
     # Speaker Diarization Configuration
     ENABLE_SPEAKER_DIARIZATION: bool = os.getenv("ENABLE_SPEAKER_DIARIZATION", "true").lower() == "true"
@@ -74,6 +97,9 @@ class Settings(BaseSettings):
 
     # Memory Management Configuration
     EMBEDDING_SEGMENTS_PER_SPEAKER: int = int(os.getenv("EMBEDDING_SEGMENTS_PER_SPEAKER", "5"))
+    SPEAKER_EMBEDDING_CACHE_DIR: str = os.getenv("SPEAKER_EMBEDDING_CACHE_DIR", "speaker_embedding_cache")  # Auto-identify segment embeddings (.npy)
+    SPEAKER_EMBEDDING_CACHE_MAX_MB: int = int(os.getenv("SPEAKER_EMBEDDING_CACHE_MAX_MB", "256"))  # Oldest entries pruned above this size
+    SPEAKER_EMBEDDING_CACHE_MAX_AGE_HOURS: int = int(os.getenv("SPEAKER_EMBEDDING_CACHE_MAX_AGE_HOURS", "168"))  # Entries unused this long are pruned
     ENABLE_MEMORY_LOGGING: bool = os.getenv("ENABLE_MEMORY_LOGGING", "true").lower() == "true"
 
     # LLM Configuration
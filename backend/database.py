@@ -3,8 +3,9 @@ Database operations for transcription storage with SQLite and Firestore backends
 """
 import sqlite3
 import json
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from contextlib import contextmanager
 from datetime import datetime
 
@@ -50,20 +51,41 @@ class DatabaseBackend(ABC):
         """Update the file path for an existing transcription"""
         pass
 
+    def close(self) -> None:
+        """Release resources held by the backend for the calling thread"""
+        pass
+
 
 class SQLiteBackend(DatabaseBackend):
     """SQLite database backend for local development"""
 
     def __init__(self, database_path: str):
         self.database_path = database_path
+        # One connection per thread, reused across calls (sqlite3 connections
+        # must not be shared between threads without external locking)
+        self._local = threading.local()
 
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.database_path)
+        """Context manager yielding this thread's reusable database connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.database_path)
+            # WAL lets readers proceed while a write is in progress
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
         try:
             yield conn
-        finally:
+        except Exception:
+            conn.rollback()
+            raise
+
+    def close(self) -> None:
+        """Close this thread's connection; closing the last one checkpoints the WAL and removes -wal/-shm"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
             conn.close()
 
     def init(self) -> None:
@@ -354,6 +376,29 @@ def get_database_backend() -> DatabaseBackend:
     return _backend
 
 
+# Callbacks notified with the video_hash whenever a stored transcription changes,
+# so in-process caches of transcription data can drop stale entries
+_change_listeners: List[Callable[[str], None]] = []
+
+
+def register_change_listener(callback: Callable[[str], None]) -> None:
+    """Register a callback invoked with video_hash after a transcription is written or deleted"""
+    _change_listeners.append(callback)
+
+
+def _notify_change(video_hash: str) -> None:
+    for callback in _change_listeners:
+        try:
+            callback(video_hash)
+        except Exception as e:
+            print(f"Error in transcription change listener: {str(e)}")
+
+
+def notify_transcription_changed(video_hash: str) -> None:
+    """Notify change listeners of a transcription written outside this module (e.g. a Supabase job result)"""
+    _notify_change(video_hash)
+
+
 # Public API functions for backward compatibility
 def init_db() -> None:
     """Initialize the database"""
@@ -361,6 +406,12 @@ def init_db() -> None:
     backend.init()
 
 
+def close_db() -> None:
+    """Close the calling thread's database connection"""
+    if _backend is not None:
+        _backend.close()
+
+
 def store_transcription(
     video_hash: str,
     filename: str,
@@ -369,7 +420,9 @@ def store_transcription(
 ) -> bool:
     """Store transcription data in the database"""
     backend = get_database_backend()
-    return backend.store_transcription(video_hash, filename, transcription_data, file_path)
+    result = backend.store_transcription(video_hash, filename, transcription_data, file_path)
+    _notify_change(video_hash)
+    return result
 
 
 def get_transcription(video_hash: str) -> Optional[Dict]:
@@ -387,10 +440,14 @@ def list_transcriptions() -> List[Dict]:
 def delete_transcription(video_hash: str) -> bool:
     """Delete a transcription from the database"""
     backend = get_database_backend()
-    return backend.delete_transcription(video_hash)
+    result = backend.delete_transcription(video_hash)
+    _notify_change(video_hash)
+    return result
 
 
 def update_file_path(video_hash: str, file_path: str) -> bool:
     """Update the file path for an existing transcription"""
     backend = get_database_backend()
-    return backend.update_file_path(video_hash, file_path)
+    result = backend.update_file_path(video_hash, file_path)
+    _notify_change(video_hash)
+    return result
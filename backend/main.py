@@ -4,8 +4,9 @@ Refactored with organized structure, Pydantic models, and proper documentation
 """
 import os
 import asyncio
+import hashlib
+import logging
 import tempfile
-import shutil
 import time
 import subprocess
 import uuid
@@ -39,7 +40,7 @@ from config import settings as app_settings
 from database import init_db, get_transcription, store_transcription
 from dependencies import get_whisper_model, get_speaker_diarizer
 import dependencies
-from utils.file_utils import generate_file_hash
+from utils.file_utils import link_or_copy
 from utils.time_utils import format_timestamp, format_eta
 from services.audio_service import AudioService
 from services.video_service import VideoService
@@ -58,6 +59,14 @@ except ImportError as e:
     print(f"Warning: LLM features not available: {str(e)}")
     LLM_AVAILABLE = False
 
+# Route module loggers (logger = logging.getLogger(__name__)) to stderr alongside uvicorn's output.
+# force=True: audio_analyzer (imported via dependencies) already called basicConfig at import time
+logging.basicConfig(
+    level=app_settings.LOG_LEVEL,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    force=True,
+)
+
 # Disable docs in production for security
 is_production = os.getenv("ENVIRONMENT", "development") == "production"
 
@@ -105,6 +114,17 @@ async def startup_event():
     print(f"- Videos directory: {app_settings.VIDEOS_DIR}")
     print(f"- Screenshots directory: {app_settings.SCREENSHOTS_DIR}")
 
+    # Create the shared Supabase clients up front so the first authenticated
+    # request doesn't pay client construction + TLS setup. Both are process-wide
+    # singletons reused by every router via SupabaseService.get_client().
+    if app_settings.SUPABASE_URL and app_settings.SUPABASE_SERVICE_KEY:
+        try:
+            from services.supabase_service import SupabaseService
+            SupabaseService.get_client()
+            SupabaseService.get_auth_client()
+        except Exception as e:
+            print(f"- Supabase client init failed (non-critical): {e}")
+
     # Start background model preloading to avoid cold-start 504s
     from model_preloader import start_preloading
     start_preloading()
@@ -267,7 +287,16 @@ async def transcribe_video(
 
             print("\nUploading video...")
             try:
-                with open(temp_input_path, "wb") as buffer:
+                # Write off the event loop and hash each chunk as it is written, so the
+                # saved file is never read back just to compute the video hash
+                upload_hash = hashlib.sha256()
+
+                def write_chunk(chunk: bytes) -> None:
+                    buffer.write(chunk)
+                    upload_hash.update(chunk)
+
+                buffer = await asyncio.to_thread(open, temp_input_path, "wb")
+                try:
                     while chunk := await file.read(CHUNK_SIZE):
                         total_size += len(chunk)
                         if total_size > app_settings.MAX_UPLOAD_SIZE:
@@ -275,15 +304,17 @@ async def transcribe_video(
                                 status_code=413,
                                 detail="File too large. Maximum size is 10GB."
                             )
-                        buffer.write(chunk)
+                        await asyncio.to_thread(write_chunk, chunk)
                         print(f"Uploaded: {total_size / (1024*1024):.1f} MB", end="\r")
+                finally:
+                    await asyncio.to_thread(buffer.close)
                 print(f"\nUpload completed. Total size: {total_size / (1024*1024):.1f} MB")
             except Exception as e:
                 print(f"Upload error: {str(e)}")
                 raise HTTPException(status_code=400, detail=f"Error uploading file: {str(e)}")
 
-            # Generate hash for the file
-            video_hash = generate_file_hash(temp_input_path)
+            # Hash of the uploaded content (same SHA-256 as generate_file_hash)
+            video_hash = upload_hash.hexdigest()
             print(f"Generated hash for video: {video_hash}")
 
             # Check if we already have a transcription for this file
@@ -299,7 +330,7 @@ async def transcribe_video(
             # Save a permanent copy
             permanent_file_path = os.path.join(app_settings.VIDEOS_DIR, f"{video_hash}{file_extension}")
             if not os.path.exists(permanent_file_path):
-                shutil.copy2(temp_input_path, permanent_file_path)
+                await _run_blocking(link_or_copy, temp_input_path, permanent_file_path)
                 print(f"Saved permanent copy to: {permanent_file_path}")
 
             # Convert MKV to MP4 if needed
@@ -337,33 +368,38 @@ async def transcribe_video(
             for i, chunk_path in enumerate(audio_chunks):
                 print(f"\nProcessing chunk {i+1}/{total_chunks}")
 
-                segments, info = await _run_blocking(
-                    whisper_model.transcribe,
-                    chunk_path,
-                    task="transcribe",
-                    language=language if language else None,
-                    beam_size=1
-                )
+                def transcribe_chunk(path: str):
+                    # Whisper decodes lazily while its generator is consumed, so drain it on
+                    # the worker thread, keeping only (start, end, text) per segment
+                    segments, info = whisper_model.transcribe(
+                        path,
+                        task="transcribe",
+                        language=language if language else None,
+                        beam_size=1
+                    )
+                    return [(seg.start, seg.end, seg.text) for seg in segments], info
+
+                segments, info = await _run_blocking(transcribe_chunk, chunk_path)
 
                 if audio_language is None:
                     audio_language = info.language
 
                 # Process segments (with overlap handling)
                 chunk_offset = i * 300
-                segments_list = list(segments)
 
-                for seg in segments_list:
+                for start, end, text in segments:
                     all_segments.append({
-                        'start': seg.start + chunk_offset,
-                        'end': seg.end + chunk_offset,
-                        'text': seg.text
+                        'start': start + chunk_offset,
+                        'end': end + chunk_offset,
+                        'text': text
                     })
+                    full_text.append(text)
 
             # Create combined response
             response_language = audio_language or "en"
 
             # Translate if needed
-            if response_language.lower() not in ['en', 'english']:
+            if response_language.lower() not in transcription.ENGLISH_LANGUAGE_CODES:
                 print(f"\nTranslating from {response_language}...")
                 all_segments = await _run_blocking(
                     TranslationService.translate_segments, all_segments, response_language
@@ -378,15 +414,16 @@ async def transcribe_video(
             # Extract screenshots for video files
             if file_extension in {'.mp4', '.mpeg', '.webm', '.mov', '.mkv'}:
                 print("\nExtracting screenshots...")
-                for segment in all_segments:
-                    screenshot_filename = f"{video_hash}_{segment['start']:.2f}.jpg"
-                    screenshot_path = os.path.join(screenshots_dir, screenshot_filename)
-
-                    result = await _run_blocking(
-                        VideoService.extract_screenshot, temp_input_path, segment['start'], screenshot_path
-                    )
+                screenshot_filenames = [f"{video_hash}_{segment['start']:.2f}.jpg" for segment in all_segments]
+                results = await _run_blocking(
+                    VideoService.extract_screenshots, temp_input_path, [
+                        (segment['start'], os.path.join(screenshots_dir, filename))
+                        for segment, filename in zip(all_segments, screenshot_filenames)
+                    ]
+                )
+                for segment, filename, result in zip(all_segments, screenshot_filenames, results):
                     if result:
-                        segment['screenshot_url'] = f"/static/screenshots/{screenshot_filename}"
+                        segment['screenshot_url'] = f"/static/screenshots/{filename}"
 
                 # Upload screenshots to GCS so they survive container restarts
                 if app_settings.ENABLE_GCS_UPLOADS:
@@ -422,9 +459,10 @@ async def transcribe_video(
 
             # Format final segments
             formatted_segments = []
-            for seg in all_segments:
+            id_prefix = uuid.uuid4().hex[:12]  # One random prefix per transcription + segment index
+            for i, seg in enumerate(all_segments):
                 formatted_segments.append({
-                    "id": str(uuid.uuid4()),
+                    "id": f"{id_prefix}-{i}",
                     "start": seg.get('start'),
                     "end": seg.get('end'),
                     "start_time": format_timestamp(seg.get('start')),
@@ -441,7 +479,7 @@ async def transcribe_video(
                 "filename": file.filename,
                 "video_hash": video_hash,
                 "transcription": {
-                    "text": " ".join([seg.get('text', '') for seg in all_segments]),
+                    "text": " ".join(full_text),
                     "language": response_language,
                     "duration": format_eta(int(processing_time)),
                     "segments": formatted_segments,
@@ -468,3 +468,21 @@ def clear_token_cache(token: str) -> None:
 def clear_all_token_cache() -> None:
     """Clear entire token verification cache."""
     _token_cache.clear()
+
+
+def update_cached_profile(user_id: str, updates: Dict[str, Any]) -> None:
+    """
+    Apply profile changes to every cached session of a user.
+
+    Keeps request.state.profile in sync after a profile write made on this
+    instance. Other instances keep their cached copy until it expires, so
+    don't treat it as the current user_profiles row.
+
+    Args:
+        user_id: User UUID
+        updates: Column values just written to user_profiles
+    """
+    for cached in _token_cache.values():
+        profile = cached.get("profile")
+        if profile and profile.get("id") == user_id:
+            profile.update(updates)
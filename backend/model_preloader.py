@@ -6,6 +6,9 @@ before the first chat request arrives. Models are loaded in priority order:
 1. pyannote/embedding (speaker recognition) — the 30-45s bottleneck
 2. CLIP clip-ViT-B-32 (image search)
 3. InsightFace buffalo_l (face detection)
+4. MarianMT / CTranslate2 translators for PRELOAD_TRANSLATION_LANGS (optional)
+5. BART summarization (optional, PRELOAD_SUMMARIZATION_MODEL)
+6. faster-whisper, warmed with a short silent decode (optional, PRELOAD_WHISPER_MODEL)
 """
 
 import threading
@@ -17,6 +20,9 @@ _preload_status = {
     "speaker_recognition": "pending",
     "clip": "pending",
     "insightface": "pending",
+    "translation": "pending",
+    "summarization": "pending",
+    "whisper": "pending",
     "start_time": None,
     "ready_time": None,
 }
@@ -64,6 +70,52 @@ def _preload_models():
         _preload_status["insightface"] = f"failed: {e}"
         print(f"[Preloader] InsightFace failed: {e}")
 
+    # 4. Translation models for configured languages
+    from config import settings
+    languages = [lang.strip() for lang in settings.PRELOAD_TRANSLATION_LANGS.split(",") if lang.strip()]
+    if languages:
+        try:
+            print(f"[Preloader] Loading translation models: {', '.join(languages)}")
+            from services.translation_service import TranslationService
+            loaded = TranslationService.preload_languages(languages)
+            _preload_status["translation"] = f"loaded: {', '.join(loaded)}" if loaded else "failed"
+            print("[Preloader] Translation models ready")
+        except Exception as e:
+            _preload_status["translation"] = f"failed: {e}"
+            print(f"[Preloader] Translation failed: {e}")
+    else:
+        _preload_status["translation"] = "skipped"
+
+    # 5. Summarization model
+    if settings.PRELOAD_SUMMARIZATION_MODEL:
+        try:
+            print("[Preloader] Loading summarization model...")
+            from services.summarization_service import SummarizationService
+            if SummarizationService._ensure_model():
+                _preload_status["summarization"] = "loaded"
+                print("[Preloader] Summarization model ready")
+            else:
+                _preload_status["summarization"] = "failed"
+        except Exception as e:
+            _preload_status["summarization"] = f"failed: {e}"
+            print(f"[Preloader] Summarization failed: {e}")
+    else:
+        _preload_status["summarization"] = "skipped"
+
+    # 6. Whisper model (otherwise loaded lazily on the first transcription)
+    if settings.PRELOAD_WHISPER_MODEL:
+        try:
+            print("[Preloader] Loading and warming up Whisper model...")
+            from dependencies import warm_up_whisper_model
+            warm_up_whisper_model()
+            _preload_status["whisper"] = "loaded"
+            print("[Preloader] Whisper model ready")
+        except Exception as e:
+            _preload_status["whisper"] = f"failed: {e}"
+            print(f"[Preloader] Whisper failed: {e}")
+    else:
+        _preload_status["whisper"] = "skipped"
+
     elapsed = time.time() - _preload_status["start_time"]
     print(f"[Preloader] All models loaded in {elapsed:.1f}s")
 
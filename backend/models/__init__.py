@@ -29,7 +29,8 @@ from models.speaker import (
     EnrollSpeakerResponse,
     ListSpeakersResponse,
     IdentifySpeakerResponse,
-    AutoIdentifySpeakersResponse
+    AutoIdentifySpeakersResponse,
+    RenameSpeakerRequest
 )
 from models.chat import (
     IndexVideoRequest,
@@ -83,6 +84,7 @@ __all__ = [
     "ListSpeakersResponse",
     "IdentifySpeakerResponse",
     "AutoIdentifySpeakersResponse",
+    "RenameSpeakerRequest",
     # Chat
     "IndexVideoRequest",
     "IndexVideoResponse",
@@ -97,3 +97,18 @@ class AutoIdentifySpeakersResponse(BaseModel):
             }
         }
     }
+
+
+class RenameSpeakerRequest(BaseModel):
+    """Request to rename a speaker across a transcription"""
+    original_speaker: str = Field(..., min_length=1, description="Current speaker label or name")
+    new_speaker_name: str = Field(..., min_length=1, description="New speaker name")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "original_speaker": "SPEAKER_00",
+                "new_speaker_name": "John Doe"
+            }
+        }
+    }
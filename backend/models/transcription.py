@@ -1,7 +1,7 @@
 """
 Transcription-related Pydantic models
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from pydantic import BaseModel, Field
 from models.audio_events import AudioEvent, SpeechEmotion, AudioAnalysis
 
@@ -145,7 +145,9 @@ class UpdateSpeakerRequest(BaseModel):
 
 class TranslationRequest(BaseModel):
     """Request to translate text"""
-    text: str = Field(..., description="Text to translate")
+    text: Union[str, List[str]] = Field(
+        ..., description="Text to translate, or a list of texts to stream back as NDJSON"
+    )
     source_lang: str = Field(..., description="Source language code (e.g., 'es', 'it')")
 
     model_config = {
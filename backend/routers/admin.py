@@ -11,6 +11,7 @@ import uuid
 
 from middleware.auth import require_admin
 from services.supabase_service import SupabaseService
+from services.key_validator import invalidate_keys_cache
 
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
@@ -248,6 +249,7 @@ async def invalidate_user_keys(request: Request, user_id: str):
 
         # Delete all API keys for user
         response = client.table("user_api_keys").delete().eq("user_id", user_id).execute()
+        invalidate_keys_cache(user_id)
 
         key_count = len(response.data) if response.data else 0
 
@@ -346,11 +346,11 @@ async def verify_email(request: VerifyEmailRequest, response: Response):
             client.table("user_profiles")
             .select("email")
             .eq("id", request.user_id)
-            .single()
+            .maybe_single()
             .execute()
         )
 
-        if not user_response.data:
+        if not user_response or not user_response.data:
             raise HTTPException(status_code=404, detail="User not found")
 
         email = user_response.data["email"]
@@ -115,7 +115,7 @@ async def _get_saved_provider_key(user_id: Optional[str], provider_name: Optiona
 
     try:
         from services.supabase_service import SupabaseService
-        from services.encryption import get_encryption_key, decrypt_api_key
+        from services.encryption import get_encryption_key_cached, decrypt_api_key
 
         client = SupabaseService.get_client()
         response = (
@@ -134,7 +134,7 @@ async def _get_saved_provider_key(user_id: Optional[str], provider_name: Optiona
         if row.get("is_valid") is not True:
             return None
 
-        encryption_key = await get_encryption_key()
+        encryption_key = await get_encryption_key_cached()
         return decrypt_api_key(row["encrypted_key"], encryption_key)
     except Exception as e:
         print(f"[Chat] Could not load saved key for provider {provider_name}: {e}")
@@ -16,6 +16,7 @@ from fastapi.responses import Response
 from pydantic import BaseModel
 
 from config import settings
+from database import notify_transcription_changed
 from middleware.auth import require_auth, require_admin, optional_auth
 
 logger = logging.getLogger(__name__)
@@ -870,10 +871,12 @@ async def check_stale_jobs(request: Request, background_tasks: BackgroundTasks):
     """
     try:
         from services.job_queue_service import JobQueueService
-        from services.key_validator import sweep_stuck_pending_keys
+        from services.key_validator import revalidate_pending_keys, sweep_stuck_pending_keys
 
-        # Self-heal API keys stuck in 'pending' validation so the frontend stops
-        # polling /api/keys every 2s for them (see PENDING_KEY_STALE_SECONDS).
+        # Retry validations lost with their instance, then self-heal API keys still
+        # stuck in 'pending' so the frontend stops polling /api/keys every 2s for
+        # them (see PENDING_KEY_STALE_SECONDS).
+        await revalidate_pending_keys()
         sweep_stuck_pending_keys()
 
         recovered_job_id = JobQueueService.check_and_recover_stale_jobs()
@@ -984,6 +987,7 @@ async def refresh_screenshot_urls(request: Request):
                 vh = job.get("video_hash")
                 if vh:
                     video_hashes.add(vh)
+                    notify_transcription_changed(vh)
             except Exception:
                 logger.exception("[Jobs] refresh-screenshot-urls failed for job %s", job.get("id"))
                 failed += 1
@@ -5,21 +5,34 @@ Handles user API keys for LLM providers (groq, xai, openai, anthropic, deepseek)
 Keys are encrypted at rest using AES-256-GCM.
 """
 import asyncio
+import logging
 from fastapi import APIRouter, HTTPException, Request, BackgroundTasks
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from postgrest.types import ReturnMethod
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 from middleware.auth import require_auth
 from services.supabase_service import SupabaseService
-from services.encryption import encrypt_api_key, get_encryption_key, get_key_suffix
-from services.key_validator import validate_api_key_async, test_provider_key_sync
+from services.encryption import encrypt_api_key, get_encryption_key_cached, get_key_suffix
+from services.key_validator import (
+    validate_api_key_async,
+    test_provider_key_sync,
+    get_cached_keys,
+    cache_keys,
+    invalidate_keys_cache,
+)
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/keys", tags=["API Keys"])
 
-# Supported providers
-SUPPORTED_PROVIDERS = ["groq", "xai", "openai", "anthropic", "deepseek"]
+# Supported providers (tuple keeps the display order for error messages)
+_PROVIDER_ORDER = ("groq", "xai", "openai", "anthropic", "deepseek")
+SUPPORTED_PROVIDERS = frozenset(_PROVIDER_ORDER)
+INVALID_PROVIDER_MESSAGE = f"Invalid provider. Must be one of: {', '.join(_PROVIDER_ORDER)}"
 
 
 # =============================================================================
@@ -83,31 +96,28 @@ async def list_keys(request: Request):
     """
     try:
         user_id = request.state.user["id"]
-        client = SupabaseService.get_client()
 
-        response = (
-            client.table("user_api_keys")
-            .select("provider, key_suffix, is_valid, validation_error, validated_at, created_at")
-            .eq("user_id", user_id)
-            .order("created_at", desc=False)
-            .execute()
-        )
+        rows = get_cached_keys(user_id)
+        if rows is None:
+            client = SupabaseService.get_client()
 
-        keys = []
-        for row in response.data:
-            keys.append(APIKeyInfo(
-                provider=row["provider"],
-                key_suffix=row["key_suffix"],
-                is_valid=row.get("is_valid"),
-                validation_error=row.get("validation_error"),
-                validated_at=row.get("validated_at"),
-                created_at=row["created_at"]
-            ))
-
-        return keys
-
-    except Exception as e:
-        print(f"[Keys] Error listing keys: {e}")
+            response = (
+                client.table("user_api_keys")
+                .select("provider, key_suffix, is_valid, validation_error, validated_at, created_at")
+                .eq("user_id", user_id)
+                .order("created_at", desc=False)
+                .execute()
+            )
+            rows = response.data or []
+            cache_keys(user_id, rows)
+
+        # Rows already have exactly the APIKeyInfo columns (see select above), so
+        # return them as-is instead of building and re-validating a model per row.
+        # None fields are kept: the frontend polls while is_valid is null.
+        return JSONResponse(content=rows)
+
+    except Exception:
+        logger.exception("[Keys] Error listing keys")
         raise HTTPException(status_code=500, detail="Failed to list API keys")
 
 
@@ -127,7 +137,7 @@ async def add_key(request: Request, body: AddKeyRequest, background_tasks: Backg
         if body.provider not in SUPPORTED_PROVIDERS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid provider. Must be one of: {', '.join(SUPPORTED_PROVIDERS)}"
+                detail=INVALID_PROVIDER_MESSAGE
             )
 
         # Validate key not empty
@@ -141,46 +151,27 @@ async def add_key(request: Request, body: AddKeyRequest, background_tasks: Backg
         client = SupabaseService.get_client()
 
         # Get encryption key
-        encryption_key = await get_encryption_key()
+        encryption_key = await get_encryption_key_cached()
 
         # Encrypt API key
         encrypted_key = encrypt_api_key(body.api_key, encryption_key)
         key_suffix = get_key_suffix(body.api_key)
 
-        # Check if key already exists for this provider
-        existing = (
-            client.table("user_api_keys")
-            .select("id")
-            .eq("user_id", user_id)
-            .eq("provider", body.provider)
-            .execute()
-        )
-
-        if existing.data and len(existing.data) > 0:
-            # Update existing key
-            client.table("user_api_keys").update({
-                "encrypted_key": encrypted_key,
-                "key_suffix": key_suffix,
-                "is_valid": None,  # Reset validation status
-                "validation_error": None,
-                "validated_at": None,
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("user_id", user_id).eq("provider", body.provider).execute()
-
-            print(f"[Keys] Updated key for user {user_id}, provider {body.provider}")
-        else:
-            # Insert new key
-            client.table("user_api_keys").insert({
-                "user_id": user_id,
-                "provider": body.provider,
-                "encrypted_key": encrypted_key,
-                "key_suffix": key_suffix,
-                "is_valid": None,  # Pending validation
-                "validation_error": None,
-                "validated_at": None
-            }).execute()
-
-            print(f"[Keys] Added new key for user {user_id}, provider {body.provider}")
+        # Single UPSERT on the UNIQUE(user_id, provider) constraint instead of
+        # SELECT-then-UPDATE/INSERT (one round trip to Supabase instead of two)
+        client.table("user_api_keys").upsert({
+            "user_id": user_id,
+            "provider": body.provider,
+            "encrypted_key": encrypted_key,
+            "key_suffix": key_suffix,
+            "is_valid": None,  # Reset/pending validation status
+            "validation_error": None,
+            "validated_at": None,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
+        }, on_conflict="user_id,provider", returning=ReturnMethod.minimal).execute()
+        invalidate_keys_cache(user_id)
+
+        print(f"[Keys] Saved key for user {user_id}, provider {body.provider}")
 
         # Trigger async validation in background
         background_tasks.add_task(
@@ -199,10 +190,8 @@ async def add_key(request: Request, body: AddKeyRequest, background_tasks: Backg
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"[Keys] Error adding key: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("[Keys] Error adding key")
         raise HTTPException(status_code=500, detail="Failed to save API key")
 
 
@@ -221,22 +210,23 @@ async def delete_key(request: Request, provider: str):
         if provider not in SUPPORTED_PROVIDERS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid provider. Must be one of: {', '.join(SUPPORTED_PROVIDERS)}"
+                detail=INVALID_PROVIDER_MESSAGE
             )
 
         user_id = request.state.user["id"]
         client = SupabaseService.get_client()
 
-        # Delete key
+        # Delete key (only the affected-row count is needed, not the rows)
         response = (
             client.table("user_api_keys")
-            .delete()
+            .delete(count="exact", returning=ReturnMethod.minimal)
             .eq("user_id", user_id)
             .eq("provider", provider)
             .execute()
         )
+        invalidate_keys_cache(user_id)
 
-        if not response.data or len(response.data) == 0:
+        if not response.count:
             raise HTTPException(
                 status_code=404,
                 detail=f"No API key found for provider: {provider}"
@@ -251,8 +241,8 @@ async def delete_key(request: Request, provider: str):
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"[Keys] Error deleting key: {e}")
+    except Exception:
+        logger.exception("[Keys] Error deleting key")
         raise HTTPException(status_code=500, detail="Failed to delete API key")
 
 
@@ -273,7 +263,7 @@ async def test_key(request: Request, provider: str, body: Optional[TestKeyReques
         if provider not in SUPPORTED_PROVIDERS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid provider. Must be one of: {', '.join(SUPPORTED_PROVIDERS)}"
+                detail=INVALID_PROVIDER_MESSAGE
             )
 
         user_id = request.state.user["id"]
@@ -291,11 +281,13 @@ async def test_key(request: Request, provider: str, body: Optional[TestKeyReques
                 .select("encrypted_key")
                 .eq("user_id", user_id)
                 .eq("provider", provider)
-                .single()
+                .maybe_single()
                 .execute()
             )
 
-            if not response.data:
+            # maybe_single() yields no data (or no response) when the key is missing,
+            # instead of raising like single()
+            if not response or not response.data:
                 raise HTTPException(
                     status_code=404,
                     detail=f"No saved API key found for provider: {provider}"
@@ -303,7 +295,7 @@ async def test_key(request: Request, provider: str, body: Optional[TestKeyReques
 
             # Decrypt saved key
             from services.encryption import decrypt_api_key
-            encryption_key = await get_encryption_key()
+            encryption_key = await get_encryption_key_cached()
             test_key_value = decrypt_api_key(response.data["encrypted_key"], encryption_key)
 
         # Test the key
@@ -317,8 +309,6 @@ async def test_key(request: Request, provider: str, body: Optional[TestKeyReques
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"[Keys] Error testing key: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("[Keys] Error testing key")
         raise HTTPException(status_code=500, detail="Failed to test API key")
@@ -3,15 +3,21 @@ User settings router.
 
 Handles user profile settings and account deletion.
 """
+import asyncio
+import logging
 from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
+from postgrest.types import ReturnMethod
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
-from middleware.auth import require_auth
+from middleware.auth import require_auth, update_cached_profile
+from routers.keys import SUPPORTED_PROVIDERS, INVALID_PROVIDER_MESSAGE
 from services.supabase_service import SupabaseService
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/settings", tags=["Settings"])
 
 
@@ -63,11 +69,10 @@ async def update_settings(request: Request, body: UpdateSettingsRequest):
 
         if body.default_llm_provider is not None:
             # Validate provider
-            valid_providers = ["groq", "xai", "openai", "anthropic", "deepseek"]
-            if body.default_llm_provider not in valid_providers:
+            if body.default_llm_provider not in SUPPORTED_PROVIDERS:
                 raise HTTPException(
                     status_code=400,
-                    detail=f"Invalid provider. Must be one of: {', '.join(valid_providers)}"
+                    detail=INVALID_PROVIDER_MESSAGE
                 )
             updates["default_llm_provider"] = body.default_llm_provider
 
@@ -84,10 +89,13 @@ async def update_settings(request: Request, body: UpdateSettingsRequest):
             )
 
         # Add updated_at timestamp
-        updates["updated_at"] = datetime.utcnow().isoformat()
+        updates["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
 
         # Update database
-        client.table("user_profiles").update(updates).eq("id", user_id).execute()
+        client.table("user_profiles").update(
+            updates, returning=ReturnMethod.minimal
+        ).eq("id", user_id).execute()
+        update_cached_profile(user_id, updates)
 
         print(f"[Settings] Updated settings for user {user_id}: {list(updates.keys())}")
 
@@ -98,8 +106,8 @@ async def update_settings(request: Request, body: UpdateSettingsRequest):
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"[Settings] Error updating settings: {e}")
+    except Exception:
+        logger.exception("[Settings] Error updating settings")
         raise HTTPException(status_code=500, detail="Failed to update settings")
 
 
@@ -116,15 +124,21 @@ async def delete_account(request: Request, response: Response):
         user_id = request.state.user["id"]
         client = SupabaseService.get_client()
 
-        # Delete user profile (cascades to related tables)
-        profile_response = client.table("user_profiles").delete().eq("id", user_id).execute()
+        # Delete user profile (cascades to related tables). Only once it is gone is
+        # the auth user removed, so a failure here never leaves a half-deleted account.
+        profile_result = await asyncio.to_thread(
+            lambda: client.table("user_profiles")
+            .delete(count="exact", returning=ReturnMethod.minimal)
+            .eq("id", user_id)
+            .execute()
+        )
 
-        if not profile_response.data or len(profile_response.data) == 0:
+        if not profile_result.count:
             raise HTTPException(status_code=404, detail="User profile not found")
 
         # Delete from Supabase auth
         try:
-            client.auth.admin.delete_user(user_id)
+            await asyncio.to_thread(client.auth.admin.delete_user, user_id)
         except Exception as e:
             print(f"[Settings] Failed to delete auth user (non-critical): {e}")
 
@@ -140,6 +154,6 @@ async def delete_account(request: Request, response: Response):
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"[Settings] Error deleting account: {e}")
+    except Exception:
+        logger.exception("[Settings] Error deleting account")
         raise HTTPException(status_code=500, detail="Failed to delete account")
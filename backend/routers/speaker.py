@@ -1,25 +1,41 @@
 """
 Speaker recognition endpoints
 """
+import asyncio
+import logging
 import os
 import tempfile
 from typing import Dict
 from fastapi import APIRouter, HTTPException, UploadFile, Form, Request
 
-from database import store_transcription
-from routers.transcription import get_transcription_from_any_source
+from database import store_transcription, notify_transcription_changed
+from services.transcription_cache import get_transcription_from_any_source
 from dependencies import _last_transcription_data
 from middleware.auth import require_auth
 from models import (
     EnrollSpeakerResponse,
     ListSpeakersResponse,
+    RenameSpeakerRequest,
     SuccessResponse,
     ErrorResponse
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/speaker", tags=["Speaker Recognition"])
 
 
+async def _save_upload_to_temp(audio_file: UploadFile) -> str:
+    """Stream an uploaded audio file to a temp .wav without blocking the event loop"""
+    tmp = await asyncio.to_thread(tempfile.NamedTemporaryFile, delete=False, suffix=".wav")
+    try:
+        while chunk := await audio_file.read(1024 * 1024):  # 1MB chunks
+            await asyncio.to_thread(tmp.write, chunk)
+    finally:
+        await asyncio.to_thread(tmp.close)
+    return tmp.name
+
+
 @router.post(
     "/enroll",
     response_model=EnrollSpeakerResponse,
@@ -54,10 +70,7 @@ async def enroll_speaker_endpoint(
         # Determine audio source
         if audio_file:
             # Save uploaded audio file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-                content = await audio_file.read()
-                tmp.write(content)
-                audio_path = tmp.name
+            audio_path = await _save_upload_to_temp(audio_file)
         elif video_hash:
             # Get video from existing transcription
             transcription = get_transcription_from_any_source(video_hash)
@@ -80,7 +93,7 @@ async def enroll_speaker_endpoint(
 
         # Cleanup temp file if uploaded
         if audio_file and os.path.exists(audio_path):
-            os.remove(audio_path)
+            await asyncio.to_thread(os.remove, audio_path)
 
         if success:
             return EnrollSpeakerResponse(
@@ -94,9 +107,7 @@ async def enroll_speaker_endpoint(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in speaker enrollment: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Speaker] Error in speaker enrollment")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -116,12 +127,11 @@ async def list_speakers(request: Request) -> ListSpeakersResponse:
         from speaker_recognition import get_speaker_recognition_system
         sr_system = get_speaker_recognition_system()
 
-        speakers = sr_system.list_speakers()
-        speaker_info = [sr_system.get_speaker_info(name) for name in speakers]
+        speaker_info = sr_system.list_speakers_info()
 
         return ListSpeakersResponse(
             speakers=speaker_info,
-            count=len(speakers)
+            count=len(speaker_info)
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -156,10 +166,7 @@ async def identify_speaker_endpoint(
 
         # Determine audio source
         if audio_file:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-                content = await audio_file.read()
-                tmp.write(content)
-                audio_path = tmp.name
+            audio_path = await _save_upload_to_temp(audio_file)
         elif video_hash:
             transcription = get_transcription_from_any_source(video_hash)
             if not transcription or 'file_path' not in transcription:
@@ -181,7 +188,7 @@ async def identify_speaker_endpoint(
 
         # Cleanup temp file
         if audio_file and os.path.exists(audio_path):
-            os.remove(audio_path)
+            await asyncio.to_thread(os.remove, audio_path)
 
         return {
             "speaker": speaker_name,
@@ -191,7 +198,7 @@ async def identify_speaker_endpoint(
         }
 
     except Exception as e:
-        print(f"Error in speaker identification: {e}")
+        logger.exception("[Speaker] Error in speaker identification")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -248,12 +255,12 @@ async def auto_identify_speakers(request: Request, video_hash: str, threshold: f
         from speaker_recognition import get_speaker_recognition_system
         sr_system = get_speaker_recognition_system()
 
-        # Get transcription
-        transcription = get_transcription_from_any_source(video_hash)
+        # Get transcription (uncached: it is modified and written back below)
+        transcription = get_transcription_from_any_source(video_hash, use_cache=False)
         if not transcription:
             raise HTTPException(status_code=404, detail="Transcription not found")
 
-        if not sr_system.list_speakers():
+        if not sr_system.speaker_database:
             raise HTTPException(
                 status_code=400,
                 detail="No speakers enrolled. Please enroll speakers first."
@@ -269,29 +276,35 @@ async def auto_identify_speakers(request: Request, video_hash: str, threshold: f
 
         print(f"Auto-identifying speakers for {len(segments)} segments...")
 
+        # Embed every segment from a single decode of the file, then match all
+        # of them against the enrolled speakers in one batched pass
+        segment_ranges = []
         for segment in segments:
             start = segment.get('start', 0)
-            end = segment.get('end', start + 1)
-
-            # Identify speaker for this segment
-            speaker_name, confidence = sr_system.identify_speaker(
-                video_path,
-                start,
-                end,
-                threshold
-            )
+            segment_ranges.append((start, segment.get('end', start + 1)))
+
+        matches = sr_system.identify_speakers_batch(
+            video_path, segment_ranges, threshold, cache_key=video_hash
+        )
 
+        # One summary line instead of a print per segment; keep a few examples
+        sample = []
+        for segment, (start, _end), (speaker_name, confidence) in zip(segments, segment_ranges, matches):
             if speaker_name:
                 segment['speaker'] = speaker_name
                 segment['speaker_confidence'] = confidence
                 identified_count += 1
-                print(f"Segment [{start:.1f}s]: Identified as {speaker_name} ({confidence:.3f})")
-            else:
-                # Keep original speaker label if no match
-                print(f"Segment [{start:.1f}s]: No confident match ({confidence:.3f})")
+            # else: keep original speaker label if no match
+            if len(sample) < 5:
+                sample.append(f"{start:.1f}s={speaker_name or '-'}({confidence:.3f})")
 
             updated_segments.append(segment)
 
+        logger.info(
+            "[Speaker] auto_identify video=%s identified=%d/%d sample=%s",
+            video_hash, identified_count, len(segments), sample
+        )
+
         # Update transcription with identified speakers
         transcription['transcription']['segments'] = updated_segments
 
@@ -313,9 +326,7 @@ async def auto_identify_speakers(request: Request, video_hash: str, threshold: f
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in auto-identify: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Speaker] Error in auto-identify")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -331,18 +342,14 @@ async def auto_identify_speakers(request: Request, video_hash: str, threshold: f
     }
 )
 @require_auth
-async def update_speaker_name(request: Request, video_hash: str) -> Dict:
+async def update_speaker_name(request: Request, video_hash: str, body: RenameSpeakerRequest) -> Dict:
     """Update a speaker's name in a transcription"""
     try:
-        body = await request.json()
-        original_speaker = body.get("original_speaker")
-        new_speaker_name = body.get("new_speaker_name")
-
-        if not original_speaker or not new_speaker_name:
-            raise HTTPException(status_code=400, detail="Missing original_speaker or new_speaker_name")
+        original_speaker = body.original_speaker
+        new_speaker_name = body.new_speaker_name
 
-        # Get existing transcription
-        transcription_data = get_transcription_from_any_source(video_hash)
+        # Get existing transcription (uncached: it is modified and written back below)
+        transcription_data = get_transcription_from_any_source(video_hash, use_cache=False)
         if not transcription_data:
             raise HTTPException(status_code=404, detail="Transcription not found")
 
@@ -351,9 +358,8 @@ async def update_speaker_name(request: Request, video_hash: str) -> Dict:
         segments = transcription_data.get("transcription", {}).get("segments", [])
 
         for segment in segments:
-            current_speaker = segment.get("speaker")
             # Match strictly against the internal label (e.g. SPEAKER_00) or previously renamed name
-            if current_speaker == original_speaker:
+            if segment.get("speaker") == original_speaker:
                 segment["speaker"] = new_speaker_name
                 updated_count += 1
 
@@ -368,29 +374,31 @@ async def update_speaker_name(request: Request, video_hash: str) -> Dict:
         filename = transcription_data.get("filename", "unknown")
         file_path = transcription_data.get("file_path")
 
-        success = store_transcription(video_hash, filename, transcription_data, file_path)
+        success = await asyncio.to_thread(store_transcription, video_hash, filename, transcription_data, file_path)
         if not success:
             raise HTTPException(status_code=500, detail="Failed to save updates to database")
 
         # Update vector store metadata for RAG/chat
-        vector_store_updates = {"text_updated": 0, "images_updated": 0}
-        try:
-            from vector_store import vector_store
-
-            # Only update if the collection exists (video has been indexed)
-            if vector_store.collection_exists(video_hash):
-                print(f"Updating vector store speaker metadata from '{original_speaker}' to '{new_speaker_name}'...")
-                vector_store_updates = vector_store.update_speaker_name(
-                    video_hash,
-                    original_speaker,
-                    new_speaker_name
-                )
-                print(f"Vector store updated: {vector_store_updates}")
-        except Exception as e:
-            # Don't fail the entire operation if vector store update fails
-            print(f"Warning: Failed to update vector store: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        def _update_vector_store() -> Dict:
+            try:
+                from vector_store import vector_store
+
+                # Only update if the collection exists (video has been indexed)
+                if vector_store.collection_exists(video_hash):
+                    print(f"Updating vector store speaker metadata from '{original_speaker}' to '{new_speaker_name}'...")
+                    updates = vector_store.update_speaker_name(
+                        video_hash,
+                        original_speaker,
+                        new_speaker_name
+                    )
+                    print(f"Vector store updated: {updates}")
+                    return updates
+            except Exception:
+                # Don't fail the entire operation if vector store update fails
+                logger.exception("[Speaker] Failed to update vector store")
+            return {"text_updated": 0, "images_updated": 0}
+
+        vector_store_updates = await asyncio.to_thread(_update_vector_store)
 
         # Also update Supabase jobs table if the transcription came from there
         try:
@@ -417,6 +425,7 @@ async def update_speaker_name(request: Request, video_hash: str) -> Dict:
                     .eq("id", job_id)
                     .execute()
                 )
+                notify_transcription_changed(video_hash)
                 print(f"[Speaker] Updated job {job_id} in Supabase with new speaker name")
         except Exception as e:
             # Don't fail the whole operation if Supabase update fails
@@ -475,7 +484,5 @@ async def update_speaker_name(request: Request, video_hash: str) -> Dict:
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error updating speaker name: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Speaker] Error updating speaker name")
         raise HTTPException(status_code=500, detail=str(e))
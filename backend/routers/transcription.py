@@ -1,22 +1,31 @@
 """
 Transcription endpoints - core functionality for video/audio transcription
 """
+import asyncio
+import logging
 import os
 import tempfile
 import shutil
 import time
 import subprocess
 import uuid
-import json
+import hashlib
+import numpy as np
+import orjson
 from pathlib import Path
 from datetime import timedelta
-from typing import Dict, List, Optional
-from fastapi import APIRouter, UploadFile, HTTPException, Request, Form, Query
-from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import APIRouter, UploadFile, HTTPException, Request, Response, Form, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from config import settings
-from database import get_transcription, store_transcription, delete_transcription as db_delete_transcription
-from dependencies import get_whisper_model, get_speaker_diarizer, _last_transcription_data
+from database import (
+    get_transcription,
+    store_transcription,
+    delete_transcription as db_delete_transcription,
+    notify_transcription_changed,
+)
+from dependencies import get_whisper_model, get_batched_whisper_pipeline, get_speaker_diarizer, _last_transcription_data
 import dependencies
 from middleware.auth import require_auth
 from models import (
@@ -30,56 +39,46 @@ from services.translation_service import TranslationService
 from services.speaker_service import SpeakerService
 from services.summarization_service import SummarizationService
 from services.audio_analysis_service import AudioAnalysisService
-from utils.file_utils import generate_file_hash
-from utils.time_utils import format_timestamp, format_eta, time_to_seconds, time_diff_minutes
-
-router = APIRouter(tags=["Transcription"])
-
-
-def get_transcription_from_any_source(video_hash: str) -> Optional[Dict]:
-    """
-    Get transcription from any available source:
-    1. First check legacy database (SQLite/Firestore)
-    2. If not found, check Supabase jobs table
+from services.transcription_cache import (
+    get_cached_transcription,
+    get_transcription_from_any_source,
+    prepare_and_cache_transcription,
+)
+from utils.file_utils import link_or_copy
+from utils.time_utils import format_timestamp, format_timestamps, format_eta
+from utils.transcript_utils import ENGLISH_LANGUAGE_CODES, fix_segment_durations, plan_summary_sections
 
-    Args:
-        video_hash: The video hash to look up
+logger = logging.getLogger(__name__)
 
-    Returns:
-        Transcription data dict or None if not found
-    """
-    # Try legacy database first
-    transcription = get_transcription(video_hash)
-    if transcription:
-        return transcription
+# Transcription payloads run to thousands of segments; encode every JSON response with orjson
+router = APIRouter(tags=["Transcription"], default_response_class=ORJSONResponse)
 
-    # Try Supabase jobs table
-    try:
-        from services.supabase_service import supabase
-        client = supabase()
+# Containers with a video stream worth screenshotting (audio-only uploads are skipped)
+VIDEO_SUFFIXES = frozenset({'.mp4', '.mpeg', '.webm', '.mov', '.mkv'})
 
-        # Look for completed job with this video_hash
-        response = (
-            client.table("jobs")
-            .select("result_json, filename, gcs_path")
-            .eq("video_hash", video_hash)
-            .eq("status", "completed")
-            .limit(1)
-            .execute()
-        )
+# Whisper language names/codes -> ISO codes used for the opus-mt translation models
+LANGUAGE_CODE_MAP = {
+    'spanish': 'es', 'español': 'es', 'es': 'es',
+    'italian': 'it', 'italiano': 'it', 'it': 'it',
+    'french': 'fr', 'français': 'fr', 'fr': 'fr',
+    'german': 'de', 'deutsch': 'de', 'de': 'de',
+    'portuguese': 'pt', 'português': 'pt', 'pt': 'pt',
+    'russian': 'ru', 'русский': 'ru', 'ru': 'ru',
+    'chinese': 'zh', 'zh': 'zh',
+    'japanese': 'ja', 'ja': 'ja',
+    'korean': 'ko', 'ko': 'ko',
+    'english': 'en', 'en': 'en'
+}
 
-        if response.data and len(response.data) > 0:
-            job = response.data[0]
-            result_json = job.get("result_json")
 
-            if result_json:
-                print(f"[Summary] Found transcription in Supabase job for video_hash={video_hash}")
-                return result_json
+def normalize_language_code(language: str) -> str:
+    """Map a Whisper language name or code to its ISO code (unknown values pass through lowercased)"""
+    language = language.lower()
+    return LANGUAGE_CODE_MAP.get(language, language)
 
-    except Exception as e:
-        print(f"[Summary] Error checking Supabase for transcription: {e}")
 
-    return None
+# In-flight /transcription/{video_hash} cache misses: video_hash -> task preparing (etag, transcription)
+_transcription_loads: Dict[str, "asyncio.Future[Optional[Tuple[str, Dict]]]"] = {}
 
 
 @router.get(
@@ -97,13 +96,14 @@ async def get_current_transcription(request: Request) -> Dict:
     if not dependencies._last_transcription_data:
         raise HTTPException(status_code=404, detail="No transcription available. Please transcribe a video first.")
 
-    # Count segments with screenshots
-    segment_count = len(dependencies._last_transcription_data['transcription']['segments'])
-    screenshots_count = sum(1 for segment in dependencies._last_transcription_data['transcription']['segments']
-                          if 'screenshot_url' in segment and segment['screenshot_url'])
-
-    print(f"Sending transcription data: {segment_count} segments total, {screenshots_count} with screenshots")
-    return dependencies._last_transcription_data
+    # Diagnostic screenshot count walks every segment, so only pay for it when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        segments = dependencies._last_transcription_data['transcription']['segments']
+        screenshots_count = sum(1 for segment in segments if segment.get('screenshot_url'))
+        logger.debug("[Transcription] Sending transcription data: %d segments total, %d with screenshots",
+                     len(segments), screenshots_count)
+    # Large payload: encode with orjson and skip response_model re-validation
+    return ORJSONResponse(dependencies._last_transcription_data)
 
 
 @router.get(
@@ -118,43 +118,45 @@ async def get_current_transcription(request: Request) -> Dict:
 @require_auth
 async def get_saved_transcription(request: Request, video_hash: str) -> Dict:
     """Get a specific transcription by hash"""
-    transcription = get_transcription(video_hash)
-    if not transcription:
-        raise HTTPException(status_code=404, detail="Transcription not found")
+    cached = get_cached_transcription(video_hash)
+    if cached:
+        etag, transcription = cached
+    else:
+        # Concurrent misses for the same hash share one load (and at most one
+        # translation backfill + store_transcription write)
+        load = _transcription_loads.get(video_hash)
+        if load is None:
+            load = asyncio.ensure_future(asyncio.to_thread(prepare_and_cache_transcription, video_hash))
+            _transcription_loads[video_hash] = load
+            load.add_done_callback(lambda _: _transcription_loads.pop(video_hash, None))
+        prepared = await asyncio.shield(load)
+        if not prepared:
+            raise HTTPException(status_code=404, detail="Transcription not found")
 
-    # Ensure all translations are present if language is not English
-    try:
-        lang = transcription.get('transcription', {}).get('language', '').lower()
-        segments = transcription.get('transcription', {}).get('segments', [])
-        if lang and lang not in ['en', 'english']:
-            missing = [s for s in segments if not s.get('translation')]
-            if missing:
-                print(f"Translating {len(missing)} missing segments for video_hash={video_hash}...")
-                translated_segments = TranslationService.translate_segments(segments, lang)
-                for i, seg in enumerate(segments):
-                    seg['translation'] = translated_segments[i].get('translation', seg.get('text', '[Translation missing]'))
-                store_transcription(video_hash, transcription.get('filename', ''), transcription, transcription.get('file_path'))
-                print(f"Translation complete and saved for video_hash={video_hash}.")
-        else:
-            # If English source, ensure all segments have a translation field (set to text for consistency)
-            for seg in segments:
-                if 'translation' not in seg or not seg.get('translation'):
-                    seg['translation'] = seg.get('text', '')
-    except Exception as e:
-        print(f"Error ensuring translations in /transcription/{{video_hash}}: {e}")
+        etag, transcription = prepared
 
     # Update the last_transcription_data and request state
     dependencies._last_transcription_data = transcription
     request.app.state.last_transcription = transcription
 
-    return transcription
+    etag_header = f'"{etag}"'
+    if request.headers.get("if-none-match") == etag_header:
+        return Response(status_code=304, headers={"ETag": etag_header})
+
+    return ORJSONResponse(
+        transcription,
+        headers={"ETag": etag_header, "Cache-Control": "private, no-cache"},
+    )
 
 
 @router.post(
     "/translate_local/",
     response_model=TranslationResponse,
     summary="Translate text locally",
-    description="Translate text to English using local MarianMT model",
+    description=(
+        "Translate text to English using local MarianMT model. When `text` is a list, "
+        "translations are streamed back in order as NDJSON lines of {index, translation}."
+    ),
     responses={
         400: {"model": ErrorResponse, "description": "Missing required fields"}
     }
@@ -169,28 +171,110 @@ async def translate_local_endpoint(http_request: Request, request: TranslationRe
             raise HTTPException(status_code=400, detail="Missing text or source language")
 
         try:
-            tokenizer, model = TranslationService.get_marian_model(source_lang)
+            await asyncio.to_thread(TranslationService.get_marian_model, source_lang)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Unsupported or unavailable language model: {source_lang}")
 
-        # MarianMT expects a list of sentences
-        if isinstance(text, str):
-            text_list = [text]
-        else:
-            text_list = text
+        if isinstance(text, list):
+            # Submit every text up front so they share batches, then stream each
+            # line as soon as it (and everything before it) is translated
+            futures = [
+                asyncio.ensure_future(TranslationService.translate_async(item, source_lang))
+                for item in text
+            ]
+
+            async def stream_translations():
+                try:
+                    for index, future in enumerate(futures):
+                        yield orjson.dumps({"index": index, "translation": await future}) + b"\n"
+                finally:
+                    for future in futures:
+                        future.cancel()
+
+            return StreamingResponse(stream_translations(), media_type="application/x-ndjson")
 
-        inputs = tokenizer(text_list, return_tensors="pt", padding=True)
-        translated = model.generate(**inputs)
-        translations = [tokenizer.decode(t, skip_special_tokens=True) for t in translated]
+        # Concurrent requests for the same language share one batched
+        # (int8 CTranslate2 when available) forward pass
+        translation = await TranslationService.translate_async(text, source_lang)
 
-        return TranslationResponse(translation=translations[0] if len(translations) == 1 else translations)
+        return TranslationResponse(translation=translation)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Translation error: {str(e)}")
+        logger.exception("[Translation] Local translation failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _load_summary_transcription(request: Request, video_hash: Optional[str]) -> Dict:
+    """Find the transcription to summarize (database first, then in-memory state), or raise 404."""
+    transcription = None
+
+    # Priority 1: Load from database if video_hash provided
+    if video_hash:
+        transcription = get_transcription_from_any_source(video_hash)
+        if transcription:
+            logger.info("[Summary] Loaded transcription from database for video_hash=%s", video_hash)
+
+    # Priority 2: Fall back to in-memory state (for local development)
+    if not transcription and hasattr(request.app.state, 'last_transcription'):
+        transcription = request.app.state.last_transcription
+        logger.info("[Summary] Using in-memory last_transcription")
+
+    # Error if no transcription found
+    if not transcription:
+        raise HTTPException(
+            status_code=404,
+            detail="No transcription available. Please provide video_hash or transcribe a video first."
+        )
+    return transcription
+
+
+async def _iter_section_summaries(section_entries: List[Dict],
+                                  texts_to_summarize: List[str]) -> AsyncIterator[Tuple[int, Dict]]:
+    """Yield (section_index, section summary) as each summary becomes available.
+
+    Sections shorter than SUMMARY_MIN_CHARS come first (used verbatim: BART can't
+    meaningfully compress them and would pad them out to min_length), then BART
+    batches in order of text length, so indices arrive out of timeline order.
+    """
+    def summary_entry(index: int, summary: str) -> Dict:
+        entry = section_entries[index]
+        return {
+            "title": entry["title"],
+            "start": entry["start"],
+            "end": entry["end"],
+            "summary": summary,
+            "screenshot_url": entry["screenshot_url"]
+        }
+
+    model_indices = []
+    for i, text in enumerate(texts_to_summarize):
+        if len(text) >= settings.SUMMARY_MIN_CHARS:
+            model_indices.append(i)
+        else:
+            yield i, summary_entry(i, text)
+
+    # Summarize the rest in padded mini-batches on a worker thread so the
+    # event loop stays free while BART runs. Batching in order of length keeps
+    # each batch's texts close in size, so little of the batch is padding
+    model_indices.sort(key=lambda i: len(texts_to_summarize[i]))
+    SUMMARY_BATCH_SIZE = 8
+    for i in range(0, len(model_indices), SUMMARY_BATCH_SIZE):
+        batch_indices = model_indices[i:i + SUMMARY_BATCH_SIZE]
+        batch_texts = [texts_to_summarize[j] for j in batch_indices]
+        try:
+            batch_summaries = await asyncio.to_thread(
+                SummarizationService.generate_local_summary_batch, batch_texts
+            )
+        except Exception:
+            logger.warning("[Summary] Error generating summaries for sections %d-%d",
+                           batch_indices[0], batch_indices[-1], exc_info=True)
+            # Add a placeholder for failed summaries
+            batch_summaries = ["Summary generation failed. Please try again."] * len(batch_texts)
+        for j, summary in zip(batch_indices, batch_summaries):
+            yield j, summary_entry(j, summary)
+
+
 @router.post(
     "/generate_summary/",
     response_model=Dict,
@@ -211,158 +295,64 @@ async def generate_summary(
     1. If video_hash is provided, loads from database (SQLite/Supabase)
     2. Falls back to in-memory last_transcription (for local dev)
     """
-    transcription = None
-
-    # Priority 1: Load from database if video_hash provided
-    if video_hash:
-        transcription = get_transcription_from_any_source(video_hash)
-        if transcription:
-            print(f"[Summary] Loaded transcription from database for video_hash={video_hash}")
-
-    # Priority 2: Fall back to in-memory state (for local development)
-    if not transcription and hasattr(request.app.state, 'last_transcription'):
-        transcription = request.app.state.last_transcription
-        print("[Summary] Using in-memory last_transcription")
-
-    # Error if no transcription found
-    if not transcription:
-        raise HTTPException(
-            status_code=404,
-            detail="No transcription available. Please provide video_hash or transcribe a video first."
-        )
+    transcription = _load_summary_transcription(request, video_hash)
 
     # Include the filename in the response
     filename = transcription.get('filename', 'unknown_filename')
-    print(f"Generating summary for: {filename}")
+    logger.info("[Summary] Generating summary for: %s", filename)
 
-    segments = transcription['transcription']['segments']
-    print(f"Found {len(segments)} segments for summarization")
+    sections_count, section_entries, texts_to_summarize = plan_summary_sections(transcription)
 
-    # Debug: Check if segments have screenshot_url
-    segments_with_screenshots = sum(1 for seg in segments if seg.get('screenshot_url'))
-    print(f"[Summary Debug] Segments with screenshot_url: {segments_with_screenshots}/{len(segments)}")
+    summaries: List[Optional[Dict]] = [None] * len(section_entries)
+    async for index, summary in _iter_section_summaries(section_entries, texts_to_summarize):
+        summaries[index] = summary
 
-    # Group segments into logical sections (roughly 1-3 minutes each)
-    sections = []
-    current_section = []
-    section_start = "00:00:00"
-    min_section_duration = 1  # Minimum section duration in minutes
-    max_section_duration = 3  # Maximum section duration in minutes
+    # Log summary generation results
+    logger.info("[Summary] Generated %d section summaries", len(summaries))
 
-    for segment in segments:
-        # Create new section when we reach desired duration or significant pause
-        start_time = segment['start_time']
-        if current_section:
-            # Check if we've reached minimum duration and have a natural break
-            section_duration = time_diff_minutes(section_start, start_time)
-            if section_duration >= min_section_duration:
-                # Check for natural break (>2 second pause)
-                last_segment_end = time_to_seconds(current_section[-1]['end_time'])
-                current_segment_start = time_to_seconds(start_time)
-                pause_duration = current_segment_start - last_segment_end
-
-                # Create new section if we have a significant pause or reached max duration
-                if pause_duration > 2 or section_duration >= max_section_duration:
-                    sections.append({
-                        "start": section_start,
-                        "end": current_section[-1]['end_time'],
-                        "segments": current_section.copy()
-                    })
-                    section_start = start_time
-                    current_section = [segment]
-                    continue
-
-        current_section.append(segment)
-
-    # Add the last section
-    if current_section:
-        sections.append({
-            "start": section_start,
-            "end": current_section[-1]['end_time'],
-            "segments": current_section
-        })
-
-    print(f"Created {len(sections)} logical sections for summarization")
-
-    # Generate summary for each section
-    summaries = []
-    for section_index, section in enumerate(sections):
-        # Combine text from all segments - safely handling None values
-        section_text = " ".join(seg["text"] or "" for seg in section["segments"] if seg.get("text"))
-
-        # Fix: Safely handle translation which might be None or missing
-        translated_texts = []
-        for seg in section["segments"]:
-            if seg.get("translation"):
-                translated_texts.append(seg["translation"])
-            elif seg.get("text"):
-                translated_texts.append(seg["text"])
-            else:
-                # Skip this segment if both text and translation are missing/None
-                continue
+    return {
+        "summaries": summaries,
+        "filename": filename,
+        "sections_count": sections_count
+    }
 
-        translated_text = " ".join(translated_texts)
 
-        # Only use translation if it's different from the original
-        text_to_summarize = translated_text if (
-            translated_text != section_text and
-            transcription['transcription']['language'].lower() not in ["en", "english"]
-        ) else section_text
+@router.post(
+    "/generate_summary_stream/",
+    summary="Generate video summary (streaming)",
+    description="Stream section summaries as Server-Sent Events as each one is generated",
+    responses={
+        404: {"model": ErrorResponse, "description": "No transcription available"}
+    }
+)
+@require_auth
+async def generate_summary_stream(
+    request: Request,
+    video_hash: Optional[str] = Query(None, description="Video hash to load transcription from database")
+):
+    """SSE variant of /generate_summary/.
+
+    Emits a 'section' event (index, total, section) per finished summary, so the
+    first sections render before the slowest BART batch completes, then a final
+    'complete' event with the filename and sections_count.
+    """
+    transcription = _load_summary_transcription(request, video_hash)
+    filename = transcription.get('filename', 'unknown_filename')
+    logger.info("[Summary] Streaming summary for: %s", filename)
 
-        # Skip empty sections
-        if not text_to_summarize:
-            continue
+    sections_count, section_entries, texts_to_summarize = plan_summary_sections(transcription)
 
+    async def stream_summaries():
+        total = len(section_entries)
         try:
-            # Generate concise summary using local model
-            summary = SummarizationService.generate_local_summary(text_to_summarize)
-
-            # Generate descriptive title
-            title = f"Section {section['start']}-{section['end']}"
-
-            # Get screenshot_url from first segment of the section
-            screenshot_url = None
-            for seg in section["segments"]:
-                if seg.get("screenshot_url"):
-                    screenshot_url = seg["screenshot_url"]
-                    break
-
-            # Debug log for first few sections
-            if section_index < 3:
-                print(f"[Summary Debug] Section {section_index}: screenshot_url={screenshot_url}")
-
-            summaries.append({
-                "title": title,
-                "start": section["start"],
-                "end": section["end"],
-                "summary": summary,
-                "screenshot_url": screenshot_url
-            })
+            async for index, summary in _iter_section_summaries(section_entries, texts_to_summarize):
+                yield _sse({'stage': 'section', 'index': index, 'total': total, 'section': summary})
+            yield _sse({'stage': 'complete', 'filename': filename, 'sections_count': sections_count, 'total': total})
         except Exception as e:
-            print(f"Error generating summary for section {section['start']}-{section['end']}: {e}")
-            # Get screenshot_url even for failed summaries
-            screenshot_url = None
-            for seg in section["segments"]:
-                if seg.get("screenshot_url"):
-                    screenshot_url = seg["screenshot_url"]
-                    break
-            # Add a placeholder for failed summaries
-            summaries.append({
-                "title": f"Section {section['start']}-{section['end']}",
-                "start": section["start"],
-                "end": section["end"],
-                "summary": "Summary generation failed. Please try again.",
-                "screenshot_url": screenshot_url
-            })
+            logger.exception("[Summary] Streaming summary failed")
+            yield _sse({'stage': 'error', 'error': str(e)})
 
-    # Log summary generation results
-    print(f"Generated {len(summaries)} section summaries")
-
-    return {
-        "summaries": summaries,
-        "filename": filename,
-        "sections_count": len(sections)
-    }
+    return StreamingResponse(stream_summaries(), media_type="text/event-stream")
 
 
 @router.post(
@@ -544,28 +534,29 @@ async def regenerate_screenshots_for_video(request: Request, video_hash: str):
 
         print(f"[Screenshots] Extracting {len(timestamps)} screenshots from video URL...")
 
-        # Extract screenshots in batches using parallel extraction
-        batch_size = 20
-        screenshot_results = {}
-
-        for batch_start in range(0, len(timestamps), batch_size):
-            batch_timestamps = timestamps[batch_start:batch_start + batch_size]
-
-            batch_results = VideoService.extract_screenshots_parallel_from_url(
-                source_url=video_url,
-                timestamps=batch_timestamps,
-                output_dir=screenshots_dir,
-                video_hash=video_hash,
-                max_workers=4
-            )
-            screenshot_results.update(batch_results)
-
-            print(f"[Screenshots] Extracted batch {batch_start // batch_size + 1}: {len([v for v in batch_results.values() if v])} successful")
+        # Extract all screenshots through one worker pool on a worker thread: the pool
+        # keeps SCREENSHOT_URL_WORKERS FFmpeg processes busy across the whole list
+        # instead of draining after every fixed-size batch. Longer lists also share
+        # each FFmpeg process across several timestamps
+        extract_from_url = (
+            VideoService.extract_screenshots_batched_from_url if len(timestamps) > 40
+            else VideoService.extract_screenshots_parallel_from_url
+        )
+        screenshot_results = await asyncio.to_thread(
+            extract_from_url,
+            source_url=video_url,
+            timestamps=timestamps,
+            output_dir=screenshots_dir,
+            video_hash=video_hash,
+            max_workers=settings.SCREENSHOT_URL_WORKERS
+        )
+        print(f"[Screenshots] Extracted {sum(1 for v in screenshot_results.values() if v)}/{len(timestamps)} screenshots")
 
         # Upload screenshots to GCS
         print(f"[Screenshots] Uploading {len(screenshot_results)} screenshots to GCS...")
 
-        gcs_urls = gcs_service.upload_screenshots_batch(
+        gcs_urls = await asyncio.to_thread(
+            gcs_service.upload_screenshots_batch,
             screenshot_paths=screenshot_results,
             video_hash=video_hash
         )
@@ -594,6 +585,7 @@ async def regenerate_screenshots_for_video(request: Request, video_hash: str):
             .eq("id", job_id)
             .execute()
         )
+        notify_transcription_changed(video_hash)
 
         print(f"[Screenshots] Updated job {job_id} in Supabase")
 
@@ -644,10 +636,53 @@ def add_speaker_labels(audio_path: str, segments: List[Dict], num_speakers: int
     diarizer = get_speaker_diarizer()
     return SpeakerService.add_speaker_labels(audio_path, segments, diarizer, num_speakers, min_speakers, max_speakers)
 
+
+def _start_speaker_labels(audio_path: str, segments: List[Dict], num_speakers: int = None,
+                          min_speakers: int = None, max_speakers: int = None) -> asyncio.Task:
+    """Start add_speaker_labels on a worker thread from segment timestamps alone.
+
+    Diarization needs only the audio and each segment's start/end, so it can run
+    while translation and screenshot extraction fill in the real segment dicts.
+    Start it once segment timing is final, and apply the result with
+    _merge_speaker_labels() before segments are added or reordered.
+    """
+    timestamps = [{'start': seg['start'], 'end': seg['end']} for seg in segments]
+    return asyncio.create_task(asyncio.to_thread(
+        add_speaker_labels,
+        audio_path=audio_path,
+        segments=timestamps,
+        num_speakers=num_speakers,
+        min_speakers=min_speakers,
+        max_speakers=max_speakers
+    ))
+
+
+async def _settle_speaker_labels(task: Optional[asyncio.Task]) -> None:
+    """Wait for a _start_speaker_labels() task to end, discarding its result or error.
+
+    Its worker thread can't be cancelled, so pipelines call this before deleting the
+    audio it reads rather than leaving an orphaned task behind on failure or disconnect.
+    """
+    if task is not None:
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def _merge_speaker_labels(segments: List[Dict], labeled: List[Dict]) -> None:
+    """Copy speaker labels from _start_speaker_labels() results onto the matching segments."""
+    for segment, labels in zip(segments, labeled):
+        segment['speaker'] = labels.get('speaker', 'SPEAKER_00')
+        if labels.get('diarization_failed'):
+            segment['diarization_failed'] = True
+
 def extract_screenshot(input_path: str, timestamp: float, output_path: str) -> bool:
     """Wrapper for VideoService.extract_screenshot"""
     return VideoService.extract_screenshot(input_path, timestamp, output_path)
 
+
+def extract_screenshots(input_path: str, tasks: List[Tuple[float, str]]) -> List[bool]:
+    """Wrapper for VideoService.extract_screenshots, running SCREENSHOT_WORKERS batches at once"""
+    return VideoService.extract_screenshots(input_path, tasks, max_workers=settings.SCREENSHOT_WORKERS)
+
 def convert_mkv_to_mp4(input_path: str, output_path: str) -> bool:
     """Wrapper for VideoService.convert_mkv_to_mp4"""
     return VideoService.convert_mkv_to_mp4(input_path, output_path)
@@ -667,57 +702,21 @@ def get_local_whisper_model():
     return _whisper_model_instance
 
 
-def fix_segment_durations(segments: List[Dict], max_duration_per_word: float = 2.0,
-                          min_duration: float = 0.5, max_segment_duration: float = 30.0) -> List[Dict]:
-    """
-    Fix segments with unreasonably long durations caused by chunk boundary processing.
-
-    This addresses the issue where Whisper creates incorrectly long segments during chunk
-    processing. When segments are discarded at chunk boundaries, the previous segment's
-    end time can be incorrectly extended (e.g., a single word spanning 178 seconds).
-
-    Args:
-        segments: List of segments to fix
-        max_duration_per_word: Maximum expected seconds per word (default: 2.0)
-        min_duration: Minimum segment duration in seconds (default: 0.5)
-        max_segment_duration: Absolute maximum segment duration in seconds (default: 30.0)
+def whisper_transcribe(audio, **params):
+    """Transcribe with the shared Whisper model, batching VAD windows when possible.
 
-    Returns:
-        Segments with corrected durations
+    BatchedInferencePipeline decodes up to WHISPER_BATCH_SIZE speech windows in one
+    padded encoder/decoder pass, but it needs VAD to split the audio into windows,
+    so calls without vad_filter keep the sequential model.transcribe().
     """
-    fixed_count = 0
-
-    for segment in segments:
-        # Skip silent segments (they're meant to have longer durations)
-        if segment.get('is_silent', False):
-            continue
-
-        text = segment.get('text', '').strip()
-        word_count = len(text.split()) if text else 1
-
-        start = segment.get('start', 0)
-        end = segment.get('end', 0)
-        duration = end - start
-
-        # Calculate expected max duration based on word count
-        # Use a reasonable estimate: average speaking rate is ~2-3 words per second
-        # So 2 seconds per word is very generous
-        expected_max = max(min_duration, word_count * max_duration_per_word)
-        expected_max = min(expected_max, max_segment_duration)
-
-        # If duration is way too long, fix it (allow 3x tolerance before fixing)
-        if duration > expected_max * 3:
-            new_end = start + expected_max
-            print(f"Fixing segment duration: '{text[:50]}...' was {duration:.1f}s ({duration/60:.1f}min), now {expected_max:.1f}s (words: {word_count})")
-            segment['end'] = new_end
-            # Update end_time string too
-            segment['end_time'] = format_timestamp(new_end)
-            fixed_count += 1
-
-    if fixed_count > 0:
-        print(f"Fixed {fixed_count} segments with unreasonably long durations")
-
-    return segments
+    if settings.WHISPER_BATCH_SIZE > 0 and params.get("vad_filter"):
+        get_local_whisper_model()
+        # Batched windows are decoded independently, never conditioned on previous text
+        params.pop("condition_on_previous_text", None)
+        return get_batched_whisper_pipeline().transcribe(
+            audio, batch_size=settings.WHISPER_BATCH_SIZE, **params
+        )
+    return get_local_whisper_model().transcribe(audio, **params)
 
 
 def create_silent_segments_for_gaps(segments: List[Dict],
@@ -811,23 +810,28 @@ def extract_silent_segment_screenshots(segments: List[Dict], source: str, video_
         return 0
 
     if screenshots_dir is None:
-        screenshots_dir = os.path.join("static", "screenshots")
+        screenshots_dir = settings.SCREENSHOTS_DIR
     os.makedirs(screenshots_dir, exist_ok=True)
 
     timestamps = [s['screenshot_timestamp'] for s in silent_segs]
 
-    # For local files, use the path directly (ffmpeg handles both paths and URLs)
-    ffmpeg_source = source if source.startswith('http') else os.path.abspath(source)
-
     print(f"Extracting {len(timestamps)} silent segment screenshots in parallel (max_workers={max_workers})...")
 
-    results = VideoService.extract_screenshots_parallel_from_url(
-        source_url=ffmpeg_source,
-        timestamps=timestamps,
-        output_dir=screenshots_dir,
-        video_hash=video_hash,
-        max_workers=max_workers
-    )
+    if source.startswith('http'):
+        results = VideoService.extract_screenshots_parallel_from_url(
+            source_url=source,
+            timestamps=timestamps,
+            output_dir=screenshots_dir,
+            video_hash=video_hash,
+            max_workers=max_workers
+        )
+    else:
+        # Local file: batch timestamps into multi-output FFmpeg processes
+        output_paths = [os.path.join(screenshots_dir, f"{video_hash}_{ts:.2f}.jpg") for ts in timestamps]
+        successes = VideoService.extract_screenshots(
+            os.path.abspath(source), list(zip(timestamps, output_paths)), max_workers=max_workers
+        )
+        results = {ts: (path if ok else None) for ts, path, ok in zip(timestamps, output_paths, successes)}
 
     count = 0
     for seg in silent_segs:
@@ -848,6 +852,171 @@ def extract_silent_segment_screenshots(segments: List[Dict], source: str, video_
 # =============================================================================
 
 
+UPLOAD_COPY_BUFFER_SIZE = 8 * 1024 * 1024  # 8MB
+
+
+def _copy_upload_to_temp(file: UploadFile, suffix: str) -> Tuple[str, str]:
+    """Copy an upload's spooled file to a named temp file in large chunks (blocking).
+
+    Avoids reading the whole upload into memory before writing it back out, and
+    hashes each chunk on the way through so the copy never has to be re-read.
+
+    Returns:
+        (temp file path, SHA-256 hex digest of the content, as generate_file_hash)
+    """
+    file.file.seek(0)
+    sha256 = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        while chunk := file.file.read(UPLOAD_COPY_BUFFER_SIZE):
+            sha256.update(chunk)
+            tmp.write(chunk)
+        return tmp.name, sha256.hexdigest()
+
+
+def _remove_temp_paths(*paths: Optional[str]) -> None:
+    """Delete temporary files/directories (blocking; call via asyncio.to_thread)."""
+    for path in paths:
+        if not path or not os.path.exists(path):
+            continue
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.unlink(path)
+        except Exception as e:
+            print(f"Error cleaning up {path}: {e}")
+
+
+def _transcribe_audio_chunk(i: int, total_chunks: int, chunk_path: str,
+                            language: Optional[str]) -> Optional[Tuple[str, str, np.ndarray, np.ndarray, List[str]]]:
+    """Transcribe one audio chunk with the local Whisper model (blocking).
+
+    Returns (text, detected_language, starts, ends, texts) with chunk-relative
+    segment times as parallel arrays, or None if the chunk is missing or too large.
+    """
+    print(f"\nProcessing chunk {i+1}/{total_chunks}: {os.path.basename(chunk_path)}")
+    try:
+        chunk_size_mb = os.stat(chunk_path).st_size / (1024 * 1024)
+    except FileNotFoundError:
+        print(f"WARNING: Chunk file not found: {chunk_path}. Skipping.")
+        return None
+    print(f"Chunk size: {chunk_size_mb:.2f} MB")
+    if chunk_size_mb > 25:
+        print(f"WARNING: Chunk {i+1} ({chunk_size_mb:.2f} MB) exceeds 25MB limit. Skipping this chunk.")
+        return None
+
+    print(f"Calling Whisper for chunk {i+1}...")
+    # Always use task="transcribe" to get original language text. With VAD enabled the
+    # chunk's speech windows are decoded in batches (see whisper_transcribe)
+    segments, info = whisper_transcribe(
+        chunk_path,
+        task="transcribe",
+        language=language if language else None,
+        beam_size=1,  # Faster processing
+        vad_filter=settings.VAD_ENABLED,
+        vad_parameters=dict(
+            min_silence_duration_ms=settings.VAD_MIN_SILENCE_DURATION_MS,
+            threshold=settings.VAD_THRESHOLD
+        )
+    )
+    starts, ends, texts = _whisper_segment_columns(segments)
+    print(f"Transcription received for chunk {i+1}. Detected language: {info.language}")
+    return " ".join(texts), info.language, starts, ends, texts
+
+
+def _whisper_segment_columns(segments) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Materialize Whisper's lazy segment generator once into start/end arrays and a text list."""
+    segments = list(segments)
+    starts = np.fromiter((seg.start for seg in segments), dtype=np.float64, count=len(segments))
+    ends = np.fromiter((seg.end for seg in segments), dtype=np.float64, count=len(segments))
+    texts = [seg.text for seg in segments]
+    return starts, ends, texts
+
+
+def _sse(payload: Dict) -> str:
+    """Frame a payload as a Server-Sent Event (orjson keeps large result frames cheap)."""
+    data = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return f"data: {data.decode()}\n\n"
+
+
+def _translation_stats(
+    segments: List[Dict],
+    detected_language: Optional[str],
+    normalized_lang: Optional[str],
+    should_translate: bool,
+) -> Dict:
+    """Summarize translation outcomes for user feedback in a single pass over the segments."""
+    translated = errors = 0
+    for segment in segments:
+        error = segment.get('translation_error')
+        errors += bool(error)
+        translated += bool(segment.get('translation') and not error)
+    return {
+        'total_segments': len(segments),
+        'segments_translated': translated,
+        'translation_errors': errors,
+        'detected_language': detected_language,
+        'normalized_language': normalized_lang,
+        'translation_attempted': should_translate
+    }
+
+
+def _format_segments(starts: np.ndarray, ends: np.ndarray, texts: List[str]) -> List[Dict]:
+    """Build the API segment dicts from column arrays (translation filled in later).
+
+    IDs are one random prefix per transcription plus the segment index, like the
+    /transcribe/ path, instead of a UUID per segment.
+    """
+    id_prefix = uuid.uuid4().hex[:12]
+    return [
+        {
+            "id": f"{id_prefix}-{i}",
+            "start": start,
+            "end": end,
+            "start_time": start_time,
+            "end_time": end_time,
+            "text": text,  # Original language text
+            "translation": None,  # Will be populated by translate_segments if needed
+        }
+        for i, (start, end, start_time, end_time, text) in enumerate(zip(
+            starts.tolist(), ends.tolist(), format_timestamps(starts), format_timestamps(ends), texts
+        ))
+    ]
+
+
+def _offset_chunk_segments(i: int, total_chunks: int, starts: np.ndarray, ends: np.ndarray,
+                           texts: List[str], chunk_duration: int, chunk_overlap: int) -> List[Dict]:
+    """Drop a chunk's overlap segments and shift its times onto the full-video timeline."""
+    # --- Overlap segment discarding logic (index range [lo, hi) of kept segments) ---
+    chunk_offset = i * chunk_duration
+    chunk_length = chunk_duration + (chunk_overlap if i < total_chunks - 1 else 0) + (chunk_overlap if i > 0 else 0)
+    lo, hi = 0, len(texts)
+    # Discard first segment if not the first chunk and it starts within overlap
+    if i > 0 and hi > lo and starts[lo] < chunk_overlap:
+        lo += 1
+    # Discard last segment if not the last chunk and it ends after chunk_length - overlap
+    if i < total_chunks - 1 and hi > lo and ends[hi - 1] > (chunk_length - chunk_overlap):
+        hi -= 1
+    # Adjust segment times by chunk offset (minus overlap for all but first chunk)
+    shift = chunk_offset - (chunk_overlap if i > 0 else 0)
+    # Build the segment dicts once, from the shifted time columns
+    segments = []
+    for start, end, segment_text in zip((starts[lo:hi] + shift).tolist(),
+                                        (ends[lo:hi] + shift).tolist(), texts[lo:hi]):
+        if segment_text and not segment_text.isspace():
+            segments.append({'start': start, 'end': end, 'text': segment_text})
+        else:
+            # FIX Issue 1: mark silent segments explicitly
+            segments.append({
+                'start': start,
+                'end': end,
+                'text': '[No speech detected]',
+                'translation': '[No speech detected]',
+                'is_silent': True  # Mark as silent segment
+            })
+    return segments
+
+
 @router.post("/transcribe/")
 @require_auth
 async def transcribe_video(
@@ -857,7 +1026,64 @@ async def transcribe_video(
     language: str = Form(None)  # Added language parameter
 ) -> Dict:
     """Handle video upload, extract audio, and transcribe"""
-        
+    return await _transcribe_upload(request, file, language)
+
+
+@router.post("/transcribe_stream/")
+@require_auth
+async def transcribe_video_stream(
+    request: Request,
+    file: UploadFile,
+    language: str = Form(None)
+):
+    """Run the /transcribe/ pipeline, streaming each chunk's segments via Server-Sent Events.
+
+    A "chunk" event carries a chunk's segments (full-video times, no translation,
+    speakers or screenshots yet) as soon as Whisper finishes it, so the client can
+    render subtitles early; the final "complete" event carries the same result
+    /transcribe/ returns.
+    """
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def on_chunk(i: int, total_chunks: int, segments: List[Dict]) -> None:
+        # Serialize now: the segment dicts are updated later by translation/diarization
+        progress = 10 + int(((i + 1) / total_chunks) * 50)
+        await events.put(_sse({'stage': 'chunk', 'progress': progress, 'chunk': i, 'total_chunks': total_chunks, 'segments': segments}))
+
+    async def run_pipeline() -> None:
+        try:
+            result = await _transcribe_upload(request, file, language, on_chunk=on_chunk)
+            await events.put(_sse({'stage': 'complete', 'progress': 100, 'result': result}))
+        except Exception as e:
+            error = e.detail if isinstance(e, HTTPException) else str(e)
+            print(f"Error in streaming transcription: {error}")
+            await events.put(_sse({'stage': 'error', 'progress': 0, 'error': error}))
+        await events.put(None)
+
+    async def generate_progress():
+        pipeline = asyncio.create_task(run_pipeline())
+        try:
+            yield _sse({'stage': 'uploading', 'progress': 5, 'message': 'Receiving file...'})
+            while (event := await events.get()) is not None:
+                yield event
+        finally:
+            if not pipeline.done():
+                pipeline.cancel()
+
+    return StreamingResponse(generate_progress(), media_type="text/event-stream")
+
+
+async def _transcribe_upload(
+    request: Request,
+    file: UploadFile,
+    language: Optional[str],
+    on_chunk: Optional[Callable[[int, int, List[Dict]], Awaitable[None]]] = None
+) -> Dict:
+    """Upload, chunk, transcribe, translate, diarize and store a video for /transcribe/.
+
+    on_chunk, if given, is awaited with (chunk_index, total_chunks, segments) as each
+    audio chunk finishes transcribing (in completion order, not chunk order).
+    """
     try:
         if not file:
             raise HTTPException(status_code=400, detail="No file provided")
@@ -885,7 +1111,7 @@ async def transcribe_video(
             # Save uploaded file in chunks to avoid memory issues
             temp_input_path = os.path.join(temp_dir, file.filename)
             temp_output_path = os.path.join(temp_dir, "audio.mp3")
-            screenshots_dir = os.path.join("static", "screenshots")
+            screenshots_dir = settings.SCREENSHOTS_DIR
             os.makedirs(screenshots_dir, exist_ok=True)
             
             print(f"Created temp directory: {temp_dir}")
@@ -899,7 +1125,17 @@ async def transcribe_video(
             
             print("\nUploading video...")
             try:
-                with open(temp_input_path, "wb") as buffer:
+                # File I/O runs on worker threads so large uploads don't stall the event loop.
+                # The SHA-256 video hash is computed from the same chunks as they are
+                # written, so the saved file never has to be read back just to hash it.
+                upload_hash = hashlib.sha256()
+
+                def write_chunk(chunk: bytes) -> None:
+                    buffer.write(chunk)
+                    upload_hash.update(chunk)
+
+                buffer = await asyncio.to_thread(open, temp_input_path, "wb")
+                try:
                     while chunk := await file.read(CHUNK_SIZE):
                         total_size += len(chunk)
                         if total_size > 10 * 1024 * 1024 * 1024:  # 10GB limit
@@ -907,8 +1143,10 @@ async def transcribe_video(
                                 status_code=413,
                                 detail="File too large. Maximum size is 10GB."
                             )
-                        buffer.write(chunk)
+                        await asyncio.to_thread(write_chunk, chunk)
                         print(f"Uploaded: {total_size / (1024*1024):.1f} MB", end="\r")
+                finally:
+                    await asyncio.to_thread(buffer.close)
                 print(f"\nUpload completed. Total size: {total_size / (1024*1024):.1f} MB")
             except Exception as e:
                 print(f"Upload error: {str(e)}")
@@ -917,8 +1155,8 @@ async def transcribe_video(
                     detail=f"Error uploading file: {str(e)}"
                 )
             
-            # Generate hash for the file
-            video_hash = generate_file_hash(temp_input_path)
+            # Hash of the uploaded content (same SHA-256 as generate_file_hash)
+            video_hash = upload_hash.hexdigest()
             print(f"Generated hash for video: {video_hash}")
             
             # Check if we already have a transcription for this file
@@ -937,7 +1175,7 @@ async def transcribe_video(
             permanent_file_path = os.path.join(permanent_storage_dir, f"{video_hash}{file_extension}")
             # Check if file already exists to avoid unnecessary copy
             if not os.path.exists(permanent_file_path):
-                 shutil.copy2(temp_input_path, permanent_file_path)
+                 await asyncio.to_thread(link_or_copy, temp_input_path, permanent_file_path)
                  print(f"Saved permanent copy of video to: {permanent_file_path}")
             else:
                  print(f"Permanent copy already exists at: {permanent_file_path}")
@@ -947,7 +1185,7 @@ async def transcribe_video(
                 mp4_path = os.path.join(permanent_storage_dir, f"{video_hash}.mp4")
                 if not os.path.exists(mp4_path):
                     print("\nMKV file detected - converting to MP4 for browser compatibility...")
-                    conversion_success = convert_mkv_to_mp4(permanent_file_path, mp4_path)
+                    conversion_success = await asyncio.to_thread(convert_mkv_to_mp4, permanent_file_path, mp4_path)
                     if conversion_success:
                         print(f"Conversion successful! Using MP4 file for playback.")
                         # Update paths to use the MP4 file for processing and serving
@@ -982,77 +1220,58 @@ async def transcribe_video(
                 
                 print(f"Split audio into {len(audio_chunks)} chunks.")
                 
-                # Transcribe each chunk and combine results
+                # Transcribe chunks concurrently (bounded by WHISPER_CONCURRENCY; the
+                # CTranslate2 model releases the GIL), then combine them in chunk order
                 all_segments = []
                 audio_language = language # Use provided language initially
                 full_text = []
-                
+
                 total_chunks = len(audio_chunks)
-                for i, chunk_path in enumerate(audio_chunks):
-                    print(f"\nProcessing chunk {i+1}/{total_chunks}: {os.path.basename(chunk_path)}")
-                    chunk_size_mb = 0
-                    if os.path.exists(chunk_path):
-                        chunk_size_mb = os.path.getsize(chunk_path) / (1024 * 1024)
-                        print(f"Chunk size: {chunk_size_mb:.2f} MB")
-                    else:
-                         print(f"WARNING: Chunk file not found: {chunk_path}. Skipping.")
-                         continue
-                    if chunk_size_mb > 25:
-                        print(f"WARNING: Chunk {i+1} ({chunk_size_mb:.2f} MB) exceeds 25MB limit. Skipping this chunk.")
+                whisper_semaphore = asyncio.Semaphore(max(1, settings.WHISPER_CONCURRENCY))
+
+                def process_chunk(i: int, chunk_path: str):
+                    chunk_result = _transcribe_audio_chunk(i, total_chunks, chunk_path, language)
+                    if chunk_result is None:
+                        return None
+                    chunk_text, detected_language, starts, ends, texts = chunk_result
+                    return chunk_text, detected_language, _offset_chunk_segments(
+                        i, total_chunks, starts, ends, texts, chunk_duration_seconds, chunk_overlap
+                    )
+
+                async def transcribe_chunk(i: int, chunk_path: str):
+                    async with whisper_semaphore:
+                        chunk_result = await asyncio.to_thread(process_chunk, i, chunk_path)
+                    if chunk_result is not None and on_chunk is not None:
+                        await on_chunk(i, total_chunks, chunk_result[2])
+                    return chunk_result
+
+                # return_exceptions lets every in-flight chunk finish (its worker thread
+                # can't be cancelled anyway), so only the chunks that failed are retried
+                chunk_results = await asyncio.gather(
+                    *(transcribe_chunk(i, chunk_path) for i, chunk_path in enumerate(audio_chunks)),
+                    return_exceptions=True,
+                )
+                failed = [i for i, r in enumerate(chunk_results) if isinstance(r, BaseException)]
+                for i in failed:
+                    if not isinstance(chunk_results[i], RuntimeError):
+                        raise chunk_results[i]
+                if failed:
+                    # e.g. CUDA out of memory with several chunks in flight: retry one at a time
+                    print(f"Concurrent transcription failed for {len(failed)} chunk(s) "
+                          f"({chunk_results[failed[0]]}), retrying them sequentially...")
+                    for i in failed:
+                        chunk_results[i] = await transcribe_chunk(i, audio_chunks[i])
+
+                for chunk_result in chunk_results:
+                    if chunk_result is None:
                         continue
-                    with open(chunk_path, "rb") as chunk_file:
-                        print(f"Calling Whisper API for chunk {i+1}...")
-                        # Always use task="transcribe" to get original language text
-                        segments, info = get_local_whisper_model().transcribe(
-                            chunk_path,
-                            task="transcribe",
-                            language=language if language else None,
-                            beam_size=1  # Faster processing
-                        )
-                        chunk_response = type('obj', (object,), {
-                            'text': " ".join([seg.text for seg in segments]),
-                            'language': info.language,
-                            'segments': [{
-                                'start': seg.start,
-                                'end': seg.end,
-                                'text': seg.text
-                            } for seg in segments]
-                        })
-                        print(f"Transcription received for chunk {i+1}.")
-                        detected_language = chunk_response.language
-                        print(f"Detected language for chunk {i+1}: {detected_language}")
-                        if audio_language is None:
-                            audio_language = detected_language
-                            print(f"Overall audio language set to: {audio_language}")
-                        full_text.append(chunk_response.text)
-                        # --- Overlap segment discarding logic ---
-                        chunk_offset = i * chunk_duration_seconds
-                        chunk_length = chunk_duration_seconds + (chunk_overlap if i < total_chunks - 1 else 0) + (chunk_overlap if i > 0 else 0)
-                        segments = chunk_response.segments
-                        # Discard first segment if not the first chunk and it starts within overlap
-                        if i > 0 and segments and segments[0]['start'] < chunk_overlap:
-                            segments = segments[1:]
-                        # Discard last segment if not the last chunk and it ends after chunk_length - overlap
-                        if i < total_chunks - 1 and segments and segments[-1]['end'] > (chunk_length - chunk_overlap):
-                            segments = segments[:-1]
-                        # Adjust segment times by chunk offset (minus overlap for all but first chunk)
-                        for segment in segments:
-                            segment['start'] += chunk_offset - (chunk_overlap if i > 0 else 0)
-                            segment['end'] += chunk_offset - (chunk_overlap if i > 0 else 0)
-                        # Append to all_segments
-                        for segment in segments:
-                            segment_text = segment.get('text', '')
-                            if segment_text and not segment_text.isspace():
-                                all_segments.append(segment)
-                            else:
-                                # FIX Issue 1: Preserve ALL original fields including screenshot_url
-                                all_segments.append({
-                                    **segment,  # Preserve all original fields
-                                    'text': '[No speech detected]',
-                                    'translation': '[No speech detected]',
-                                    'is_silent': True  # Mark as silent segment
-                                })
-                
+                    chunk_text, detected_language, chunk_segments = chunk_result
+                    if audio_language is None:
+                        audio_language = detected_language
+                        print(f"Overall audio language set to: {audio_language}")
+                    full_text.append(chunk_text)
+                    all_segments.extend(chunk_segments)
+
                 # Create a synthetic response object to hold the combined results
                 class SyntheticResponse:
                     def __init__(self):
@@ -1093,7 +1312,7 @@ async def transcribe_video(
                 # Use the determined language for translation check
                 source_language_for_translation = response.language
                 print(f"\nChecking language for translation: {source_language_for_translation}")
-                if source_language_for_translation and source_language_for_translation.lower() not in ['en', 'english']:
+                if source_language_for_translation and source_language_for_translation.lower() not in ENGLISH_LANGUAGE_CODES:
                     print(f"Language is not English. Translating segments from '{source_language_for_translation}'...")
                     # Ensure segments exist before attempting translation
                     if hasattr(response, 'segments') and response.segments:
@@ -1103,99 +1322,114 @@ async def transcribe_video(
                          print("No segments found to translate.")
                 else:
                     print("Language is English or undetermined. No translation needed.")
-            except Exception as e:
-                print(f"Translation error: {str(e)}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("[Translation] Local translation failed")
                 # Continue even if translation fails, but log it
 
-            # Continue with the rest of the function
-            # Extract screenshots for each segment if it's a video file
-            screenshot_count = 0
-            if file_extension in {'.mp4', '.mpeg', '.webm', '.mov', '.mkv'}:
-                 print("\nExtracting screenshots for video segments...")
-                 # Ensure response.segments exists and is iterable
-                 if hasattr(response, 'segments') and response.segments:
-                    total_segments_for_screenshots = len(response.segments)
-                    print(f"Attempting to extract screenshots for {total_segments_for_screenshots} segments.")
-                    for i, segment in enumerate(response.segments):
-                        #print(f"Processing segment {i+1}/{total_segments_for_screenshots} for screenshot (Start: {segment.start:.2f})")
-                        screenshot_filename = f"{video_hash}_{segment['start']:.2f}.jpg" # Use hash to ensure uniqueness
-                        screenshot_path = os.path.join(screenshots_dir, screenshot_filename)
-                        
-                        # Ensure segment.start is a valid number
-                        segment_start_time = segment.get('start', None)
-                        if segment_start_time is None or not isinstance(segment_start_time, (int, float)):
-                             print(f"Warning: Invalid start time for segment {i+1}. Skipping screenshot.")
-                             segment['screenshot_url'] = None
-                             continue
-
-                        success = extract_screenshot(temp_input_path, segment_start_time, screenshot_path)
-                        if success and os.path.exists(screenshot_path):
-                            # Add screenshot URL to segment
-                            screenshot_url = f"/static/screenshots/{screenshot_filename}"
-                            segment['screenshot_url'] = screenshot_url
-                            screenshot_count += 1
-                            #print(f"Segment {i+1}: Screenshot added - {screenshot_url}")
-                        else:
-                            segment['screenshot_url'] = None
-                            #print(f"Segment {i+1}: Failed to add screenshot.")
-                    print(f"\nFinished screenshot extraction. Successfully added {screenshot_count} screenshots.")
-                 else:
-                      print("No segments available to extract screenshots from.")
-            else:
-                 print("\nFile is not a video format. Skipping screenshot extraction.")
-
-            # FIX: Fix overly long segment durations caused by chunk boundary processing
+            # FIX: Fix overly long segment durations caused by chunk boundary processing.
+            # Done before screenshots/diarization: diarization matches on segment end times.
             print("\n" + "="*60)
             print("Fixing segment durations...")
             print("="*60)
             all_segments = fix_segment_durations(all_segments)
             response.segments = all_segments
 
-            # Add speaker diarization
-            try:
-                print("\n" + "="*60)
-                print("Adding speaker labels to segments...")
-                print("="*60)
-
-                # Use the original input file for diarization (better quality)
-                all_segments = add_speaker_labels(
-                    audio_path=temp_input_path,
-                    segments=all_segments,
-                    num_speakers=None  # Auto-detect number of speakers
-                )
-
-                # Update response segments with speaker information
-                response.segments = all_segments
-
-                print("Speaker labeling complete!")
-            except Exception as e:
-                print(f"⚠️  Speaker diarization failed: {str(e)}")
-                # Continue without speaker labels
-                import traceback
-                traceback.print_exc()
-                # Ensure all segments have a speaker field
-                for seg in all_segments:
-                    if 'speaker' not in seg:
-                        seg['speaker'] = "SPEAKER_00"
+            # Screenshot extraction (FFmpeg-bound) and speaker diarization (model-bound)
+            # both only read the input file and set different segment keys, so run them
+            # side by side on worker threads
+            def extract_segment_screenshots() -> int:
+                """Extract screenshots for each segment if it's a video file"""
+                screenshot_count = 0
+                if file_extension in VIDEO_SUFFIXES:
+                     print("\nExtracting screenshots for video segments...")
+                     # Ensure response.segments exists and is iterable
+                     if hasattr(response, 'segments') and response.segments:
+                        total_segments_for_screenshots = len(response.segments)
+                        print(f"Attempting to extract screenshots for {total_segments_for_screenshots} segments.")
+                        # Validate all start times at once; missing or non-numeric starts become NaN
+                        starts = np.array([
+                            start if isinstance(start, (int, float)) else np.nan
+                            for start in (segment.get('start') for segment in response.segments)
+                        ], dtype=np.float64)
+                        valid_mask = np.isfinite(starts) & (starts >= 0)
+                        for i in np.flatnonzero(~valid_mask).tolist():
+                            print(f"Warning: Invalid start time for segment {i+1}. Skipping screenshot.")
+                            response.segments[i]['screenshot_url'] = None
+
+                        screenshot_segments = []
+                        screenshot_tasks = []
+                        valid_indices = np.flatnonzero(valid_mask)
+                        for i, segment_start_time in zip(valid_indices.tolist(), starts[valid_indices].tolist()):
+                            screenshot_filename = f"{video_hash}_{segment_start_time:.2f}.jpg" # Use hash to ensure uniqueness
+                            screenshot_segments.append((response.segments[i], screenshot_filename))
+                            screenshot_tasks.append((segment_start_time, os.path.join(screenshots_dir, screenshot_filename)))
+
+                        # One FFmpeg process per batch of timestamps instead of one per segment
+                        screenshot_results = extract_screenshots(temp_input_path, screenshot_tasks)
+                        for (segment, screenshot_filename), success in zip(screenshot_segments, screenshot_results):
+                            if success:
+                                # Add screenshot URL to segment
+                                segment['screenshot_url'] = f"/static/screenshots/{screenshot_filename}"
+                                screenshot_count += 1
+                            else:
+                                segment['screenshot_url'] = None
+                        print(f"\nFinished screenshot extraction. Successfully added {screenshot_count} screenshots.")
+                     else:
+                          print("No segments available to extract screenshots from.")
+                else:
+                     print("\nFile is not a video format. Skipping screenshot extraction.")
+                return screenshot_count
 
-            # Audio analysis for events and emotions
-            if settings.ENABLE_AUDIO_ANALYSIS:
+            def label_speakers() -> List[Dict]:
+                """Add speaker diarization labels to all_segments (in place)"""
                 try:
                     print("\n" + "="*60)
-                    print("Analyzing audio events and emotions...")
+                    print("Adding speaker labels to segments...")
                     print("="*60)
 
-                    # Analyze audio events and emotions in segments
-                    all_segments = AudioAnalysisService.analyze_segments(
+                    # Use the original input file for diarization (better quality)
+                    labeled_segments = add_speaker_labels(
                         audio_path=temp_input_path,
                         segments=all_segments,
-                        video_hash=video_hash
+                        num_speakers=None  # Auto-detect number of speakers
                     )
 
-                    # Also analyze silent segments for background sounds
-                    all_segments = AudioAnalysisService.analyze_silent_segments(
+                    print("Speaker labeling complete!")
+                    return labeled_segments
+                except Exception as e:
+                    print(f"⚠️  Speaker diarization failed: {str(e)}")
+                    # Continue without speaker labels
+                    import traceback
+                    traceback.print_exc()
+                    # Ensure all segments have a speaker field
+                    for seg in all_segments:
+                        if 'speaker' not in seg:
+                            seg['speaker'] = "SPEAKER_00"
+                    return all_segments
+
+            screenshot_count, all_segments = await asyncio.gather(
+                asyncio.to_thread(extract_segment_screenshots),
+                asyncio.to_thread(label_speakers),
+            )
+            # Update response segments with speaker information
+            response.segments = all_segments
+
+            # Audio analysis for events and emotions
+            if settings.ENABLE_AUDIO_ANALYSIS:
+                try:
+                    print("\n" + "="*60)
+                    print("Analyzing audio events and emotions...")
+                    print("="*60)
+
+                    # Analyze audio events and emotions in segments
+                    all_segments = AudioAnalysisService.analyze_segments(
+                        audio_path=temp_input_path,
+                        segments=all_segments,
+                        video_hash=video_hash
+                    )
+
+                    # Also analyze silent segments for background sounds
+                    all_segments = AudioAnalysisService.analyze_silent_segments(
                         audio_path=temp_input_path,
                         segments=all_segments
                     )
@@ -1219,7 +1453,7 @@ async def transcribe_video(
                     # Continue without audio analysis - not critical for transcription
 
             # FIX Issue 2: Detect gaps and create silent segments with screenshots
-            if file_extension in {'.mp4', '.mpeg', '.webm', '.mov', '.mkv'}:
+            if file_extension in VIDEO_SUFFIXES:
                 print("\n" + "="*60)
                 print("Detecting timeline gaps and creating silent segments...")
                 print("="*60)
@@ -1274,23 +1508,13 @@ async def transcribe_video(
                 print("Warning: No segments found in the final response object.")
 
             # --- Ensure unique IDs for all segments --- 
+            # One random prefix per transcription plus the segment index is unique
+            # across chunks and videos without drawing a UUID per segment
             print("\nEnsuring unique IDs for all segments before storing...")
-            assigned_ids = set()
-            final_segments = []
-            for segment_dict in result["transcription"]["segments"]:
-                # Always generate a new UUID to guarantee uniqueness across chunks
-                new_id = str(uuid.uuid4())
-                # Ensure the generated UUID is truly unique (highly unlikely collision, but safe)
-                while new_id in assigned_ids:
-                    new_id = str(uuid.uuid4())
-                
-                segment_dict["id"] = new_id # Assign the guaranteed unique ID
-                assigned_ids.add(new_id)
-                final_segments.append(segment_dict) # Add to the final list
-            
-            # Replace the segments list with the one containing guaranteed unique IDs
-            result["transcription"]["segments"] = final_segments
-            print(f"Assigned unique UUIDs to {len(result['transcription']['segments'])} segments.")
+            id_prefix = uuid.uuid4().hex[:12]
+            for i, segment_dict in enumerate(result["transcription"]["segments"]):
+                segment_dict["id"] = f"{id_prefix}-{i}"
+            print(f"Assigned unique IDs to {len(result['transcription']['segments'])} segments.")
             # --- End of unique ID assignment --- 
 
             # Store the transcription data, including the permanent file path
@@ -1320,121 +1544,88 @@ async def transcribe_video(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/transcribe_local/")
-@require_auth
-async def transcribe_local(
+async def _run_local_pipeline(
     request: Request,
-    file: UploadFile,
-    num_speakers: int = Form(None),
-    min_speakers: int = Form(None),
-    max_speakers: int = Form(None),
-    language: str = Form(None),
-    force_language: bool = Form(False)
+    filename: str,
+    upload_path: str,
+    video_hash: str,
+    suffix: str,
+    num_speakers: Optional[int],
+    min_speakers: Optional[int],
+    max_speakers: Optional[int],
+    language: Optional[str],
+    force_language: bool,
+    beam_size: Optional[int],
+    progress: Optional[Callable[[str, int, str], Awaitable[None]]] = None
 ) -> Dict:
-    """Transcribe uploaded audio/video file locally using faster-whisper.
+    """Transcribe, translate, screenshot, diarize and store an uploaded file (shared by
+    /transcribe_local/ and /transcribe_local_stream/).
 
-    Args:
-        file: Audio/video file to transcribe
-        num_speakers: Exact number of speakers (if known)
-        min_speakers: Minimum number of speakers for diarization
-        max_speakers: Maximum number of speakers for diarization
-        language: Optional language code (e.g., 'es', 'it', 'en'). If provided,
-                  Whisper will use this instead of auto-detection.
-        force_language: If True, completely override Whisper's detection with provided language
+    Blocking model and FFmpeg work runs on worker threads. progress, if given, is
+    awaited with (stage, percent, message) as the pipeline advances. The upload and
+    any temporary WAV are deleted when the pipeline finishes.
     """
-    
-    print(f"[INFO] Using local faster-whisper. Params: num_speakers={num_speakers}, min={min_speakers}, max={max_speakers}, language={language}, force_language={force_language}")
-    try:
-        suffix = Path(file.filename).suffix
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            temp_path = tmp.name
-
-        # Generate hash for the file
-        video_hash = generate_file_hash(temp_path)
-        print(f"Generated hash for video: {video_hash}")
-        
-        # Check if we already have a transcription for this file
-        existing_transcription = get_transcription(video_hash)
-        if existing_transcription:
-            # Check if the cached transcription is valid (has segments)
-            segments_count = len(existing_transcription.get('transcription', {}).get('segments', []))
-            if segments_count == 0:
-                print(f"⚠ WARNING: Found cached transcription with 0 segments. Deleting and re-transcribing...")
-                # Delete the invalid cached transcription
-                try:
-                    conn = sqlite3.connect('transcriptions.db')
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM transcriptions WHERE video_hash = ?", (video_hash,))
-                    conn.commit()
-                    conn.close()
-                    print(f"Deleted invalid cached transcription for {video_hash}")
-                except Exception as e:
-                    print(f"Error deleting invalid transcription: {str(e)}")
-                # Continue with new transcription (don't return, fall through)
-            else:
-                print(f"Found existing transcription for {file.filename} with hash {video_hash} ({segments_count} segments)")
-                dependencies._last_transcription_data = existing_transcription
-                request.app.state.last_transcription = existing_transcription
-                return existing_transcription
+    async def report(stage: str, percent: int, message: str = "") -> None:
+        if progress is not None:
+            await progress(stage, percent, message)
 
+    temp_wav_path = None
+    speaker_labels = None
+    is_video = suffix.lower() in VIDEO_SUFFIXES
+    try:
         # Save a permanent copy of the video file
         permanent_storage_dir = os.path.join("static", "videos")
         os.makedirs(permanent_storage_dir, exist_ok=True)
         permanent_file_path = os.path.join(permanent_storage_dir, f"{video_hash}{suffix}")
         if not os.path.exists(permanent_file_path):
-            shutil.copy2(temp_path, permanent_file_path)
+            await asyncio.to_thread(link_or_copy, upload_path, permanent_file_path)
             print(f"Saved permanent copy of video to: {permanent_file_path}")
         else:
             print(f"Permanent copy already exists at: {permanent_file_path}")
 
+        # File read for audio, screenshots and diarization (the MP4 after MKV conversion)
+        media_path = upload_path
+
         # Convert MKV to MP4 for browser compatibility
         if suffix == '.mkv':
             mp4_path = os.path.join(permanent_storage_dir, f"{video_hash}.mp4")
             if not os.path.exists(mp4_path):
                 print("\nMKV file detected - converting to MP4 for browser compatibility...")
-                conversion_success = convert_mkv_to_mp4(permanent_file_path, mp4_path)
+                conversion_success = await asyncio.to_thread(convert_mkv_to_mp4, permanent_file_path, mp4_path)
                 if conversion_success:
                     print(f"Conversion successful! Using MP4 file for playback.")
                     permanent_file_path = mp4_path
-                    temp_path = mp4_path  # Use converted file for screenshots
+                    media_path = mp4_path  # Use converted file for screenshots
                 else:
                     print(f"WARNING: Conversion failed. Video playback may not work in browser.")
             else:
                 print(f"MP4 version already exists at: {mp4_path}")
                 permanent_file_path = mp4_path
-                temp_path = mp4_path
+                media_path = mp4_path
 
         # Get audio duration
-        duration = 0.0
         try:
-            duration = get_audio_duration(temp_path)
+            duration = await asyncio.to_thread(get_audio_duration, media_path)
             duration_str = str(timedelta(seconds=int(duration)))
         except Exception as e:
             print(f"Error getting duration: {e}")
             duration_str = "Unknown"
 
-        start_time = time.time()
-        
-        # Convert to WAV first to avoid 'av' decoding issues with MP4
-        # Create a temporary WAV file
-        wav_suffix = ".wav"
-        temp_wav_path = None
-        with tempfile.NamedTemporaryFile(suffix=wav_suffix, delete=False) as wav_tmp:
-            temp_wav_path = wav_tmp.name
-            
-        print(f"Converting input to WAV: {temp_wav_path}")
+        await report("extracting", 30, "Converting audio to WAV format...")
+
+        # Decode with ffmpeg first to avoid 'av' decoding issues with MP4. The mono
+        # 16kHz PCM is piped straight into memory and handed to Whisper as an array;
+        # a WAV file is only written when audio analysis needs one.
+        print("Decoding input audio to 16kHz mono PCM...")
         try:
-            # Convert to mono 16kHz WAV using ffmpeg
-            command = [
-                'ffmpeg', '-i', temp_path,
-                '-vn', '-ac', '1', '-ar', '16000',
-                temp_wav_path, '-y'
-            ]
-            result = subprocess.run(command, check=True, capture_output=True)
-            print("Conversion to WAV successful")
-            transcribe_input = temp_wav_path
+            pcm = await asyncio.to_thread(AudioService.decode_to_pcm16, media_path)
+            transcribe_input = AudioService.pcm16_to_float32(pcm)
+            print(f"Audio decoding successful ({len(transcribe_input) / 16000:.1f}s)")
+            if settings.ENABLE_AUDIO_ANALYSIS:
+                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as wav_tmp:
+                    temp_wav_path = wav_tmp.name
+                await asyncio.to_thread(AudioService.write_pcm16_wav, pcm, temp_wav_path)
+            del pcm
         except subprocess.CalledProcessError as e:
             print(f"FFmpeg conversion failed with exit code {e.returncode}")
             print(f"FFmpeg stderr: {e.stderr.decode()}")
@@ -1443,11 +1634,15 @@ async def transcribe_local(
             print(f"Unexpected error during audio conversion: {e}")
             raise HTTPException(status_code=500, detail=f"Audio conversion error: {str(e)}")
 
+        await report("transcribing", 45, "Starting AI transcription...")
+        start_time = time.time()
+
         # --- KEY: Transcribe to original language, then translate if needed ---
         # Build transcription parameters
         transcribe_params = {
             "task": "transcribe",
-            "beam_size": 5,  # Improved: Increase from 1 to 5 for better accuracy
+            "beam_size": beam_size or settings.WHISPER_BEAM_SIZE,  # Greedy by default; beams multiply decode cost
+            "condition_on_previous_text": False,  # Avoid hallucination loops carrying across windows
             "vad_filter": settings.VAD_ENABLED,  # Add Voice Activity Detection for better timing
             "vad_parameters": dict(
                 min_silence_duration_ms=settings.VAD_MIN_SILENCE_DURATION_MS,
@@ -1460,11 +1655,35 @@ async def transcribe_local(
             transcribe_params["language"] = language
             print(f"[INFO] Using specified language: {language}")
 
-        segments, info = get_local_whisper_model().transcribe(
-            transcribe_input,
-            **transcribe_params
-        )
+        loop = asyncio.get_running_loop()
+
+        def run_whisper():
+            segments, info = whisper_transcribe(transcribe_input, **transcribe_params)
+            total_duration = info.duration or 0.0
+
+            def decoded_segments():
+                # Decoding happens while the lazy generator is consumed: report how far
+                # into the audio it has got (45-60%) as segments arrive
+                last_percent = 45
+                for count, seg in enumerate(segments, 1):
+                    yield seg
+                    if progress is None or total_duration <= 0:
+                        continue
+                    percent = 45 + int(min(seg.end / total_duration, 1.0) * 15)
+                    if percent > last_percent:
+                        last_percent = percent
+                        asyncio.run_coroutine_threadsafe(report(
+                            "transcribing", percent,
+                            f"Transcribed {count} segments ({int(seg.end)}s / {int(total_duration)}s)"
+                        ), loop)
+
+            return _whisper_segment_columns(decoded_segments()), info
+
+        (seg_starts, seg_ends, seg_texts), info = await asyncio.to_thread(run_whisper)
         processing_time = time.time() - start_time
+        print(f"Total segments from Whisper: {len(seg_texts)}")
+
+        await report("transcribing", 60, "Processing transcription segments...")
 
         # Detect language from transcription
         detected_language = info.language
@@ -1479,46 +1698,29 @@ async def transcribe_local(
         elif force_language and language:
             print(f"[INFO] Force override - using: {language}")
             detected_language = language
-        
+
         # Format segments to match expected structure and preserve original language
-        # IMPORTANT: Convert generator to list first, as generators can only be consumed once
-        segments_list = list(segments)
-        print(f"Total segments from Whisper: {len(segments_list)}")
-        
-        formatted_segments = []
-        for i, seg in enumerate(segments_list):
-            formatted_segments.append({
-                "id": str(uuid.uuid4()),
-                "start": seg.start,
-                "end": seg.end,
-                "start_time": format_timestamp(seg.start),
-                "end_time": format_timestamp(seg.end),
-                "text": seg.text,    # Original language text
-                "translation": None,  # Will be populated by translate_segments if needed
-            })
-        
+        formatted_segments = _format_segments(seg_starts, seg_ends, seg_texts)
         print(f"Formatted {len(formatted_segments)} segments")
 
-        # Language code normalization map
-        language_code_map = {
-            'spanish': 'es', 'español': 'es', 'es': 'es',
-            'italian': 'it', 'italiano': 'it', 'it': 'it',
-            'french': 'fr', 'français': 'fr', 'fr': 'fr',
-            'german': 'de', 'deutsch': 'de', 'de': 'de',
-            'portuguese': 'pt', 'português': 'pt', 'pt': 'pt',
-            'russian': 'ru', 'русский': 'ru', 'ru': 'ru',
-            'chinese': 'zh', 'zh': 'zh',
-            'japanese': 'ja', 'ja': 'ja',
-            'korean': 'ko', 'ko': 'ko',
-            'english': 'en', 'en': 'en'
-        }
+        # FIX: Fix overly long segment durations caused by chunk boundary processing
+        print("\nFixing segment durations...")
+        formatted_segments = fix_segment_durations(formatted_segments)
+
+        # Timing is final: diarize in the background while translating and extracting screenshots
+        print("\nAdding speaker labels...")
+        speaker_labels = _start_speaker_labels(
+            media_path, formatted_segments, num_speakers, min_speakers, max_speakers
+        )
+
+        await report("transcribing", 70, "Translating if needed...")
 
         # Normalize language code
-        normalized_lang = language_code_map.get(detected_language.lower(), detected_language.lower())
+        normalized_lang = normalize_language_code(detected_language)
         print(f"[INFO] Normalized language code: '{detected_language}' -> '{normalized_lang}'")
 
         # Translate if source language is not English
-        should_translate = normalized_lang not in ['en', 'english']
+        should_translate = normalized_lang not in ENGLISH_LANGUAGE_CODES
 
         if should_translate:
             print(f"[INFO] Detected language: {normalized_lang}. Translating {len(formatted_segments)} segments to English...")
@@ -1528,7 +1730,7 @@ async def transcribe_local(
                 model_name = f"Helsinki-NLP/opus-mt-{normalized_lang}-en"
                 print(f"[INFO] Using translation model: {model_name}")
 
-                formatted_segments = translate_segments(formatted_segments, normalized_lang)
+                formatted_segments = await asyncio.to_thread(translate_segments, formatted_segments, normalized_lang)
 
                 # Validate translations were actually generated
                 translated_count = sum(1 for s in formatted_segments if s.get('translation'))
@@ -1553,41 +1755,42 @@ async def transcribe_local(
             for segment in formatted_segments:
                 segment['translation'] = segment['text']
 
-        # FIX: Fix overly long segment durations caused by chunk boundary processing
-        print("\nFixing segment durations...")
-        formatted_segments = fix_segment_durations(formatted_segments)
+        await report("extracting", 75, "Extracting video screenshots...")
 
         # Extract screenshots if it's a video file
-        screenshots_dir = os.path.join("static", "screenshots")
+        screenshots_dir = settings.SCREENSHOTS_DIR
         os.makedirs(screenshots_dir, exist_ok=True)
         screenshot_count = 0
 
-        if suffix.lower() in {'.mp4', '.mpeg', '.webm', '.mov', '.mkv'}:
+        if is_video:
             print("\nExtracting screenshots for video segments...")
-            for segment in formatted_segments:
-                screenshot_filename = f"{video_hash}_{segment['start']:.2f}.jpg"
-                screenshot_path = os.path.join(screenshots_dir, screenshot_filename)
-
-                success = extract_screenshot(temp_path, segment['start'], screenshot_path)
-                if success and os.path.exists(screenshot_path):
-                    screenshot_url = f"/static/screenshots/{screenshot_filename}"
-                    segment["screenshot_url"] = screenshot_url
-                    screenshot_count += 1
-                else:
-                    segment["screenshot_url"] = None
+            # One FFmpeg process per 16 timestamps, SCREENSHOT_WORKERS processes at a time,
+            # with a progress update per round of batches
+            SCREENSHOT_BATCH = 16 * max(1, settings.SCREENSHOT_WORKERS)
+            for idx in range(0, len(formatted_segments), SCREENSHOT_BATCH):
+                batch = formatted_segments[idx:idx + SCREENSHOT_BATCH]
+                screenshot_filenames = [f"{video_hash}_{segment['start']:.2f}.jpg" for segment in batch]
+                screenshot_results = await asyncio.to_thread(extract_screenshots, media_path, [
+                    (segment['start'], os.path.join(screenshots_dir, filename))
+                    for segment, filename in zip(batch, screenshot_filenames)
+                ])
+                for segment, filename, success in zip(batch, screenshot_filenames, screenshot_results):
+                    if success:
+                        segment["screenshot_url"] = f"/static/screenshots/{filename}"
+                        screenshot_count += 1
+                    else:
+                        segment["screenshot_url"] = None
+
+                screenshot_progress = 75 + int((idx / len(formatted_segments)) * 10)
+                await report("extracting", screenshot_progress, f"Screenshots: {idx}/{len(formatted_segments)}")
 
             print(f"\nFinished screenshot extraction. Successfully added {screenshot_count} screenshots.")
 
+        await report("transcribing", 85, "Identifying speakers...")
+
         # Add speaker diarization
         try:
-            print("\nAdding speaker labels...")
-            formatted_segments = add_speaker_labels(
-                audio_path=temp_path,
-                segments=formatted_segments,
-                num_speakers=num_speakers,
-                min_speakers=min_speakers,
-                max_speakers=max_speakers
-            )
+            _merge_speaker_labels(formatted_segments, await speaker_labels)
             print("Speaker labeling complete")
         except Exception as e:
             print(f"⚠️  Speaker diarization failed: {str(e)}")
@@ -1598,30 +1801,34 @@ async def transcribe_local(
 
         # Audio analysis for events and emotions
         if settings.ENABLE_AUDIO_ANALYSIS:
-            try:
-                print("\nAnalyzing audio events and emotions...")
+            await report("transcribing", 88, "Analyzing audio events and emotions...")
 
+            def analyze_audio(segments: List[Dict]) -> List[Dict]:
                 # Analyze audio events and emotions in segments
-                formatted_segments = AudioAnalysisService.analyze_segments(
+                segments = AudioAnalysisService.analyze_segments(
                     audio_path=temp_wav_path,
-                    segments=formatted_segments,
+                    segments=segments,
                     video_hash=video_hash
                 )
 
                 # Also analyze silent segments for background sounds
-                formatted_segments = AudioAnalysisService.analyze_silent_segments(
+                segments = AudioAnalysisService.analyze_silent_segments(
                     audio_path=temp_wav_path,
-                    segments=formatted_segments
+                    segments=segments
                 )
 
                 # Index audio events in vector store for search
                 try:
                     from vector_store import vector_store
-                    vector_store.index_audio_events(video_hash, formatted_segments)
+                    vector_store.index_audio_events(video_hash, segments)
                     print("Audio events indexed in vector store")
                 except Exception as idx_e:
                     print(f"Audio indexing failed (non-critical): {str(idx_e)}")
+                return segments
 
+            try:
+                print("\nAnalyzing audio events and emotions...")
+                formatted_segments = await asyncio.to_thread(analyze_audio, formatted_segments)
                 print("Audio analysis complete!")
             except Exception as e:
                 print(f"Audio analysis failed (non-critical): {str(e)}")
@@ -1630,31 +1837,29 @@ async def transcribe_local(
                 # Continue without audio analysis - not critical for transcription
 
         # FIX Issue 2: Detect gaps and create silent segments with screenshots
-        if suffix.lower() in {'.mp4', '.mpeg', '.webm', '.mov', '.mkv'}:
+        if is_video:
+            await report("extracting", 90, "Detecting timeline gaps...")
             print("\nDetecting timeline gaps and creating silent segments...")
             formatted_segments = create_silent_segments_for_gaps(
                 segments=formatted_segments,
                 min_gap_duration=2.0
             )
-            extract_silent_segment_screenshots(formatted_segments, source=temp_path, video_hash=video_hash)
+            await asyncio.to_thread(
+                extract_silent_segment_screenshots, formatted_segments, source=media_path, video_hash=video_hash
+            )
             print("Gap detection complete")
 
+        await report("complete", 95, "Finalizing transcription...")
+
         # Calculate translation statistics for user feedback
-        translation_stats = {
-            'total_segments': len(formatted_segments),
-            'segments_translated': sum(1 for s in formatted_segments if s.get('translation') and not s.get('translation_error')),
-            'translation_errors': sum(1 for s in formatted_segments if s.get('translation_error')),
-            'detected_language': detected_language,
-            'normalized_language': normalized_lang,
-            'translation_attempted': should_translate
-        }
+        translation_stats = _translation_stats(formatted_segments, detected_language, normalized_lang, should_translate)
         print(f"[STATS] Translation: {translation_stats['segments_translated']}/{translation_stats['total_segments']} successful")
 
         result = {
-            "filename": file.filename,
+            "filename": filename,
             "video_hash": video_hash,
             "transcription": {
-                "text": "".join([seg.text for seg in segments_list]),
+                "text": "".join(seg_texts),
                 "language": info.language,
                 "duration": duration_str,
                 "segments": formatted_segments,
@@ -1664,25 +1869,76 @@ async def transcribe_local(
         }
 
         # Store the transcription data
-        store_transcription(video_hash, file.filename, result, permanent_file_path)
-        
+        await asyncio.to_thread(store_transcription, video_hash, filename, result, permanent_file_path)
+
         # Store as last transcription in both global variable and request state
         dependencies._last_transcription_data = result
         request.app.state.last_transcription = result
-        
+
         # Add video URL to the result
         result["video_url"] = f"/video/{video_hash}"
+        return result
+    finally:
+        # Diarization may still be reading the upload if an earlier step failed
+        await _settle_speaker_labels(speaker_labels)
+        # Clean up temporary files (never media_path: after MKV conversion it is the permanent MP4)
+        await asyncio.to_thread(_remove_temp_paths, upload_path, temp_wav_path)
 
-        # Clean up temporary files
-        try:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-            if temp_wav_path and os.path.exists(temp_wav_path):
-                os.unlink(temp_wav_path)
-        except Exception as e:
-            print(f"Error cleaning up temp file: {e}")
 
-        return result
+@router.post("/transcribe_local/")
+@require_auth
+async def transcribe_local(
+    request: Request,
+    file: UploadFile,
+    num_speakers: int = Form(None),
+    min_speakers: int = Form(None),
+    max_speakers: int = Form(None),
+    language: str = Form(None),
+    force_language: bool = Form(False),
+    beam_size: int = Form(None)
+) -> Dict:
+    """Transcribe uploaded audio/video file locally using faster-whisper.
+
+    Args:
+        file: Audio/video file to transcribe
+        num_speakers: Exact number of speakers (if known)
+        min_speakers: Minimum number of speakers for diarization
+        max_speakers: Maximum number of speakers for diarization
+        language: Optional language code (e.g., 'es', 'it', 'en'). If provided,
+                  Whisper will use this instead of auto-detection.
+        force_language: If True, completely override Whisper's detection with provided language
+        beam_size: Optional Whisper beam size (defaults to WHISPER_BEAM_SIZE; higher is slower but more accurate)
+    """
+    
+    print(f"[INFO] Using local faster-whisper. Params: num_speakers={num_speakers}, min={min_speakers}, max={max_speakers}, language={language}, force_language={force_language}")
+    try:
+        suffix = Path(file.filename).suffix
+        temp_path, video_hash = await asyncio.to_thread(_copy_upload_to_temp, file, suffix)
+        print(f"Generated hash for video: {video_hash}")
+        
+        # Check if we already have a transcription for this file
+        existing_transcription = get_transcription(video_hash)
+        if existing_transcription:
+            # Check if the cached transcription is valid (has segments)
+            segments_count = len(existing_transcription.get('transcription', {}).get('segments', []))
+            if segments_count == 0:
+                print(f"⚠ WARNING: Found cached transcription with 0 segments. Deleting and re-transcribing...")
+                # Delete the invalid cached transcription
+                if db_delete_transcription(video_hash):
+                    print(f"Deleted invalid cached transcription for {video_hash}")
+                else:
+                    print(f"Error deleting invalid transcription for {video_hash}")
+                # Continue with new transcription (don't return, fall through)
+            else:
+                print(f"Found existing transcription for {file.filename} with hash {video_hash} ({segments_count} segments)")
+                dependencies._last_transcription_data = existing_transcription
+                request.app.state.last_transcription = existing_transcription
+                return existing_transcription
+
+        return await _run_local_pipeline(
+            request, file.filename, temp_path, video_hash, suffix,
+            num_speakers, min_speakers, max_speakers, language, force_language, beam_size
+        )
     except Exception as e:
         print(f"Error in local transcription: {e}")
         import traceback
@@ -1700,13 +1956,15 @@ async def transcribe_local_stream(
     min_speakers: int = Form(None),
     max_speakers: int = Form(None),
     language: str = Form(None),
-    force_language: bool = Form(False)
+    force_language: bool = Form(False),
+    beam_size: int = Form(None)
 ):
     """Transcribe with real-time progress updates via Server-Sent Events.
 
     Args:
         language: Optional language code (e.g., 'es', 'it', 'en')
         force_language: If True, override Whisper's detection with provided language
+        beam_size: Optional Whisper beam size (defaults to WHISPER_BEAM_SIZE)
     """
 
     async def generate_progress():
@@ -1714,21 +1972,17 @@ async def transcribe_local_stream(
         try:
             # Progress helper
             def emit(stage: str, progress: int, message: str = ""):
-                return f"data: {json.dumps({'stage': stage, 'progress': progress, 'message': message})}\n\n"
+                return _sse({'stage': stage, 'progress': progress, 'message': message})
 
             yield emit("uploading", 10, "Receiving file...")
 
             # Save uploaded file
             suffix = Path(file.filename).suffix
-            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-                content = await file.read()
-                tmp.write(content)
-                temp_path = tmp.name
+            temp_path, video_hash = await asyncio.to_thread(_copy_upload_to_temp, file, suffix)
 
             yield emit("uploading", 20, "File uploaded successfully")
 
-            # Generate hash and check cache
-            video_hash = generate_file_hash(temp_path)
+            # Check cache (hash was computed during the copy)
             existing_transcription = get_transcription(video_hash)
 
             if existing_transcription:
@@ -1736,266 +1990,38 @@ async def transcribe_local_stream(
                 if segments_count > 0:
                     print(f"Found cached transcription with {segments_count} segments")
                     yield emit("complete", 100, "Loaded from cache")
-                    yield f"data: {json.dumps({'stage': 'complete', 'progress': 100, 'result': existing_transcription})}\n\n"
+                    yield _sse({'stage': 'complete', 'progress': 100, 'result': existing_transcription})
                     return
 
-            # Save permanent copy
-            permanent_storage_dir = os.path.join("static", "videos")
-            os.makedirs(permanent_storage_dir, exist_ok=True)
-            permanent_file_path = os.path.join(permanent_storage_dir, f"{video_hash}{suffix}")
-            if not os.path.exists(permanent_file_path):
-                shutil.copy2(temp_path, permanent_file_path)
-
-            # Get duration
-            duration = 0.0
-            try:
-                duration = get_audio_duration(temp_path)
-                duration_str = str(timedelta(seconds=int(duration)))
-            except Exception as e:
-                duration_str = "Unknown"
-
-            # Determine max_speakers
-            computed_max_speakers = max_speakers
-
-            yield emit("extracting", 30, "Converting audio to WAV format...")
-
-            # Convert to WAV
-            wav_suffix = ".wav"
-            temp_wav_path = None
-            with tempfile.NamedTemporaryFile(suffix=wav_suffix, delete=False) as wav_tmp:
-                temp_wav_path = wav_tmp.name
-
-            command = [
-                'ffmpeg', '-i', temp_path,
-                '-vn', '-ac', '1', '-ar', '16000',
-                temp_wav_path, '-y'
-            ]
-            subprocess.run(command, check=True, capture_output=True)
-
-            yield emit("transcribing", 45, "Starting AI transcription...")
-
-            start_time = time.time()
-
-            # Build transcription parameters
-            transcribe_params = {
-                "task": "transcribe",
-                "beam_size": 5,  # Better accuracy
-                "vad_filter": settings.VAD_ENABLED,
-                "vad_parameters": dict(
-                    min_silence_duration_ms=settings.VAD_MIN_SILENCE_DURATION_MS,
-                    threshold=settings.VAD_THRESHOLD
-                )
-            }
-
-            # Add language parameter if provided
-            if language:
-                transcribe_params["language"] = language
-                print(f"[INFO] Stream: Using specified language: {language}")
-
-            segments, info = get_local_whisper_model().transcribe(
-                temp_wav_path,
-                **transcribe_params
-            )
-
-            yield emit("transcribing", 60, "Processing transcription segments...")
-
-            segments_list = list(segments)
-            detected_language = info.language
-            print(f"[INFO] Stream: Whisper detected language: {detected_language}")
-
-            # Validate and potentially override detected language
-            if language and not force_language:
-                if detected_language != language:
-                    print(f"[WARNING] Stream: Language mismatch! Specified: {language}, Detected: {detected_language}")
-                    detected_language = language
-            elif force_language and language:
-                print(f"[INFO] Stream: Force override - using: {language}")
-                detected_language = language
-
-            formatted_segments = []
-            total_segments = len(segments_list)
-            for i, seg in enumerate(segments_list):
-                formatted_segments.append({
-                    "id": str(uuid.uuid4()),
-                    "start": seg.start,
-                    "end": seg.end,
-                    "start_time": format_timestamp(seg.start),
-                    "end_time": format_timestamp(seg.end),
-                    "text": seg.text,
-                    "translation": None,
-                })
-
-                # Emit progress every 10 segments
-                if i % 10 == 0:
-                    segment_progress = 60 + int((i / total_segments) * 10)
-                    yield emit("transcribing", segment_progress, f"Processed {i}/{total_segments} segments...")
-
-            processing_time = time.time() - start_time
-
-            # FIX: Fix overly long segment durations caused by chunk boundary processing
-            yield emit("transcribing", 68, "Fixing segment durations...")
-            formatted_segments = fix_segment_durations(formatted_segments)
-
-            yield emit("transcribing", 70, "Translating if needed...")
-
-            # Language code normalization
-            language_code_map = {
-                'spanish': 'es', 'español': 'es', 'es': 'es',
-                'italian': 'it', 'italiano': 'it', 'it': 'it',
-                'french': 'fr', 'français': 'fr', 'fr': 'fr',
-                'german': 'de', 'deutsch': 'de', 'de': 'de',
-                'portuguese': 'pt', 'português': 'pt', 'pt': 'pt',
-                'russian': 'ru', 'русский': 'ru', 'ru': 'ru',
-                'chinese': 'zh', 'zh': 'zh',
-                'japanese': 'ja', 'ja': 'ja',
-                'korean': 'ko', 'ko': 'ko',
-                'english': 'en', 'en': 'en'
-            }
-
-            normalized_lang = language_code_map.get(detected_language.lower(), detected_language.lower())
-            print(f"[INFO] Stream: Normalized language: '{detected_language}' -> '{normalized_lang}'")
-            should_translate = normalized_lang not in ['en', 'english']
-
-            # Translate if not English
-            if should_translate:
-                try:
-                    formatted_segments = translate_segments(formatted_segments, normalized_lang)
-                    translated_count = sum(1 for s in formatted_segments if s.get('translation'))
-                    print(f"[SUCCESS] Stream: Translated {translated_count}/{len(formatted_segments)} segments")
-                except Exception as e:
-                    print(f"[ERROR] Stream: Translation failed: {str(e)}")
-                    for segment in formatted_segments:
-                        segment['translation'] = f"[Translation Error: {normalized_lang}->en]"
-                        segment['translation_error'] = str(e)
-            else:
-                print("[INFO] Stream: Language is English, no translation needed")
-                for segment in formatted_segments:
-                    segment['translation'] = segment['text']
-
-            yield emit("extracting", 75, "Extracting video screenshots...")
-
-            # Extract screenshots
-            screenshots_dir = os.path.join("static", "screenshots")
-            os.makedirs(screenshots_dir, exist_ok=True)
-            screenshot_count = 0
+            # Run the shared pipeline as a task and relay its progress reports as they happen
+            events: asyncio.Queue = asyncio.Queue()
 
-            if suffix.lower() in {'.mp4', '.mpeg', '.webm', '.mov', '.mkv'}:
-                for idx, segment in enumerate(formatted_segments):
-                    screenshot_filename = f"{video_hash}_{segment['start']:.2f}.jpg"
-                    screenshot_path = os.path.join(screenshots_dir, screenshot_filename)
+            async def report(stage: str, percent: int, message: str) -> None:
+                await events.put(emit(stage, percent, message))
 
-                    success = extract_screenshot(temp_path, segment['start'], screenshot_path)
-                    if success and os.path.exists(screenshot_path):
-                        segment["screenshot_url"] = f"/static/screenshots/{screenshot_filename}"
-                        screenshot_count += 1
-                    else:
-                        segment["screenshot_url"] = None
-
-                    # Progress update every 5 screenshots
-                    if idx % 5 == 0:
-                        screenshot_progress = 75 + int((idx / len(formatted_segments)) * 10)
-                        yield emit("extracting", screenshot_progress, f"Screenshots: {idx}/{len(formatted_segments)}")
-
-            yield emit("transcribing", 85, "Identifying speakers...")
-
-            # Speaker diarization
-            try:
-                formatted_segments = add_speaker_labels(
-                    audio_path=temp_path,
-                    segments=formatted_segments,
-                    num_speakers=num_speakers,
-                    min_speakers=min_speakers,
-                    max_speakers=computed_max_speakers
-                )
-            except Exception as e:
-                print(f"Speaker diarization failed: {str(e)}")
-                for seg in formatted_segments:
-                    if 'speaker' not in seg:
-                        seg['speaker'] = "SPEAKER_00"
-
-            # Audio analysis for events and emotions
-            if settings.ENABLE_AUDIO_ANALYSIS:
-                try:
-                    yield emit("transcribing", 88, "Analyzing audio events and emotions...")
-                    print("\nAnalyzing audio events and emotions...")
-
-                    # Analyze audio events and emotions in segments
-                    formatted_segments = AudioAnalysisService.analyze_segments(
-                        audio_path=temp_wav_path,
-                        segments=formatted_segments,
-                        video_hash=video_hash
-                    )
-
-                    # Also analyze silent segments for background sounds
-                    formatted_segments = AudioAnalysisService.analyze_silent_segments(
-                        audio_path=temp_wav_path,
-                        segments=formatted_segments
-                    )
-
-                    # Index audio events in vector store for search
-                    try:
-                        from vector_store import vector_store
-                        vector_store.index_audio_events(video_hash, formatted_segments)
-                        print("Audio events indexed in vector store")
-                    except Exception as idx_e:
-                        print(f"Audio indexing failed (non-critical): {str(idx_e)}")
-
-                    print("Audio analysis complete!")
-                except Exception as e:
-                    print(f"Audio analysis failed (non-critical): {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                    # Continue without audio analysis - not critical for transcription
-
-            # FIX Issue 2: Detect gaps and create silent segments with screenshots
-            if suffix.lower() in {'.mp4', '.mpeg', '.webm', '.mov', '.mkv'}:
-                yield emit("extracting", 90, "Detecting timeline gaps...")
-                formatted_segments = create_silent_segments_for_gaps(
-                    segments=formatted_segments,
-                    min_gap_duration=2.0
-                )
-                extract_silent_segment_screenshots(formatted_segments, source=temp_path, video_hash=video_hash)
-                print("Gap detection complete")
-
-            yield emit("complete", 95, "Finalizing transcription...")
-
-            # Build result
-            result = {
-                "filename": file.filename,
-                "video_hash": video_hash,
-                "transcription": {
-                    "text": "".join([seg.text for seg in segments_list]),
-                    "language": info.language,
-                    "duration": duration_str,
-                    "segments": formatted_segments,
-                    "processing_time": format_eta(int(processing_time))
-                }
-            }
-
-            # Store transcription
-            store_transcription(video_hash, file.filename, result, permanent_file_path)
-            dependencies._last_transcription_data = result
-            request.app.state.last_transcription = result
-            result["video_url"] = f"/video/{video_hash}"
-
-            # Clean up
+            pipeline = asyncio.create_task(_run_local_pipeline(
+                request, file.filename, temp_path, video_hash, suffix,
+                num_speakers, min_speakers, max_speakers, language, force_language, beam_size,
+                progress=report
+            ))
+            pipeline.add_done_callback(lambda _: events.put_nowait(None))
             try:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                if temp_wav_path and os.path.exists(temp_wav_path):
-                    os.unlink(temp_wav_path)
-            except Exception as e:
-                print(f"Error cleaning up: {e}")
+                while (event := await events.get()) is not None:
+                    yield event
+            finally:
+                if not pipeline.done():
+                    pipeline.cancel()
+            result = pipeline.result()
 
             # Send final result
             yield emit("complete", 100, "Transcription complete!")
-            yield f"data: {json.dumps({'stage': 'complete', 'progress': 100, 'result': result})}\n\n"
+            yield _sse({'stage': 'complete', 'progress': 100, 'result': result})
 
         except Exception as e:
             print(f"Error in streaming transcription: {e}")
             import traceback
             traceback.print_exc()
-            yield f"data: {json.dumps({'stage': 'error', 'progress': 0, 'error': str(e)})}\n\n"
+            yield _sse({'stage': 'error', 'progress': 0, 'error': str(e)})
 
     return StreamingResponse(generate_progress(), media_type="text/event-stream")
 
@@ -2010,7 +2036,8 @@ async def transcribe_gcs_stream(
     min_speakers: int = Form(None),
     max_speakers: int = Form(None),
     language: str = Form(None),
-    force_language: bool = Form(False)
+    force_language: bool = Form(False),
+    beam_size: int = Form(None)
 ):
     """
     Transcribe a video file uploaded to GCS with real-time progress updates.
@@ -2023,23 +2050,26 @@ async def transcribe_gcs_stream(
         filename: Original filename for display
         language: Optional language code (e.g., 'es', 'it', 'en')
         force_language: If True, override Whisper's detection with provided language
+        beam_size: Optional Whisper beam size (defaults to WHISPER_BEAM_SIZE)
     """
     from services.gcs_service import gcs_service
 
     async def generate_progress():
         temp_path = None
         temp_wav_path = None
+        temp_dir = None
+        speaker_labels = None
 
         try:
             # Progress helper
             def emit(stage: str, progress: int, message: str = ""):
-                return f"data: {json.dumps({'stage': stage, 'progress': progress, 'message': message})}\n\n"
+                return _sse({'stage': stage, 'progress': progress, 'message': message})
 
             yield emit("downloading", 5, "Verifying file in cloud storage...")
 
             # Verify file exists in GCS
             if not gcs_service.file_exists(gcs_path):
-                yield f"data: {json.dumps({'stage': 'error', 'progress': 0, 'error': 'File not found in cloud storage'})}\n\n"
+                yield _sse({'stage': 'error', 'progress': 0, 'error': 'File not found in cloud storage'})
                 return
 
             file_size = gcs_service.get_file_size(gcs_path)
@@ -2047,6 +2077,7 @@ async def transcribe_gcs_stream(
             yield emit("downloading", 10, f"Verifying cache for {size_mb:.1f} MB video...")
 
             suffix = "." + filename.rsplit(".", 1)[-1] if "." in filename else ".mp4"
+            is_video = suffix.lower() in VIDEO_SUFFIXES
 
             # For caching, we use the GCS path as a unique identifier to avoid downloading
             # just for hash generation. This is safe because GCS paths include UUIDs.
@@ -2069,7 +2100,7 @@ async def transcribe_gcs_stream(
                         except Exception as move_err:
                             print(f"[GCS] Cache-hit move to processed failed (keeping {gcs_path}): {move_err}")
                     yield emit("complete", 100, "Loaded from cache")
-                    yield f"data: {json.dumps({'stage': 'complete', 'progress': 100, 'result': existing_transcription})}\n\n"
+                    yield _sse({'stage': 'complete', 'progress': 100, 'result': existing_transcription})
                     return
 
             yield emit("extracting", 15, "Streaming audio extraction from cloud...")
@@ -2125,7 +2156,7 @@ async def transcribe_gcs_stream(
                 if audio_chunks:
                     # Sum up duration from all chunks
                     for chunk_path in audio_chunks:
-                        chunk_duration = get_audio_duration(chunk_path)
+                        chunk_duration = AudioService.get_wav_duration(chunk_path)
                         duration += chunk_duration
                     duration_str = str(timedelta(seconds=int(duration)))
                     print(f"[GCS Stream] Total audio duration: {duration_str}")
@@ -2142,7 +2173,8 @@ async def transcribe_gcs_stream(
             # Build transcription parameters
             transcribe_params = {
                 "task": "transcribe",
-                "beam_size": 5,
+                "beam_size": beam_size or settings.WHISPER_BEAM_SIZE,  # Greedy by default; beams multiply decode cost
+                "condition_on_previous_text": False,  # Avoid hallucination loops carrying across windows
                 "vad_filter": settings.VAD_ENABLED,
                 "vad_parameters": dict(
                     min_silence_duration_ms=settings.VAD_MIN_SILENCE_DURATION_MS,
@@ -2154,8 +2186,10 @@ async def transcribe_gcs_stream(
                 transcribe_params["language"] = language
                 print(f"[INFO] GCS Stream: Using specified language: {language}")
 
-            # Transcribe each audio chunk and combine results
-            all_segments = []
+            # Transcribe each audio chunk and combine results as time/text columns
+            all_starts: List[np.ndarray] = []
+            all_ends: List[np.ndarray] = []
+            seg_texts: List[str] = []
             detected_language = None
             chunk_duration_seconds = 300  # Must match segment_duration above
 
@@ -2166,31 +2200,34 @@ async def transcribe_gcs_stream(
 
                 print(f"[GCS Stream] Transcribing chunk {i+1}/{total_chunks}: {chunk_path}")
 
-                segments, info = get_local_whisper_model().transcribe(
-                    chunk_path,
-                    **transcribe_params
-                )
+                def transcribe_wav_chunk(chunk_path: str):
+                    # The chunks are already 16kHz mono PCM: hand Whisper the samples
+                    # instead of having it decode the file again
+                    samples = AudioService.read_wav_samples(chunk_path)
+                    segments, info = whisper_transcribe(
+                        samples if samples is not None else chunk_path,
+                        **transcribe_params
+                    )
+                    return _whisper_segment_columns(segments), info
 
-                chunk_segments = list(segments)
+                (chunk_starts, chunk_ends, chunk_texts), info = await asyncio.to_thread(transcribe_wav_chunk, chunk_path)
 
                 # Use language from first chunk
                 if detected_language is None:
                     detected_language = info.language
                     print(f"[INFO] GCS Stream: Whisper detected language: {detected_language}")
 
-                # Adjust segment times based on chunk offset
+                # Adjust segment times to be relative to the full video
                 chunk_offset = i * chunk_duration_seconds
-                for seg in chunk_segments:
-                    # Adjust segment times to be relative to the full video
-                    seg.start += chunk_offset
-                    seg.end += chunk_offset
-
-                all_segments.extend(chunk_segments)
+                all_starts.append(chunk_starts + chunk_offset)
+                all_ends.append(chunk_ends + chunk_offset)
+                seg_texts.extend(chunk_texts)
 
             yield emit("transcribing", 55, "Processing transcription segments...")
 
-            segments_list = all_segments
-            print(f"[GCS Stream] Combined {len(segments_list)} segments from {total_chunks} chunks")
+            seg_starts = np.concatenate(all_starts) if all_starts else np.empty(0)
+            seg_ends = np.concatenate(all_ends) if all_ends else np.empty(0)
+            print(f"[GCS Stream] Combined {len(seg_texts)} segments from {total_chunks} chunks")
 
             # Validate and potentially override detected language
             if language and not force_language:
@@ -2201,50 +2238,29 @@ async def transcribe_gcs_stream(
                 print(f"[INFO] GCS Stream: Force override - using: {language}")
                 detected_language = language
 
-            formatted_segments = []
-            total_segments = len(segments_list)
-            for i, seg in enumerate(segments_list):
-                formatted_segments.append({
-                    "id": str(uuid.uuid4()),
-                    "start": seg.start,
-                    "end": seg.end,
-                    "start_time": format_timestamp(seg.start),
-                    "end_time": format_timestamp(seg.end),
-                    "text": seg.text,
-                    "translation": None,
-                })
-
-                if i % 10 == 0:
-                    segment_progress = 55 + int((i / total_segments) * 10)
-                    yield emit("transcribing", segment_progress, f"Processed {i}/{total_segments} segments...")
+            formatted_segments = _format_segments(seg_starts, seg_ends, seg_texts)
+            yield emit("transcribing", 62, f"Processed {len(formatted_segments)} segments")
 
             processing_time = time.time() - start_time
 
             yield emit("transcribing", 65, "Fixing segment durations...")
             formatted_segments = fix_segment_durations(formatted_segments)
 
-            yield emit("transcribing", 68, "Translating if needed...")
+            # Diarize the concatenated audio in the background while translating and
+            # extracting screenshots; labels are merged at the speaker step below
+            if full_audio_path:
+                speaker_labels = _start_speaker_labels(
+                    full_audio_path, formatted_segments, num_speakers, min_speakers, computed_max_speakers
+                )
 
-            # Language code normalization
-            language_code_map = {
-                'spanish': 'es', 'español': 'es', 'es': 'es',
-                'italian': 'it', 'italiano': 'it', 'it': 'it',
-                'french': 'fr', 'français': 'fr', 'fr': 'fr',
-                'german': 'de', 'deutsch': 'de', 'de': 'de',
-                'portuguese': 'pt', 'português': 'pt', 'pt': 'pt',
-                'russian': 'ru', 'русский': 'ru', 'ru': 'ru',
-                'chinese': 'zh', 'zh': 'zh',
-                'japanese': 'ja', 'ja': 'ja',
-                'korean': 'ko', 'ko': 'ko',
-                'english': 'en', 'en': 'en'
-            }
+            yield emit("transcribing", 68, "Translating if needed...")
 
-            normalized_lang = language_code_map.get(detected_language.lower(), detected_language.lower())
-            should_translate = normalized_lang not in ['en', 'english']
+            normalized_lang = normalize_language_code(detected_language)
+            should_translate = normalized_lang not in ENGLISH_LANGUAGE_CODES
 
             if should_translate:
                 try:
-                    formatted_segments = translate_segments(formatted_segments, normalized_lang)
+                    formatted_segments = await asyncio.to_thread(translate_segments, formatted_segments, normalized_lang)
                     translated_count = sum(1 for s in formatted_segments if s.get('translation'))
                     print(f"[SUCCESS] GCS Stream: Translated {translated_count}/{len(formatted_segments)} segments")
                 except Exception as e:
@@ -2260,11 +2276,11 @@ async def transcribe_gcs_stream(
 
             # Extract screenshots directly from GCS URL (no full video download!)
             # This uses FFmpeg's HTTP Range requests to only download needed keyframes
-            screenshots_dir = os.path.join("static", "screenshots")
+            screenshots_dir = settings.SCREENSHOTS_DIR
             os.makedirs(screenshots_dir, exist_ok=True)
             screenshot_count = 0
 
-            if suffix.lower() in {'.mp4', '.mpeg', '.webm', '.mov', '.mkv'}:
+            if is_video:
                 yield emit("extracting", 73, "Streaming screenshots from cloud...")
 
                 # Collect all timestamps to extract
@@ -2287,7 +2303,7 @@ async def transcribe_gcs_stream(
                             timestamps=batch_timestamps,
                             output_dir=screenshots_dir,
                             video_hash=video_hash,
-                            max_workers=4  # Limit parallel connections to control memory
+                            max_workers=settings.SCREENSHOT_URL_WORKERS  # Limit parallel connections to control memory
                         )
                         screenshot_results.update(batch_results)
                     except Exception as e:
@@ -2353,14 +2369,8 @@ async def transcribe_gcs_stream(
 
             # Speaker diarization - use pre-concatenated full audio
             try:
-                if full_audio_path:
-                    formatted_segments = add_speaker_labels(
-                        audio_path=full_audio_path,
-                        segments=formatted_segments,
-                        num_speakers=num_speakers,
-                        min_speakers=min_speakers,
-                        max_speakers=computed_max_speakers
-                    )
+                if speaker_labels is not None:
+                    _merge_speaker_labels(formatted_segments, await speaker_labels)
                 else:
                     print("[GCS Stream] No audio chunks available for speaker diarization")
                     for seg in formatted_segments:
@@ -2405,7 +2415,7 @@ async def transcribe_gcs_stream(
                     print(f"Audio analysis failed (non-critical): {str(e)}")
 
             # Gap detection - use URL streaming for screenshots (no full download needed!)
-            if suffix.lower() in {'.mp4', '.mpeg', '.webm', '.mov', '.mkv'}:
+            if is_video:
                 yield emit("extracting", 90, "Detecting timeline gaps (streaming)...")
 
                 # Pure gap detection (no I/O)
@@ -2424,13 +2434,16 @@ async def transcribe_gcs_stream(
                 "filename": filename,
                 "video_hash": video_hash,
                 "transcription": {
-                    "text": "".join([seg.text for seg in segments_list]),
+                    "text": "".join(seg_texts),
                     "language": detected_language or "unknown",
                     "duration": duration_str,
                     "segments": formatted_segments,
                     "processing_time": format_eta(int(processing_time))
                 },
                 "gcs_path": gcs_path,  # Include GCS path for reference
+                "translation_stats": _translation_stats(
+                    formatted_segments, detected_language, normalized_lang, should_translate
+                ),
             }
 
             # Note: We no longer download the full video to save memory
@@ -2441,7 +2454,7 @@ async def transcribe_gcs_stream(
 
             # Only copy if we happened to download the video (shouldn't happen with streaming)
             if temp_path and os.path.exists(temp_path) and not os.path.exists(permanent_file_path):
-                shutil.copy2(temp_path, permanent_file_path)
+                await asyncio.to_thread(link_or_copy, temp_path, permanent_file_path)
                 print(f"[GCS Stream] Saved permanent copy: {permanent_file_path}")
             elif not os.path.exists(permanent_file_path):
                 # No local copy - video will be served from GCS
@@ -2471,43 +2484,24 @@ async def transcribe_gcs_stream(
                 except Exception as e:
                     print(f"[GCS] Failed to move to processed: {e}")
 
-            # Clean up temp files
-            try:
-                # Clean up temp directory with audio chunks
-                if temp_dir and os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir)
-                    print(f"[GCS Stream] Cleaned up temp directory: {temp_dir}")
-
-                # Clean up downloaded video if it exists
-                if temp_path and os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                    print(f"[GCS Stream] Cleaned up temp video: {temp_path}")
-            except Exception as e:
-                print(f"Error cleaning up: {e}")
-
             yield emit("complete", 100, "Transcription complete!")
-            yield f"data: {json.dumps({'stage': 'complete', 'progress': 100, 'result': result})}\n\n"
+            yield _sse({'stage': 'complete', 'progress': 100, 'result': result})
 
         except Exception as e:
             print(f"Error in GCS streaming transcription: {e}")
             import traceback
             traceback.print_exc()
 
-            # Clean up on error
-            try:
-                # Clean up temp directory with audio chunks
-                if 'temp_dir' in locals() and temp_dir and os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir)
-                    print(f"[GCS Stream] Cleaned up temp directory on error: {temp_dir}")
-
-                # Clean up downloaded video if it exists
-                if 'temp_path' in locals() and temp_path and os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                    print(f"[GCS Stream] Cleaned up temp video on error: {temp_path}")
-            except Exception as cleanup_error:
-                print(f"Error during cleanup: {cleanup_error}")
-
-            yield f"data: {json.dumps({'stage': 'error', 'progress': 0, 'error': str(e)})}\n\n"
+            yield _sse({'stage': 'error', 'progress': 0, 'error': str(e)})
+
+        finally:
+            # Runs on success, error and client disconnect. Diarization may still be
+            # reading full_audio.wav, so let it finish before removing temp_dir
+            await _settle_speaker_labels(speaker_labels)
+            # Clean up the audio chunk directory and any downloaded video off the event loop
+            await asyncio.to_thread(_remove_temp_paths, temp_dir, temp_path)
+            if temp_dir:
+                print(f"[GCS Stream] Cleaned up temp files: {temp_dir}")
 
     return StreamingResponse(generate_progress(), media_type="text/event-stream")
 
@@ -1,6 +1,7 @@
 """
 Video and utility endpoints
 """
+import asyncio
 import os
 import glob
 from typing import Dict, Optional
@@ -153,7 +154,7 @@ async def get_video_file(request: Request, video_hash: str):
             else:
                 # Convert on the fly if needed
                 print(f"Converting MKV to MP4 on-the-fly for: {video_hash}")
-                VideoService.convert_mkv_to_mp4(file_path, mp4_path)
+                await asyncio.to_thread(VideoService.convert_mkv_to_mp4, file_path, mp4_path)
                 if os.path.exists(mp4_path):
                     file_path = mp4_path
 
@@ -224,7 +225,7 @@ async def get_subtitles(
 ):
     """Generate SRT format subtitles from a transcription"""
     # Import here to avoid circular import
-    from routers.transcription import get_transcription_from_any_source
+    from services.transcription_cache import get_transcription_from_any_source
     from dependencies import _last_transcription_data
 
     transcription_data = None
@@ -308,10 +309,13 @@ async def update_video_file_path(request: Request, video_hash: str, file: Upload
         os.makedirs(permanent_storage_dir, exist_ok=True)
         permanent_file_path = os.path.join(permanent_storage_dir, f"{video_hash}{file_extension}")
 
-        # Save file in chunks
-        with open(permanent_file_path, "wb") as buffer:
-            while chunk := await file.read(1024 * 1024):  # 1MB chunks
-                buffer.write(chunk)
+        # Save file in chunks; writes run on a worker thread so large videos don't stall the event loop
+        buffer = await asyncio.to_thread(open, permanent_file_path, "wb")
+        try:
+            while chunk := await file.read(1024 * 1024 * 8):  # 8MB chunks
+                await asyncio.to_thread(buffer.write, chunk)
+        finally:
+            await asyncio.to_thread(buffer.close)
 
         # Update the transcription in the database with the new file path
         success = update_file_path(video_hash, permanent_file_path)
@@ -400,6 +404,15 @@ async def delete_transcription_endpoint(request: Request, video_hash: str) -> De
             # Don't fail the deletion if vector store cleanup fails
             print(f"Warning: Failed to delete vector store collections: {str(e)}")
 
+        # Delete cached speaker embeddings for this video
+        try:
+            from utils import embedding_cache
+            removed = embedding_cache.delete_video(video_hash)
+            if removed:
+                print(f"Deleted {removed} cached speaker embedding files for video hash: {video_hash}")
+        except Exception as e:
+            print(f"Warning: Failed to delete cached speaker embeddings: {str(e)}")
+
         # Delete from database
         success = delete_transcription(video_hash)
 
@@ -6,7 +6,9 @@ import subprocess
 import shutil
 import math
 import tempfile
-from typing import List
+import wave
+from typing import List, Optional
+import numpy as np
 from moviepy.editor import VideoFileClip
 import ffmpeg
 
@@ -298,6 +300,54 @@ class AudioService:
         except subprocess.CalledProcessError as e:
             raise Exception(f"Error compressing audio: {e.stderr.decode()}")
 
+    @staticmethod
+    def decode_to_pcm16(input_path: str, sample_rate: int = 16000) -> bytes:
+        """Decode an audio/video file to mono 16-bit PCM in memory via an ffmpeg pipe.
+
+        Raises:
+            subprocess.CalledProcessError: If ffmpeg fails (stderr is captured as bytes)
+        """
+        command = [
+            'ffmpeg', '-nostdin',
+            '-i', input_path,
+            '-vn', '-ac', '1', '-ar', str(sample_rate),
+            '-f', 's16le', '-'
+        ]
+        result = subprocess.run(command, check=True, capture_output=True)
+        return result.stdout
+
+    @staticmethod
+    def pcm16_to_float32(pcm: bytes) -> np.ndarray:
+        """Convert 16-bit PCM bytes to the float32 [-1, 1] waveform faster-whisper accepts"""
+        return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+    @staticmethod
+    def write_pcm16_wav(pcm: bytes, output_path: str, sample_rate: int = 16000) -> None:
+        """Write mono 16-bit PCM bytes to a WAV file"""
+        with wave.open(output_path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(pcm)
+
+    @staticmethod
+    def read_wav_samples(wav_path: str) -> Optional[np.ndarray]:
+        """Read a mono 16-bit 16kHz WAV (as extract_audio_streaming writes) into the
+        float32 waveform faster-whisper accepts; None if the WAV has another layout."""
+        with wave.open(wav_path, 'rb') as wav_file:
+            if (wav_file.getnchannels(), wav_file.getsampwidth(), wav_file.getframerate()) != (1, 2, 16000):
+                return None
+            return AudioService.pcm16_to_float32(wav_file.readframes(wav_file.getnframes()))
+
+    @staticmethod
+    def get_wav_duration(wav_path: str) -> float:
+        """Get a WAV file's duration from its header, without spawning ffprobe."""
+        try:
+            with wave.open(wav_path, 'rb') as wav_file:
+                return wav_file.getnframes() / float(wav_file.getframerate())
+        except (wave.Error, EOFError, OSError):
+            return AudioService.get_audio_duration(wav_path)
+
     @staticmethod
     def get_audio_duration(file_path: str) -> float:
         """Get the duration of an audio/video file using ffmpeg."""
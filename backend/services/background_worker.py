@@ -50,7 +50,7 @@ from utils.file_utils import generate_file_hash
 from utils.time_utils import format_timestamp
 from utils.memory_utils import clear_gpu_memory, log_gpu_memory, log_all_memory
 from dependencies import get_whisper_model, get_speaker_diarizer, unload_whisper_model
-from routers.transcription import create_silent_segments_for_gaps, extract_silent_segment_screenshots
+from routers.transcription import ENGLISH_LANGUAGE_CODES, create_silent_segments_for_gaps, extract_silent_segment_screenshots
 from speaker_diarization import ChunkedSpeakerDiarizer
 from services.audio_analysis_service import AudioAnalysisService
 from services.pipeline_cache_service import PipelineCacheService
@@ -474,9 +474,10 @@ class BackgroundWorker:
                 # Format segments
                 import uuid
                 formatted_segments = []
-                for seg in all_segments:
+                id_prefix = uuid.uuid4().hex[:12]  # One random prefix per transcription + segment index
+                for i, seg in enumerate(all_segments):
                     formatted_segments.append({
-                        "id": str(uuid.uuid4()),
+                        "id": f"{id_prefix}-{i}",
                         "start": seg.start,
                         "end": seg.end,
                         "start_time": format_timestamp(seg.start),
@@ -667,7 +668,7 @@ class BackgroundWorker:
                             timestamps=timestamps,
                             output_dir=screenshots_dir,
                             video_hash=video_hash,
-                            max_workers=4,
+                            max_workers=settings.SCREENSHOT_URL_WORKERS,
                             progress_callback=screenshot_progress
                         )
 
@@ -768,7 +769,7 @@ class BackgroundWorker:
                                 timestamps=silent_timestamps,
                                 output_dir=screenshots_dir,
                                 video_hash=video_hash,
-                                max_workers=4
+                                max_workers=settings.SCREENSHOT_URL_WORKERS
                             )
 
                             silent_screenshot_count = 0
@@ -858,7 +859,7 @@ class BackgroundWorker:
             normalized_lang = language_code_map.get(detected_language.lower(), detected_language.lower())
 
             # Translate non-English content to English
-            if normalized_lang in ['en', 'english']:
+            if normalized_lang in ENGLISH_LANGUAGE_CODES:
                 # For English, translation equals original text
                 for segment in formatted_segments:
                     segment['translation'] = segment['text']
@@ -3,21 +3,29 @@ API key encryption service using AES-256-GCM.
 
 Encryption key is stored in Supabase Vault for security.
 """
+import asyncio
 import os
+import time
 from typing import Optional
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from services.supabase_service import SupabaseService
 
 
+# How long a key read from the vault is reused before re-fetching (rotation window)
+ENCRYPTION_KEY_TTL_SECONDS = 600
+
 # Cache encryption key in memory for performance
 _encryption_key_cache: Optional[bytes] = None
+_encryption_key_cached_at: float = 0.0
+_encryption_key_lock = asyncio.Lock()
 
 
 async def get_encryption_key() -> bytes:
     """
     Get encryption key from Supabase Vault.
 
-    Caches key in memory after first retrieval for performance.
+    Always reads from the vault; request handlers should use
+    get_encryption_key_cached() instead.
 
     Returns:
         32-byte encryption key for AES-256-GCM
@@ -25,11 +33,6 @@ async def get_encryption_key() -> bytes:
     Raises:
         Exception: If key not found in vault or invalid format
     """
-    global _encryption_key_cache
-
-    if _encryption_key_cache is not None:
-        return _encryption_key_cache
-
     try:
         client = SupabaseService.get_client()
 
@@ -46,9 +49,6 @@ async def get_encryption_key() -> bytes:
         if len(key_bytes) != 32:
             raise Exception(f"Invalid encryption key length: {len(key_bytes)} bytes (expected 32)")
 
-        # Cache for future use
-        _encryption_key_cache = key_bytes
-
         print("[Encryption] Loaded encryption key from Supabase Vault")
 
         return key_bytes
@@ -58,6 +58,34 @@ async def get_encryption_key() -> bytes:
         raise Exception(f"Failed to get encryption key from vault: {str(e)}")
 
 
+async def get_encryption_key_cached() -> bytes:
+    """
+    Get encryption key, reusing the in-memory copy for ENCRYPTION_KEY_TTL_SECONDS.
+
+    Concurrent callers on a cold/expired cache share a single vault read.
+
+    Returns:
+        32-byte encryption key for AES-256-GCM
+
+    Raises:
+        Exception: If key not found in vault or invalid format
+    """
+    global _encryption_key_cache, _encryption_key_cached_at
+
+    if _encryption_key_cache is not None and time.monotonic() - _encryption_key_cached_at < ENCRYPTION_KEY_TTL_SECONDS:
+        return _encryption_key_cache
+
+    async with _encryption_key_lock:
+        # Another request may have refreshed the key while we waited
+        if _encryption_key_cache is not None and time.monotonic() - _encryption_key_cached_at < ENCRYPTION_KEY_TTL_SECONDS:
+            return _encryption_key_cache
+
+        _encryption_key_cache = await get_encryption_key()
+        _encryption_key_cached_at = time.monotonic()
+
+        return _encryption_key_cache
+
+
 def encrypt_api_key(key: str, encryption_key: bytes) -> str:
     """
     Encrypt API key with AES-256-GCM.
@@ -150,6 +178,7 @@ def clear_encryption_key_cache() -> None:
 
     Useful for key rotation - forces reload from vault on next use.
     """
-    global _encryption_key_cache
+    global _encryption_key_cache, _encryption_key_cached_at
     _encryption_key_cache = None
+    _encryption_key_cached_at = 0.0
     print("[Encryption] Cleared encryption key cache")
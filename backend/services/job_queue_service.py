@@ -5,6 +5,7 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
+from database import notify_transcription_changed
 from services.supabase_service import supabase
 
 
@@ -445,6 +446,7 @@ class JobQueueService:
             success = response.data and len(response.data) > 0
             if success:
                 print(f"[JobQueue] Marked job {job_id} as completed")
+                notify_transcription_changed(video_hash)
             return success
         except Exception as e:
             print(f"[JobQueue] Failed to mark job {job_id} as completed: {e}")
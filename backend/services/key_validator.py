@@ -5,11 +5,13 @@ Tests API keys against provider endpoints and updates validation status in datab
 """
 import asyncio
 import os
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import httpx
+from postgrest.types import ReturnMethod
 from services.supabase_service import SupabaseService
-from services.encryption import get_encryption_key, decrypt_api_key
+from services.encryption import get_encryption_key_cached, decrypt_api_key
 
 
 # After this many seconds a key still pending validation is considered stuck.
@@ -18,6 +20,45 @@ from services.encryption import get_encryption_key, decrypt_api_key
 # polls /api/keys every 2s while any key is null, so a stuck key = perpetual traffic.
 PENDING_KEY_STALE_SECONDS = 600  # 10 minutes
 
+# Pending keys older than this are assumed to have lost their in-process
+# BackgroundTasks validation and are re-driven from the check-stale job.
+PENDING_KEY_RETRY_AFTER_SECONDS = 60
+
+
+# Per-user cache of list_keys rows: {user_id: (cached_at, rows)}
+# Invalidated on every write to user_api_keys (add/delete/validate/sweep/admin).
+KEYS_CACHE_TTL_SECONDS = 60
+_keys_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+
+
+def get_cached_keys(user_id: str) -> Optional[List[Dict]]:
+    """Return cached user_api_keys rows for a user, or None if missing/expired."""
+    cached = _keys_cache.get(user_id)
+    if cached and time.monotonic() - cached[0] < KEYS_CACHE_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+def cache_keys(user_id: str, rows: List[Dict]) -> None:
+    """
+    Cache user_api_keys rows for a user.
+
+    Rows with a pending validation (is_valid NULL) are not cached: the frontend
+    polls until they resolve, and validation may finish on another instance.
+    """
+    if any(row.get("is_valid") is None for row in rows):
+        _keys_cache.pop(user_id, None)
+        return
+    _keys_cache[user_id] = (time.monotonic(), rows)
+
+
+def invalidate_keys_cache(user_id: Optional[str] = None) -> None:
+    """Drop cached keys for one user, or for everyone when user_id is None."""
+    if user_id is None:
+        _keys_cache.clear()
+    else:
+        _keys_cache.pop(user_id, None)
+
 
 def sweep_stuck_pending_keys() -> int:
     """Mark keys stuck in 'pending' validation (is_valid IS NULL) as invalid.
@@ -28,15 +69,17 @@ def sweep_stuck_pending_keys() -> int:
     """
     try:
         client = SupabaseService.get_client()
-        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=PENDING_KEY_STALE_SECONDS)).isoformat()
+        now = datetime.now(timezone.utc)
+        cutoff = (now - timedelta(seconds=PENDING_KEY_STALE_SECONDS)).isoformat()
+        now_iso = now.isoformat(timespec="seconds")
 
         response = (
             client.table("user_api_keys")
             .update({
                 "is_valid": False,
                 "validation_error": "Validation did not complete (timed out)",
-                "validated_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat(),
+                "validated_at": now_iso,
+                "updated_at": now_iso,
             })
             .is_("is_valid", "null")
             .lt("created_at", cutoff)
@@ -45,6 +88,7 @@ def sweep_stuck_pending_keys() -> int:
 
         count = len(response.data) if response.data else 0
         if count:
+            invalidate_keys_cache()
             print(f"[KeyValidator] Swept {count} stuck pending key(s) to is_valid=false")
         return count
 
@@ -53,6 +97,41 @@ def sweep_stuck_pending_keys() -> int:
         return 0
 
 
+async def revalidate_pending_keys(limit: int = 20) -> int:
+    """Re-run validation for keys whose background validation never completed.
+
+    user_api_keys rows with is_valid IS NULL act as the durable validation queue:
+    the add_key BackgroundTask is only the fast path and is lost if the instance
+    is reclaimed. Intended to be called from the check-stale Cloud Scheduler job
+    before sweep_stuck_pending_keys(). Returns the number of keys re-validated.
+    """
+    try:
+        client = SupabaseService.get_client()
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=PENDING_KEY_RETRY_AFTER_SECONDS)).isoformat()
+
+        response = (
+            client.table("user_api_keys")
+            .select("user_id, provider, encrypted_key")
+            .is_("is_valid", "null")
+            .lt("updated_at", cutoff)
+            .limit(limit)
+            .execute()
+        )
+        rows = response.data or []
+
+        if rows:
+            print(f"[KeyValidator] Re-driving validation for {len(rows)} pending key(s)")
+            await asyncio.gather(*(
+                validate_api_key_async(row["user_id"], row["provider"], row["encrypted_key"])
+                for row in rows
+            ))
+        return len(rows)
+
+    except Exception as e:
+        print(f"[KeyValidator] Failed to re-drive pending key validations: {e}")
+        return 0
+
+
 async def validate_api_key_async(user_id: str, provider: str, encrypted_key: str) -> None:
     """
     Validate API key in background and update database.
@@ -67,7 +146,7 @@ async def validate_api_key_async(user_id: str, provider: str, encrypted_key: str
     """
     try:
         # Decrypt the key
-        encryption_key = await get_encryption_key()
+        encryption_key = await get_encryption_key_cached()
         api_key = decrypt_api_key(encrypted_key, encryption_key)
 
         # Test the key
@@ -76,16 +155,18 @@ async def validate_api_key_async(user_id: str, provider: str, encrypted_key: str
         # Update database
         client = SupabaseService.get_client()
 
+        now_iso = datetime.now(timezone.utc).isoformat(timespec="seconds")
         update_data = {
             "is_valid": is_valid,
             "validation_error": error,
-            "validated_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
+            "validated_at": now_iso,
+            "updated_at": now_iso
         }
 
-        client.table("user_api_keys").update(update_data).eq(
+        client.table("user_api_keys").update(update_data, returning=ReturnMethod.minimal).eq(
             "user_id", user_id
         ).eq("provider", provider).execute()
+        invalidate_keys_cache(user_id)
 
         if is_valid:
             print(f"[KeyValidator] Key validated successfully for user {user_id}, provider {provider}")
@@ -98,13 +179,15 @@ async def validate_api_key_async(user_id: str, provider: str, encrypted_key: str
         # Update with error
         try:
             client = SupabaseService.get_client()
+            now_iso = datetime.now(timezone.utc).isoformat(timespec="seconds")
 
             client.table("user_api_keys").update({
                 "is_valid": False,
                 "validation_error": f"Validation error: {str(e)}",
-                "validated_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("user_id", user_id).eq("provider", provider).execute()
+                "validated_at": now_iso,
+                "updated_at": now_iso
+            }, returning=ReturnMethod.minimal).eq("user_id", user_id).eq("provider", provider).execute()
+            invalidate_keys_cache(user_id)
 
         except Exception as db_error:
             print(f"[KeyValidator] Failed to update error in database: {db_error}")
@@ -2,9 +2,18 @@
 Text summarization service using BART model
 """
 import os
-from typing import Optional, Tuple
+import threading
+from typing import List, Optional, Tuple
+import torch
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 
+# CTranslate2 ships with faster-whisper; used for int8 BART inference when available
+try:
+    import ctranslate2
+    CTRANSLATE2_AVAILABLE = True
+except ImportError:
+    CTRANSLATE2_AVAILABLE = False
+
 
 class SummarizationService:
     """Service for text summarization using BART"""
@@ -16,6 +25,19 @@ class SummarizationService:
     _model_load_attempted: bool = False
     _model_load_error: Optional[str] = None
 
+    # int8 CTranslate2 translator for the same checkpoint (None = unavailable, use PyTorch)
+    _ct2_translator: Optional["ctranslate2.Translator"] = None
+    _ct2_load_attempted: bool = False
+
+    # Serializes lazy loading/conversion; reentrant because _ensure_model() calls get_ct2_translator()
+    _load_lock = threading.RLock()
+
+    # Set by _ensure_model(): _model stays None when the int8 translator replaces it
+    _ready: bool = False
+    # Checkpoint generation default (3 for bart-large-cnn): HF generate() applies it
+    # implicitly, CTranslate2 must be passed it explicitly
+    _no_repeat_ngram_size: int = 0
+
     @classmethod
     def get_summarization_model(cls) -> Tuple[Optional[AutoTokenizer], Optional[AutoModelForSeq2SeqLM]]:
         """Get or initialize the summarization model"""
@@ -62,33 +84,131 @@ class SummarizationService:
 
             return None, None
 
+    @classmethod
+    def get_ct2_translator(cls) -> Optional["ctranslate2.Translator"]:
+        """Get an int8 CTranslate2 translator for the summarization model.
+
+        The checkpoint is converted once into HF_HOME/ctranslate2 and reused across
+        restarts. Only used on CPU; with a GPU the PyTorch model runs in float16.
+
+        Returns:
+            Translator, or None if CTranslate2 is unavailable or conversion failed
+        """
+        if cls._ct2_load_attempted:
+            return cls._ct2_translator
+
+        with cls._load_lock:
+            if cls._ct2_load_attempted:
+                return cls._ct2_translator
+
+            if not CTRANSLATE2_AVAILABLE or torch.cuda.is_available():
+                cls._ct2_load_attempted = True
+                return None
+
+            cache_dir = os.environ.get('HF_HOME', '/app/.cache/huggingface')
+            output_dir = os.path.join(cache_dir, "ctranslate2", f"{cls._model_name.split('/')[-1]}-int8")
+
+            try:
+                if not os.path.exists(os.path.join(output_dir, "model.bin")):
+                    print(f"Converting {cls._model_name} to CTranslate2 (int8)")
+                    converter = ctranslate2.converters.TransformersConverter(cls._model_name)
+                    converter.convert(output_dir, quantization="int8", force=True)
+
+                cls._ct2_translator = ctranslate2.Translator(
+                    output_dir, device="cpu", compute_type="int8", intra_threads=os.cpu_count() or 1
+                )
+                print(f"CTranslate2 summarizer loaded: {output_dir}")
+            except Exception as e:
+                print(f"WARNING: CTranslate2 unavailable for {cls._model_name}, using PyTorch: {e}")
+                cls._ct2_translator = None
+
+            # Set last so lock-free readers above never see a half-initialized translator
+            cls._ct2_load_attempted = True
+            return cls._ct2_translator
+
+    @classmethod
+    def _ensure_model(cls) -> bool:
+        """Load the model (or its int8 translator) into the class cache if needed; False if unavailable"""
+        if not cls._ready:
+            with cls._load_lock:
+                if not cls._ready:
+                    tokenizer, model = cls.get_summarization_model()
+                    if tokenizer is None or model is None:
+                        return False
+
+                    generation_config = getattr(model, "generation_config", None) or model.config
+                    cls._no_repeat_ngram_size = getattr(generation_config, "no_repeat_ngram_size", 0) or 0
+
+                    if cls.get_ct2_translator() is not None:
+                        # The int8 translator serves every CPU summary; don't keep the
+                        # fp32 PyTorch model resident next to it
+                        model = None
+                    else:
+                        # Half precision on the GPU
+                        if torch.cuda.is_available():
+                            model = model.half().to("cuda")
+                        model.eval()
+
+                    # Publish only the fully prepared state to lock-free readers
+                    cls._tokenizer, cls._model = tokenizer, model
+                    cls._ready = True
+        return cls._ready
+
     @classmethod
     def generate_local_summary(cls, text: str, max_length: int = 150, min_length: int = 50) -> str:
         """Generate a summary using the local model"""
+        return cls.generate_local_summary_batch([text], max_length=max_length, min_length=min_length)[0]
+
+    @classmethod
+    def generate_local_summary_batch(cls, texts: List[str], max_length: int = 150,
+                                     min_length: int = 50) -> List[str]:
+        """Generate summaries for several texts in one padded generate() call"""
+        if not texts:
+            return []
 
-        # Initialize the model if not already done
-        if cls._tokenizer is None or cls._model is None:
-            cls._tokenizer, cls._model = cls.get_summarization_model()
-            if cls._tokenizer is None or cls._model is None:
-                return "Summary generation failed: Model could not be loaded."
+        if not cls._ensure_model():
+            return ["Summary generation failed: Model could not be loaded."] * len(texts)
 
         try:
-            # Tokenize the input text
-            inputs = cls._tokenizer(text, return_tensors="pt", max_length=1024, truncation=True)
-
-            # Generate summary
-            summary_ids = cls._model.generate(
-                inputs["input_ids"],
-                max_length=max_length,
-                min_length=min_length,
-                length_penalty=2.0,
-                num_beams=4,
-                early_stopping=True
-            )
-
-            # Decode the summary
-            summary = cls._tokenizer.decode(summary_ids[0], skip_special_tokens=True)
-            return summary
+            translator = cls._ct2_translator
+            if translator is not None:
+                source_tokens = [
+                    cls._tokenizer.convert_ids_to_tokens(
+                        cls._tokenizer.encode(text, max_length=1024, truncation=True)
+                    )
+                    for text in texts
+                ]
+                results = translator.translate_batch(
+                    source_tokens,
+                    beam_size=4,
+                    length_penalty=2.0,
+                    no_repeat_ngram_size=cls._no_repeat_ngram_size,
+                    max_decoding_length=max_length,
+                    min_decoding_length=min_length,
+                )
+                return [
+                    cls._tokenizer.decode(
+                        cls._tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True
+                    )
+                    for result in results
+                ]
+
+            inputs = cls._tokenizer(
+                texts, return_tensors="pt", max_length=1024, truncation=True, padding=True
+            ).to(cls._model.device)
+
+            with torch.inference_mode():
+                summary_ids = cls._model.generate(
+                    inputs["input_ids"],
+                    attention_mask=inputs["attention_mask"],
+                    max_length=max_length,
+                    min_length=min_length,
+                    length_penalty=2.0,
+                    num_beams=4,
+                    early_stopping=True
+                )
+
+            return cls._tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
         except Exception as e:
-            print(f"Error generating summary: {str(e)}")
-            return f"Summary generation failed: {str(e)}"
+            print(f"Error generating batch summary: {str(e)}")
+            return [f"Summary generation failed: {str(e)}"] * len(texts)
@@ -0,0 +1,178 @@
+"""
+In-process caches of stored transcriptions: the lookups behind
+get_transcription_from_any_source() and the prepared payloads served by
+/transcription/{video_hash}
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import orjson
+
+from database import get_transcription, store_transcription, register_change_listener
+from services.translation_service import TranslationService
+from utils.transcript_utils import ENGLISH_LANGUAGE_CODES
+
+logger = logging.getLogger(__name__)
+
+# LRU of prepared /transcription/{video_hash} payloads: video_hash -> (etag, transcription).
+# Entries are dropped whenever the stored transcription changes; each drop also bumps
+# the hash's version so a load that was already running doesn't re-insert stale data.
+TRANSCRIPTION_CACHE_SIZE = 128
+_transcription_cache: "OrderedDict[str, Tuple[str, Dict]]" = OrderedDict()
+_transcription_cache_versions: Dict[str, int] = {}
+_transcription_cache_lock = threading.Lock()
+
+
+# LRU of get_transcription_from_any_source() hits: video_hash -> (expires_at, orjson bytes).
+# Entries are stored encoded so every caller decodes its own copy and may mutate it
+# freely. The TTL bounds staleness from Supabase writes made by other instances.
+TRANSCRIPTION_SOURCE_CACHE_SIZE = 32
+TRANSCRIPTION_SOURCE_CACHE_TTL = 600  # seconds
+_transcription_source_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+_transcription_source_cache_lock = threading.Lock()
+
+
+def _invalidate_transcription_cache(video_hash: str) -> None:
+    with _transcription_cache_lock:
+        _transcription_cache.pop(video_hash, None)
+        _transcription_cache_versions[video_hash] = _transcription_cache_versions.get(video_hash, 0) + 1
+    with _transcription_source_cache_lock:
+        _transcription_source_cache.pop(video_hash, None)
+
+
+register_change_listener(_invalidate_transcription_cache)
+
+
+def get_transcription_from_any_source(video_hash: str, use_cache: bool = True) -> Optional[Dict]:
+    """
+    Get transcription from any available source:
+    1. First check legacy database (SQLite/Firestore)
+    2. If not found, check Supabase jobs table
+
+    Args:
+        video_hash: The video hash to look up
+        use_cache: Serve from the in-process cache when possible. Pass False on
+            read-modify-write paths so they never start from a copy made stale
+            by another instance's write.
+
+    Returns:
+        Transcription data dict or None if not found
+    """
+    if not use_cache:
+        return _load_transcription_from_any_source(video_hash)
+
+    with _transcription_source_cache_lock:
+        cached = _transcription_source_cache.get(video_hash)
+        if cached is not None and cached[0] > time.monotonic():
+            _transcription_source_cache.move_to_end(video_hash)
+            return orjson.loads(cached[1])
+
+    transcription = _load_transcription_from_any_source(video_hash)
+    if transcription:
+        encoded = orjson.dumps(transcription, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        with _transcription_source_cache_lock:
+            _transcription_source_cache[video_hash] = (time.monotonic() + TRANSCRIPTION_SOURCE_CACHE_TTL, encoded)
+            _transcription_source_cache.move_to_end(video_hash)
+            while len(_transcription_source_cache) > TRANSCRIPTION_SOURCE_CACHE_SIZE:
+                _transcription_source_cache.popitem(last=False)
+    return transcription
+
+
+def _load_transcription_from_any_source(video_hash: str) -> Optional[Dict]:
+    """Uncached lookup behind get_transcription_from_any_source()."""
+    # Try legacy database first
+    transcription = get_transcription(video_hash)
+    if transcription:
+        return transcription
+
+    # Try Supabase jobs table
+    try:
+        from services.supabase_service import supabase
+        client = supabase()
+
+        # Look for completed job with this video_hash
+        response = (
+            client.table("jobs")
+            .select("result_json, filename, gcs_path")
+            .eq("video_hash", video_hash)
+            .eq("status", "completed")
+            .limit(1)
+            .execute()
+        )
+
+        if response.data and len(response.data) > 0:
+            job = response.data[0]
+            result_json = job.get("result_json")
+
+            if result_json:
+                logger.info("[Summary] Found transcription in Supabase job for video_hash=%s", video_hash)
+                return result_json
+
+    except Exception as e:
+        logger.warning("[Summary] Error checking Supabase for transcription: %s", e)
+
+    return None
+
+
+def get_cached_transcription(video_hash: str) -> Optional[Tuple[str, Dict]]:
+    """Return the cached (etag, transcription) for video_hash, or None on a miss"""
+    with _transcription_cache_lock:
+        cached = _transcription_cache.get(video_hash)
+        if cached:
+            _transcription_cache.move_to_end(video_hash)
+    return cached
+
+
+def _prepare_transcription(video_hash: str) -> Optional[Tuple[str, Dict]]:
+    """Load a transcription, backfill missing translations and compute its ETag (blocking)"""
+    transcription = get_transcription(video_hash)
+    if not transcription:
+        return None
+
+    # Ensure all translations are present. Backfilled translations are saved,
+    # so later loads find nothing missing and skip straight past this block.
+    try:
+        tr = transcription.get('transcription', {})
+        lang = tr.get('language', '').lower()
+        segments = tr.get('segments', [])
+        missing = [s for s in segments if not s.get('translation')]
+        if missing:
+            if lang and lang not in ENGLISH_LANGUAGE_CODES:
+                logger.info("[Transcription] Translating %d missing segments for video_hash=%s", len(missing), video_hash)
+                translated_segments = TranslationService.translate_segments(missing, lang)
+                for seg, translated in zip(missing, translated_segments):
+                    seg['translation'] = translated.get('translation') or seg.get('text', '')
+            else:
+                # English source: translation mirrors the text for consistency
+                for seg in missing:
+                    seg['translation'] = seg.get('text', '')
+            store_transcription(video_hash, transcription.get('filename', ''), transcription, transcription.get('file_path'))
+            logger.info("[Transcription] Translations backfilled and saved for video_hash=%s", video_hash)
+    except Exception:
+        logger.exception("[Transcription] Error ensuring translations for video_hash=%s", video_hash)
+
+    etag = hashlib.blake2b(
+        orjson.dumps(transcription, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+        digest_size=16
+    ).hexdigest()
+    return etag, transcription
+
+
+def prepare_and_cache_transcription(video_hash: str) -> Optional[Tuple[str, Dict]]:
+    """_prepare_transcription(), caching the result unless the hash was invalidated meanwhile (blocking)"""
+    with _transcription_cache_lock:
+        version = _transcription_cache_versions.get(video_hash, 0)
+
+    prepared = _prepare_transcription(video_hash)
+    if prepared:
+        with _transcription_cache_lock:
+            if _transcription_cache_versions.get(video_hash, 0) == version:
+                _transcription_cache[video_hash] = prepared
+                _transcription_cache.move_to_end(video_hash)
+                while len(_transcription_cache) > TRANSCRIPTION_CACHE_SIZE:
+                    _transcription_cache.popitem(last=False)
+    return prepared
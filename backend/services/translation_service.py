@@ -1,19 +1,64 @@
 """
 Translation service using MarianMT models with optimized batch processing
 """
-from typing import List, Dict, Tuple, Optional, Callable
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional, Callable
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
-from transformers import MarianMTModel, MarianTokenizer
+
+from config import settings
+
+# torch/transformers are imported where a model is loaded or run, so the text
+# dedupe and cache logic stays importable (and testable) without them
+if TYPE_CHECKING:
+    import torch
+    from transformers import MarianMTModel, MarianTokenizer
+
+# CTranslate2 ships with faster-whisper; used for int8 MarianMT inference when available
+try:
+    import ctranslate2
+    CTRANSLATE2_AVAILABLE = True
+except ImportError:
+    CTRANSLATE2_AVAILABLE = False
+
+
+def _cuda_available() -> bool:
+    import torch
+    return torch.cuda.is_available()
+
+
+def _generate(model: "MarianMTModel", **kwargs) -> "torch.Tensor":
+    """Run model.generate() without autograd bookkeeping.
+
+    inference_mode is thread-local, so it is entered here rather than around
+    the executor.submit() calls that hand generation to a worker thread.
+    """
+    import torch
+    with torch.inference_mode():
+        return model.generate(**kwargs)
 
 
 class TranslationService:
     """Service for translating text using MarianMT models"""
 
-    # Cache for loaded MarianMT models
-    _marian_models: Dict[str, Tuple[MarianTokenizer, MarianMTModel]] = {}
+    # LRU of loaded MarianMT models (most recently used last), bounded by MARIAN_MODEL_CACHE_SIZE
+    _marian_models: "OrderedDict[str, Tuple[MarianTokenizer, MarianMTModel]]" = OrderedDict()
+    _marian_models_lock = threading.Lock()
+
+    # Cache for int8 CTranslate2 translators (None = conversion failed, use MarianMT).
+    # Each model has its own lock so two first callers never convert into the same directory.
+    _ct2_translators: Dict[str, Optional["ctranslate2.Translator"]] = {}
+    _ct2_locks: Dict[str, threading.Lock] = {}
+    _ct2_locks_lock = threading.Lock()
+
+    # LRU cache of segment translations keyed by (source_lang, text)
+    _translation_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+    _translation_cache_lock = threading.Lock()
 
     @classmethod
-    def get_marian_model(cls, source_lang: str) -> Tuple[MarianTokenizer, MarianMTModel]:
+    def get_marian_model(cls, source_lang: str) -> Tuple["MarianTokenizer", "MarianMTModel"]:
         """Load MarianMT translation model for source_lang -> English.
 
         Args:
@@ -28,18 +73,30 @@ class TranslationService:
         model_name = f"Helsinki-NLP/opus-mt-{source_lang}-en"
 
         # Check if already loaded
-        if model_name in cls._marian_models:
-            print(f"[INFO] Using cached translation model: {model_name}")
-            return cls._marian_models[model_name]
+        with cls._marian_models_lock:
+            cached = cls._marian_models.get(model_name)
+            if cached is not None:
+                cls._marian_models.move_to_end(model_name)
+                print(f"[INFO] Using cached translation model: {model_name}")
+                return cached
 
         # Try to load model with proper error handling
         try:
             print(f"[INFO] Loading translation model: {model_name}")
+            from transformers import MarianMTModel, MarianTokenizer
             tokenizer = MarianTokenizer.from_pretrained(model_name)
-            model = MarianMTModel.from_pretrained(model_name)
-            cls._marian_models[model_name] = (tokenizer, model)
+            # Run on the GPU when there is one; batched generate() is matmul-bound
+            device = "cuda" if _cuda_available() else "cpu"
+            model = MarianMTModel.from_pretrained(model_name).to(device).eval()
+            with cls._marian_models_lock:
+                cls._marian_models[model_name] = (tokenizer, model)
+                cls._marian_models.move_to_end(model_name)
+                while len(cls._marian_models) > max(1, settings.MARIAN_MODEL_CACHE_SIZE):
+                    evicted, _ = cls._marian_models.popitem(last=False)
+                    cls._ct2_translators.pop(evicted, None)
+                    print(f"[INFO] Evicted translation model: {evicted}")
             print(f"[SUCCESS] Model loaded: {model_name}")
-            return cls._marian_models[model_name]
+            return tokenizer, model
 
         except Exception as e:
             # Suggest alternatives if model doesn't exist
@@ -66,6 +123,147 @@ class TranslationService:
             print(f"[ERROR] Original error: {str(e)}")
             raise Exception(error_msg)
 
+    @classmethod
+    def get_ct2_translator(cls, source_lang: str) -> Optional["ctranslate2.Translator"]:
+        """Get an int8 CTranslate2 translator for source_lang -> English.
+
+        The MarianMT checkpoint is converted once into HF_HOME/ctranslate2 and
+        reused across restarts.
+
+        Args:
+            source_lang: ISO language code (e.g., 'es', 'it', 'fr')
+
+        Returns:
+            Translator, or None if CTranslate2 is unavailable or conversion failed
+        """
+        if not CTRANSLATE2_AVAILABLE:
+            return None
+
+        model_name = f"Helsinki-NLP/opus-mt-{source_lang}-en"
+        if model_name in cls._ct2_translators:
+            return cls._ct2_translators[model_name]
+
+        with cls._ct2_locks_lock:
+            lock = cls._ct2_locks.setdefault(model_name, threading.Lock())
+        with lock:
+            # Another thread may have finished loading while we waited
+            if model_name in cls._ct2_translators:
+                return cls._ct2_translators[model_name]
+            translator = cls._load_ct2_translator(model_name, source_lang)
+            cls._ct2_translators[model_name] = translator
+            return translator
+
+    @staticmethod
+    def _load_ct2_translator(model_name: str, source_lang: str) -> Optional["ctranslate2.Translator"]:
+        """Convert (if needed) and load the int8 translator; None on failure (blocking)"""
+        cache_dir = os.environ.get('HF_HOME', '/app/.cache/huggingface')
+        output_dir = os.path.join(cache_dir, "ctranslate2", f"opus-mt-{source_lang}-en-int8")
+
+        try:
+            if not os.path.exists(os.path.join(output_dir, "model.bin")):
+                print(f"[INFO] Converting {model_name} to CTranslate2 (int8)")
+                converter = ctranslate2.converters.TransformersConverter(model_name)
+                converter.convert(output_dir, quantization="int8", force=True)
+
+            # One CTranslate2 worker using every core: the micro-batcher keeps at most one
+            # batch per language in flight, so extra workers would only sit idle while
+            # taking cores from the batch that is running
+            translator = ctranslate2.Translator(
+                output_dir,
+                device="cpu",
+                compute_type="int8",
+                inter_threads=1,
+                intra_threads=os.cpu_count() or 1,
+            )
+            print(f"[SUCCESS] CTranslate2 translator loaded: {output_dir}")
+        except Exception as e:
+            print(f"[WARNING] CTranslate2 unavailable for {model_name}, using MarianMT: {e}")
+            translator = None
+
+        return translator
+
+    @classmethod
+    def preload_languages(cls, languages: List[str]) -> List[str]:
+        """Load translation models for the given languages so first requests skip loading.
+
+        Args:
+            languages: ISO language codes (e.g., ['es', 'it'])
+
+        Returns:
+            Languages whose models loaded successfully
+        """
+        loaded = []
+        for lang in languages:
+            try:
+                cls.get_marian_model(lang)
+                cls.get_ct2_translator(lang)
+                loaded.append(lang)
+            except Exception as e:
+                print(f"[Translation] Preload failed for {lang}: {e}")
+        return loaded
+
+    @classmethod
+    def translate_texts(cls, texts: List[str], source_lang: str, max_batch_size: int = 16) -> List[str]:
+        """Translate a list of texts to English in one batched call (blocking).
+
+        Uses the int8 CTranslate2 translator when available, MarianMT otherwise.
+
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code (e.g., 'es', 'it')
+            max_batch_size: Maximum sentences per forward pass
+
+        Returns:
+            Translations in the same order as texts
+
+        Raises:
+            Exception: If no model exists for this language pair
+        """
+        tokenizer, model = cls.get_marian_model(source_lang)
+        translator = cls.get_ct2_translator(source_lang)
+
+        if translator is not None:
+            return cls._translate_ct2(translator, tokenizer, texts, max_batch_size)
+
+        inputs = tokenizer(texts, return_tensors="pt", padding=True).to(model.device)
+        translated = _generate(model, **inputs)
+        return tokenizer.batch_decode(translated, skip_special_tokens=True)
+
+    @staticmethod
+    def _translate_ct2(
+        translator: "ctranslate2.Translator",
+        tokenizer: "MarianTokenizer",
+        texts: List[str],
+        max_batch_size: int,
+    ) -> List[str]:
+        """Greedy-decode texts with an int8 CTranslate2 translator, in input order."""
+        source_tokens = [
+            tokenizer.convert_ids_to_tokens(tokenizer.encode(text, truncation=True, max_length=512))
+            for text in texts
+        ]
+        results = translator.translate_batch(
+            source_tokens, max_batch_size=max_batch_size, batch_type="examples", beam_size=1
+        )
+        return [
+            tokenizer.decode(
+                tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True
+            )
+            for result in results
+        ]
+
+    @classmethod
+    async def translate_async(cls, text: str, source_lang: str) -> str:
+        """Translate one text, micro-batched with concurrent requests for the same language.
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code (e.g., 'es', 'it')
+
+        Returns:
+            English translation
+        """
+        return await _micro_batcher.submit(text, source_lang)
+
     @classmethod
     def translate_segments(
         cls,
@@ -87,135 +285,217 @@ class TranslationService:
         BATCH_SIZE = 32  # Optimal for MarianMT on CPU
 
         total_segments = len(segments)
-        translated_count = 0
 
         print(f"[Translation] Starting batch translation of {total_segments} segments ({source_lang} -> en)")
 
         # Load model once before processing
         try:
             tokenizer, model = cls.get_marian_model(source_lang)
+            # Greedy CPU batches go through int8 CTranslate2 when it is available;
+            # with a GPU (or beam search configured) the Marian model is faster/required
+            use_ct2 = settings.TRANSLATION_NUM_BEAMS <= 1 and not _cuda_available()
+            translator = cls.get_ct2_translator(source_lang) if use_ct2 else None
         except Exception as e:
             print(f"[Translation] Failed to load model: {e}")
             for segment in segments:
                 segment['translation'] = None
             return segments
 
-        for i in range(0, total_segments, BATCH_SIZE):
-            batch = segments[i:i + BATCH_SIZE]
-            batch_num = (i // BATCH_SIZE) + 1
-            total_batches = (total_segments + BATCH_SIZE - 1) // BATCH_SIZE
-
-            # Collect texts to translate (filter empty)
-            texts_to_translate = []
-            segment_indices = []
-
-            for idx, segment in enumerate(batch):
-                text = segment.get('text', '').strip()
-                if text:
-                    texts_to_translate.append(text)
-                    segment_indices.append(idx)
-                else:
-                    segment['translation'] = '[No speech detected]'
-
-            if not texts_to_translate:
-                translated_count += len(batch)
-                if progress_callback:
-                    progress_callback(translated_count, total_segments)
+        # Group segments by text so repeated phrases ("Yeah.", "[Music]") are translated
+        # once, and serve texts seen in earlier videos from the LRU cache
+        pending: Dict[str, List[Dict]] = {}
+        for segment in segments:
+            text = segment.get('text', '').strip()
+            if not text:
+                segment['translation'] = '[No speech detected]'
                 continue
+            cached = cls._get_cached_translation(source_lang, text)
+            if cached is not None:
+                segment['translation'] = cached
+            else:
+                pending.setdefault(text, []).append(segment)
 
-            try:
-                # TRUE BATCH PROCESSING: tokenize and generate all at once
-                inputs = tokenizer(
-                    texts_to_translate,
-                    return_tensors="pt",
-                    padding=True,
-                    truncation=True,
-                    max_length=512
-                )
-
-                print(f"[Translation] Batch {batch_num}/{total_batches}: generating translations for {len(texts_to_translate)} segments...")
-
-                # Run model.generate() with a 60s timeout to prevent hanging
-                BATCH_TIMEOUT = 60
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(
-                        model.generate,
-                        **inputs,
-                        max_length=512,
-                        num_beams=2,
-                        early_stopping=True
-                    )
-                    translated_ids = future.result(timeout=BATCH_TIMEOUT)
-
-                # Decode all translations
-                translations = tokenizer.batch_decode(translated_ids, skip_special_tokens=True)
-
-                # Assign translations back to segments
-                for idx, translation in zip(segment_indices, translations):
-                    batch[idx]['translation'] = translation.strip()
+        translated_count = total_segments - sum(len(group) for group in pending.values())
+        if progress_callback and translated_count:
+            progress_callback(translated_count, total_segments)
 
-                translated_count += len(batch)
+        # Batch unique texts in order of length so each batch pads to similar lengths
+        unique_texts = sorted(pending, key=len)
+        total_batches = (len(unique_texts) + BATCH_SIZE - 1) // BATCH_SIZE
+        print(f"[Translation] {len(unique_texts)} unique texts to translate ({translated_count} segments cached or empty)")
 
-                # Log progress every batch
-                print(f"[Translation] Batch {batch_num}/{total_batches}: translated {len(texts_to_translate)} segments ({translated_count}/{total_segments} total)")
+        for i in range(0, len(unique_texts), BATCH_SIZE):
+            texts_to_translate = unique_texts[i:i + BATCH_SIZE]
+            batch_num = (i // BATCH_SIZE) + 1
 
-                # Call progress callback
-                if progress_callback:
-                    progress_callback(translated_count, total_segments)
+            BATCH_TIMEOUT = 60
+            try:
+                if translator is not None:
+                    print(f"[Translation] Batch {batch_num}/{total_batches}: translating {len(texts_to_translate)} segments with CTranslate2...")
+                    decoded = cls._translate_ct2(translator, tokenizer, texts_to_translate, BATCH_SIZE)
+                else:
+                    # TRUE BATCH PROCESSING: tokenize and generate all at once
+                    inputs = tokenizer(
+                        texts_to_translate,
+                        return_tensors="pt",
+                        padding=True,
+                        truncation=True,
+                        max_length=512
+                    ).to(model.device)
+
+                    print(f"[Translation] Batch {batch_num}/{total_batches}: generating translations for {len(texts_to_translate)} segments...")
+
+                    # Run model.generate() with a 60s timeout to prevent hanging
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        future = executor.submit(
+                            _generate,
+                            model,
+                            **inputs,
+                            max_length=512,
+                            num_beams=settings.TRANSLATION_NUM_BEAMS,
+                            early_stopping=settings.TRANSLATION_NUM_BEAMS > 1
+                        )
+                        translated_ids = future.result(timeout=BATCH_TIMEOUT)
+                    decoded = tokenizer.batch_decode(translated_ids, skip_special_tokens=True)
+
+                translations = [translation.strip() for translation in decoded]
 
             except TimeoutError:
                 print(f"[Translation] Batch {batch_num}/{total_batches} timed out after {BATCH_TIMEOUT}s, falling back to individual segments")
-                cls._translate_segments_individually(
-                    batch, segment_indices, tokenizer, model
-                )
-                translated_count += len(batch)
-                if progress_callback:
-                    progress_callback(translated_count, total_segments)
+                translations = cls._translate_texts_individually(texts_to_translate, tokenizer, model)
 
             except Exception as e:
                 print(f"[Translation] Error in batch {batch_num}: {str(e)}, falling back to individual segments")
-                cls._translate_segments_individually(
-                    batch, segment_indices, tokenizer, model
-                )
-                translated_count += len(batch)
-                if progress_callback:
-                    progress_callback(translated_count, total_segments)
+                translations = cls._translate_texts_individually(texts_to_translate, tokenizer, model)
 
-        # Ensure all segments have translation field
-        for segment in segments:
-            if 'translation' not in segment:
-                segment['translation'] = '[No speech detected]'
+            # Assign translations back to every segment sharing the text
+            for text, translation in zip(texts_to_translate, translations):
+                if translation is not None:
+                    cls._cache_translation(source_lang, text, translation)
+                for segment in pending[text]:
+                    segment['translation'] = translation
+                translated_count += len(pending[text])
+
+            # Log progress every batch
+            print(f"[Translation] Batch {batch_num}/{total_batches}: translated {len(texts_to_translate)} texts ({translated_count}/{total_segments} segments total)")
+
+            # Call progress callback
+            if progress_callback:
+                progress_callback(translated_count, total_segments)
 
         print(f"[Translation] Completed: {translated_count}/{total_segments} segments translated")
         return segments
 
     @classmethod
-    def _translate_segments_individually(
+    def _get_cached_translation(cls, source_lang: str, text: str) -> Optional[str]:
+        """Return a cached segment translation and mark it recently used, or None."""
+        key = (source_lang, text)
+        with cls._translation_cache_lock:
+            translation = cls._translation_cache.get(key)
+            if translation is not None:
+                cls._translation_cache.move_to_end(key)
+        return translation
+
+    @classmethod
+    def _cache_translation(cls, source_lang: str, text: str, translation: str) -> None:
+        """Store a segment translation, evicting the least recently used entries."""
+        key = (source_lang, text)
+        with cls._translation_cache_lock:
+            cls._translation_cache[key] = translation
+            cls._translation_cache.move_to_end(key)
+            while len(cls._translation_cache) > settings.TRANSLATION_CACHE_SIZE:
+                cls._translation_cache.popitem(last=False)
+
+    @classmethod
+    def _translate_texts_individually(
         cls,
-        batch: List[Dict],
-        segment_indices: List[int],
-        tokenizer: MarianTokenizer,
-        model: MarianMTModel,
-    ) -> None:
-        """Translate segments one-by-one with a per-segment timeout. Used as fallback when batch translation fails or times out."""
+        texts: List[str],
+        tokenizer: "MarianTokenizer",
+        model: "MarianMTModel",
+    ) -> List[Optional[str]]:
+        """Translate texts one-by-one with a per-segment timeout. Used as fallback when batch translation fails or times out."""
         SEGMENT_TIMEOUT = 30
-        for idx in segment_indices:
-            text = batch[idx].get('text', '').strip()
+        translations: List[Optional[str]] = []
+        for text in texts:
             try:
-                inputs = tokenizer(text, return_tensors="pt", padding=True)
+                inputs = tokenizer(text, return_tensors="pt", padding=True).to(model.device)
                 with ThreadPoolExecutor(max_workers=1) as executor:
                     future = executor.submit(
-                        model.generate,
+                        _generate,
+                        model,
                         **inputs,
                         num_beams=4,
                         early_stopping=True,
                     )
                     translated = future.result(timeout=SEGMENT_TIMEOUT)
                 translation = tokenizer.decode(translated[0], skip_special_tokens=True)
-                batch[idx]['translation'] = translation.strip()
+                translations.append(translation.strip())
             except TimeoutError:
                 print(f"[Translation] Segment timed out after {SEGMENT_TIMEOUT}s, skipping: {text[:80]}...")
-                batch[idx]['translation'] = None
+                translations.append(None)
             except Exception as inner_e:
                 print(f"[Translation] Fallback failed for segment: {inner_e}")
-                batch[idx]['translation'] = None
+                translations.append(None)
+        return translations
+
+
+class _TranslationMicroBatcher:
+    """Coalesce concurrent translate requests into batched forward passes.
+
+    Requests are queued per source language; a drain task waits up to
+    MAX_WAIT_SECONDS for up to MAX_BATCH texts, translates them in one call on a
+    worker thread and resolves each caller's future.
+    """
+
+    MAX_BATCH = 16
+    MAX_WAIT_SECONDS = 0.02
+
+    def __init__(self):
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        # Dedicated pool so translation batches never queue behind other to_thread work
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.TRANSLATION_WORKERS), thread_name_prefix="translation"
+        )
+
+    async def submit(self, text: str, source_lang: str) -> str:
+        queue = self._queues.get(source_lang)
+        if queue is None:
+            queue = self._queues[source_lang] = asyncio.Queue()
+        worker = self._workers.get(source_lang)
+        if worker is None or worker.done():
+            self._workers[source_lang] = asyncio.create_task(self._drain(source_lang, queue))
+
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((text, future))
+        return await future
+
+    async def _drain(self, source_lang: str, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.MAX_WAIT_SECONDS
+            while len(batch) < self.MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                translations = await loop.run_in_executor(
+                    self._executor, TranslationService.translate_texts, texts, source_lang, self.MAX_BATCH
+                )
+                for (_, future), translation in zip(batch, translations):
+                    if not future.done():
+                        future.set_result(translation)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+_micro_batcher = _TranslationMicroBatcher()
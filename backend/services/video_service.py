@@ -7,6 +7,20 @@ import traceback
 import concurrent.futures
 from typing import Callable, Dict, List, Optional, Tuple
 
+from config import settings
+
+
+def _jpeg_output_args() -> List[str]:
+    """FFmpeg output options shared by every screenshot extractor.
+
+    Frames are downscaled (never upscaled) to SCREENSHOT_WIDTH and encoded at
+    SCREENSHOT_JPEG_QUALITY (2 = near-lossless, 31 = worst).
+    """
+    return [
+        '-q:v', str(settings.SCREENSHOT_JPEG_QUALITY),
+        '-vf', f"scale='min(iw,{settings.SCREENSHOT_WIDTH})':-2",
+    ]
+
 
 class VideoService:
     """Service for video processing operations"""
@@ -30,8 +44,7 @@ class VideoService:
                 '-ss', str(timestamp),
                 '-i', input_path,
                 '-vframes', '1',
-                '-q:v', '2',  # High quality
-                '-vf', 'scale=1280:-1',  # Scale to a larger width (e.g., 1280px)
+                *_jpeg_output_args(),
                 output_path,
                 '-y'  # Overwrite if exists
             ]
@@ -63,6 +76,138 @@ class VideoService:
             traceback.print_exc()
             return False
 
+    @staticmethod
+    def extract_screenshots(
+        input_path: str,
+        tasks: List[Tuple[float, str]],
+        batch_size: int = 16,
+        max_workers: int = 1
+    ) -> List[bool]:
+        """
+        Extract several screenshots from a local video with one FFmpeg process per batch.
+
+        Each timestamp becomes its own fast-seeked input ('-ss' before '-i') mapped to
+        its own single-frame output, so frames match extract_screenshot() while process
+        startup and container parsing are paid once per batch instead of once per frame.
+        Timestamps whose output is missing after a batch are retried individually.
+
+        Args:
+            input_path: Path to the local video file
+            tasks: List of (timestamp, output_path) pairs
+            batch_size: Maximum timestamps handled by one FFmpeg process
+            max_workers: Number of batches run concurrently
+
+        Returns:
+            List of success flags, aligned with tasks
+        """
+        if not os.path.exists(input_path):
+            print(f"ERROR: Input file does not exist: {input_path}")
+            return [False] * len(tasks)
+
+        def extract_batch(batch: List[Tuple[float, str]]) -> List[bool]:
+            return VideoService._extract_screenshot_batch(input_path, batch, VideoService.extract_screenshot)
+
+        batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+        results: List[bool] = []
+        if max_workers > 1 and len(batches) > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for batch_results in executor.map(extract_batch, batches):
+                    results.extend(batch_results)
+        else:
+            for batch in batches:
+                results.extend(extract_batch(batch))
+
+        print(f"Extracted {sum(results)}/{len(tasks)} screenshots")
+        return results
+
+    @staticmethod
+    def _extract_screenshot_batch(
+        source: str,
+        batch: List[Tuple[float, str]],
+        extract_one: Callable[[str, float, str], bool]
+    ) -> List[bool]:
+        """
+        Extract a batch of screenshots with one multi-input FFmpeg process.
+
+        Each timestamp becomes its own fast-seeked input mapped to its own
+        single-frame output. Timestamps whose output is missing afterwards are
+        retried individually with extract_one(source, timestamp, output_path).
+        """
+        # Clear stale outputs so the existence check below reflects this run
+        for _, output_path in batch:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+
+        cmd = ['ffmpeg', '-y']
+        for timestamp, _ in batch:
+            cmd += ['-ss', str(timestamp), '-i', source]
+        for input_index, (_, output_path) in enumerate(batch):
+            cmd += [
+                '-map', f'{input_index}:v:0',
+                '-frames:v', '1',
+                *_jpeg_output_args(),
+                output_path
+            ]
+
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=60 + 5 * len(batch))
+        except subprocess.TimeoutExpired:
+            print(f"ERROR: Batched FFmpeg screenshot extraction timed out ({len(batch)} timestamps)")
+        except subprocess.CalledProcessError as e:
+            print(f"ERROR: Batched FFmpeg screenshot extraction failed (return code {e.returncode})")
+
+        batch_results = []
+        for timestamp, output_path in batch:
+            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+                batch_results.append(True)
+            else:
+                # e.g. a timestamp past the last frame fails the whole batch command
+                batch_results.append(extract_one(source, timestamp, output_path))
+        return batch_results
+
+    @staticmethod
+    def extract_screenshots_batched_from_url(
+        source_url: str,
+        timestamps: List[float],
+        output_dir: str,
+        video_hash: str,
+        batch_size: int = 8,
+        max_workers: int = 4
+    ) -> Dict[float, Optional[str]]:
+        """
+        Extract many screenshots from a video URL with one FFmpeg process per batch.
+
+        Like extract_screenshots() for local files: each process seeks to batch_size
+        timestamps as separate HTTP-range inputs, so process startup and container
+        header parsing are paid once per batch instead of once per frame.
+
+        Args:
+            source_url: HTTP(S) URL to the video file (e.g., GCS signed URL)
+            timestamps: List of timestamps (in seconds) to extract
+            output_dir: Directory where screenshots will be saved
+            video_hash: Video identifier for filenames
+            batch_size: Timestamps handled by one FFmpeg process
+            max_workers: Number of batches run concurrently
+
+        Returns:
+            Dict mapping timestamp -> screenshot_path (or None if failed)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        tasks = [(ts, os.path.join(output_dir, f"{video_hash}_{ts:.2f}.jpg")) for ts in timestamps]
+        batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+
+        def extract_batch(batch: List[Tuple[float, str]]) -> List[bool]:
+            return VideoService._extract_screenshot_batch(source_url, batch, VideoService.extract_screenshot_from_url)
+
+        results: Dict[float, Optional[str]] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for batch, batch_results in zip(batches, executor.map(extract_batch, batches)):
+                for (ts, output_path), success in zip(batch, batch_results):
+                    results[ts] = output_path if success else None
+
+        print(f"[URL Screenshots] Extracted {sum(1 for p in results.values() if p)}/{len(tasks)} screenshots in {len(batches)} FFmpeg batches")
+        return results
+
     @staticmethod
     def extract_screenshot_from_url(source_url: str, timestamp: float, output_path: str) -> bool:
         """
@@ -89,8 +234,7 @@ class VideoService:
                 '-ss', str(timestamp),        # Seek BEFORE input (critical for HTTP efficiency)
                 '-i', source_url,             # Input from URL
                 '-vframes', '1',              # Extract exactly one frame
-                '-q:v', '2',                  # High quality JPEG
-                '-vf', 'scale=1280:-1',       # Scale width to 1280px
+                *_jpeg_output_args(),         # JPEG quality / width from settings
                 output_path,
                 '-y',                         # Overwrite if exists
                 '-loglevel', 'error'          # Reduce log verbosity
@@ -180,6 +324,23 @@ class VideoService:
 
         return results
 
+    @staticmethod
+    def _probe_codecs(input_path: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return the (video, audio) codec names of the first streams, None where absent or unknown"""
+        def probe(stream: str) -> Optional[str]:
+            try:
+                result = subprocess.run(
+                    ['ffprobe', '-v', 'error', '-select_streams', stream,
+                     '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', input_path],
+                    capture_output=True, text=True, timeout=30
+                )
+                codec = result.stdout.strip().splitlines()
+                return codec[0].strip() if result.returncode == 0 and codec else None
+            except Exception:
+                return None
+
+        return probe('v:0'), probe('a:0')
+
     @staticmethod
     def convert_mkv_to_mp4(input_path: str, output_path: str) -> bool:
         """
@@ -196,23 +357,57 @@ class VideoService:
                 print(f"ERROR: Input file does not exist: {input_path}")
                 return False
 
+            # Streams that are already browser-compatible (H.264 / AAC) are copied
+            # into the MP4 container instead of being re-encoded
+            video_codec, audio_codec = VideoService._probe_codecs(input_path)
+            copy_video = video_codec == 'h264'
+            copy_audio = audio_codec in ('aac', None)
+
+            if copy_video:
+                video_args = ['-c:v', 'copy']
+            else:
+                video_args = [
+                    '-c:v', 'libx264',      # H.264 video codec (widely supported)
+                    '-preset', 'medium',     # Balance between speed and quality
+                    '-crf', '23',            # Quality (23 is default, lower = better quality)
+                ]
+            if copy_audio:
+                audio_args = ['-c:a', 'copy']
+            else:
+                audio_args = [
+                    '-c:a', 'aac',           # AAC audio codec (widely supported)
+                    '-b:a', '128k',          # Audio bitrate
+                ]
+
             # FFmpeg command to convert to MP4 with H.264 video and AAC audio
             cmd = [
                 'ffmpeg',
                 '-i', input_path,
-                '-c:v', 'libx264',      # H.264 video codec (widely supported)
-                '-preset', 'medium',     # Balance between speed and quality
-                '-crf', '23',            # Quality (23 is default, lower = better quality)
-                '-c:a', 'aac',           # AAC audio codec (widely supported)
-                '-b:a', '128k',          # Audio bitrate
+                *video_args,
+                *audio_args,
                 '-movflags', '+faststart',  # Enable streaming
                 output_path,
                 '-y'  # Overwrite if exists
             ]
 
-            print(f"Running conversion command...")
+            print(f"Running conversion command (video: {'copy' if copy_video else 'libx264'}, "
+                  f"audio: {'copy' if copy_audio else 'aac'})...")
             result = subprocess.run(cmd, capture_output=True, text=True)
 
+            if result.returncode != 0 and (copy_video or copy_audio):
+                # e.g. a stream the MP4 muxer rejects as-is: fall back to a full transcode
+                print(f"Stream copy failed, re-encoding instead...")
+                cmd = [
+                    'ffmpeg',
+                    '-i', input_path,
+                    '-c:v', 'libx264', '-preset', 'medium', '-crf', '23',
+                    '-c:a', 'aac', '-b:a', '128k',
+                    '-movflags', '+faststart',
+                    output_path,
+                    '-y'
+                ]
+                result = subprocess.run(cmd, capture_output=True, text=True)
+
             if result.returncode != 0:
                 print(f"ERROR: FFmpeg conversion failed")
                 print(f"Return code: {result.returncode}")
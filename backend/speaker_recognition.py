@@ -10,7 +10,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import torch
 from pyannote.audio import Inference
-from scipy.spatial.distance import cosine
+
+from utils import embedding_cache
 
 class SpeakerRecognitionSystem:
     """
@@ -28,6 +29,12 @@ class SpeakerRecognitionSystem:
         self.database_path = database_path
         self.speaker_database = self._load_database()
 
+        # Enrolled voice prints as one L2-normalized (K, D) matrix, row i
+        # belonging to _enrolled_names[i]; rebuilt whenever the database changes
+        self._enrolled_names: List[str] = []
+        self._enrolled_matrix: Optional[np.ndarray] = None
+        self._rebuild_enrolled_matrix()
+
         # Initialize pyannote embedding model
         # This extracts voice embeddings (voice prints)
         try:
@@ -46,6 +53,10 @@ class SpeakerRecognitionSystem:
                 "pyannote/embedding",
                 use_auth_token=hf_token
             )
+            # Same model, one embedding per input: the default sliding window
+            # returns one per frame, which varies with the audio's duration.
+            # Enrollment and identification both embed through this one
+            self.segment_embedding_model = Inference(self.embedding_model.model, window="whole")
             print("Speaker embedding model loaded successfully")
         except Exception as e:
             print(f"Error loading embedding model: {e}")
@@ -68,6 +79,51 @@ class SpeakerRecognitionSystem:
                 return {}
         return {}
 
+    @staticmethod
+    def _embedding_vector(embedding) -> np.ndarray:
+        """Reduce model output to one 1-D voice print, averaging frame-level embeddings"""
+        embedding = np.asarray(getattr(embedding, 'data', embedding), dtype=np.float32)
+        if embedding.ndim > 1:
+            embedding = embedding.reshape(-1, embedding.shape[-1]).mean(axis=0)
+        return embedding
+
+    def _rebuild_enrolled_matrix(self):
+        """Stack and normalize all enrolled embeddings for vectorized matching
+
+        Prints enrolled with the old sliding-window extraction were stored as
+        flattened frame stacks; they are re-derived as the mean of their frames.
+        Prints whose length doesn't fit the common dimension are skipped rather
+        than failing the whole matrix.
+        """
+        vectors = {
+            name: self._embedding_vector(data['embedding'])
+            for name, data in self.speaker_database.items()
+        }
+        dim = min((v.shape[0] for v in vectors.values() if v.shape[0]), default=0)
+
+        self._enrolled_names = []
+        rows = []
+        for name, vector in vectors.items():
+            if dim and vector.shape[0] != dim and vector.shape[0] % dim == 0:
+                print(f"Re-deriving voice print of {name} from {vector.shape[0] // dim} frames; "
+                      f"re-enroll for best accuracy")
+                vector = vector.reshape(-1, dim).mean(axis=0)
+            if not dim or vector.shape[0] != dim:
+                print(f"Skipping voice print of {name}: dimension {vector.shape[0]} != {dim}")
+                continue
+            self.speaker_database[name]['embedding'] = vector
+            self._enrolled_names.append(name)
+            rows.append(vector)
+
+        if not rows:
+            self._enrolled_matrix = None
+            return
+
+        matrix = np.stack(rows)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._enrolled_matrix = matrix / norms
+
     def _save_database(self):
         """Save speaker database to file"""
         try:
@@ -103,15 +159,12 @@ class SpeakerRecognitionSystem:
                 # Extract embedding from specific segment
                 from pyannote.core import Segment
                 segment = Segment(start_time, end_time)
-                embedding = self.embedding_model({
-                    'uri': audio_path,
-                    'audio': audio_path
-                }, segment)
+                embedding = self.segment_embedding_model.crop(audio_path, segment)
             else:
                 # Extract embedding from entire file
-                embedding = self.embedding_model(audio_path)
+                embedding = self.segment_embedding_model(audio_path)
 
-            return embedding
+            return self._embedding_vector(embedding)
         except Exception as e:
             print(f"Error extracting embedding: {e}")
             raise
@@ -139,15 +192,21 @@ class SpeakerRecognitionSystem:
             if speaker_name in self.speaker_database:
                 # Update existing speaker - average with existing embedding
                 print(f"Updating existing speaker: {speaker_name}")
-                old_embedding = self.speaker_database[speaker_name]['embedding']
+                old_embedding = np.asarray(self.speaker_database[speaker_name]['embedding'], dtype=np.float32)
                 old_count = self.speaker_database[speaker_name]['samples_count']
 
-                # Weighted average of embeddings
-                new_embedding = (old_embedding * old_count + embedding) / (old_count + 1)
+                if old_embedding.shape != embedding.shape:
+                    # Print from an older extraction that couldn't be re-derived: start over
+                    print(f"Replacing incompatible voice print of {speaker_name}")
+                    new_embedding, new_count = embedding, 1
+                else:
+                    # Weighted average of embeddings
+                    new_embedding = (old_embedding * old_count + embedding) / (old_count + 1)
+                    new_count = old_count + 1
 
                 self.speaker_database[speaker_name] = {
                     'embedding': new_embedding,
-                    'samples_count': old_count + 1
+                    'samples_count': new_count
                 }
             else:
                 # New speaker
@@ -158,6 +217,7 @@ class SpeakerRecognitionSystem:
                 }
 
             # Save to disk
+            self._rebuild_enrolled_matrix()
             self._save_database()
             print(f"Successfully enrolled {speaker_name}")
             return True
@@ -181,27 +241,26 @@ class SpeakerRecognitionSystem:
             Tuple of (speaker_name, confidence) or (None, 0.0) if no match
         """
         try:
-            if not self.speaker_database:
+            if self._enrolled_matrix is None:
                 print("No speakers enrolled in database")
                 return None, 0.0
 
             # Extract embedding from audio
             embedding = self.extract_embedding(audio_path, start_time, end_time)
+            if embedding.shape[0] != self._enrolled_matrix.shape[1]:
+                print(f"Embedding dimension {embedding.shape[0]} does not match enrolled voice prints")
+                return None, 0.0
 
-            # Compare with all enrolled speakers
-            similarities = {}
-            for speaker_name, speaker_data in self.speaker_database.items():
-                stored_embedding = speaker_data['embedding']
-
-                # Calculate cosine similarity (1 = identical, 0 = completely different)
-                similarity = 1 - cosine(embedding, stored_embedding)
-                similarities[speaker_name] = similarity
+            # Compare with all enrolled speakers in one matmul
+            # (cosine similarity: 1 = identical, 0 = completely different)
+            norm = np.linalg.norm(embedding)
+            similarities = self._enrolled_matrix @ (embedding / norm if norm else embedding)
 
             # Find best match
-            best_speaker = max(similarities, key=similarities.get)
-            best_similarity = similarities[best_speaker]
+            best_idx = int(similarities.argmax())
+            best_speaker = self._enrolled_names[best_idx]
+            best_similarity = float(similarities[best_idx])
 
-            print(f"Similarities: {similarities}")
             print(f"Best match: {best_speaker} ({best_similarity:.3f})")
 
             # Check if similarity meets threshold
@@ -215,10 +274,140 @@ class SpeakerRecognitionSystem:
             print(f"Error identifying speaker: {e}")
             return None, 0.0
 
+    def extract_embeddings_batch(self, audio_path: str,
+                                 segments: List[Tuple[float, float]]) -> np.ndarray:
+        """
+        Extract voice embeddings for many segments of the same file
+
+        The audio is decoded once, already downmixed and resampled to the
+        embedding model's rate, and every segment is cropped from that
+        in-memory waveform instead of re-opening (and re-resampling) the file
+        per segment.
+
+        Args:
+            audio_path: Path to audio/video file
+            segments: List of (start_time, end_time) tuples in seconds
+
+        Returns:
+            numpy array of shape (len(segments), embedding_dim); rows for
+            segments that could not be embedded are NaN
+        """
+        from pyannote.core import Segment
+
+        # The model's own Audio helper decodes at its sample rate, so crops need no resampling
+        waveform, sample_rate = self.embedding_model.model.audio(audio_path)
+        file = {'uri': audio_path, 'waveform': waveform, 'sample_rate': sample_rate}
+        duration = waveform.shape[-1] / sample_rate
+
+        embeddings = []
+        dim = 0
+        for start_time, end_time in segments:
+            end_time = min(end_time, duration)
+            try:
+                if end_time <= start_time:
+                    raise ValueError(f"empty segment [{start_time:.2f}, {end_time:.2f}]")
+                embedding = self._embedding_vector(
+                    self.segment_embedding_model.crop(file, Segment(start_time, end_time))
+                )
+                if dim and embedding.shape[0] != dim:
+                    raise ValueError(f"embedding dimension {embedding.shape[0]} != {dim}")
+                dim = embedding.shape[0]
+                embeddings.append(embedding)
+            except Exception as e:
+                print(f"Error extracting embedding for segment [{start_time:.1f}s]: {e}")
+                embeddings.append(None)
+
+        result = np.full((len(segments), dim), np.nan, dtype=np.float32)
+        for i, embedding in enumerate(embeddings):
+            if embedding is not None:
+                result[i] = embedding
+        return result
+
+    def _load_or_extract_embeddings(self, audio_path: str, segments: List[Tuple[float, float]],
+                                    cache_key: Optional[str] = None) -> np.ndarray:
+        """
+        Get segment embeddings, reusing a cached .npy for the same video and segments
+
+        Embeddings don't depend on who is enrolled, so re-running identification
+        after enrolling a new speaker only needs the similarity matmul.
+
+        Args:
+            audio_path: Path to audio/video file
+            segments: List of (start_time, end_time) tuples in seconds
+            cache_key: Stable identifier of the audio (e.g. video hash); no caching if None
+
+        Returns:
+            numpy array of shape (len(segments), embedding_dim)
+        """
+        if cache_key is None:
+            return self.extract_embeddings_batch(audio_path, segments)
+
+        cache_path = embedding_cache.cache_path(cache_key, segments, tag="whole")
+        embeddings = embedding_cache.load(cache_path, len(segments))
+        if embeddings is not None:
+            print(f"Loaded cached segment embeddings from {cache_path}")
+            return embeddings
+
+        embeddings = self.extract_embeddings_batch(audio_path, segments)
+        embedding_cache.save(cache_path, embeddings)
+        return embeddings
+
+    def identify_speakers_batch(self, audio_path: str, segments: List[Tuple[float, float]],
+                                threshold: float = 0.7,
+                                cache_key: Optional[str] = None) -> List[Tuple[Optional[str], float]]:
+        """
+        Identify the speaker of many segments of the same file
+
+        Embeds all segments with extract_embeddings_batch, then matches them
+        against every enrolled speaker with a single cosine-similarity matmul.
+
+        Args:
+            audio_path: Path to audio/video file
+            segments: List of (start_time, end_time) tuples in seconds
+            threshold: Similarity threshold (0.0 to 1.0). Higher = more strict
+            cache_key: Stable identifier of the audio (e.g. video hash) used to
+                cache the segment embeddings between calls
+
+        Returns:
+            List of (speaker_name, confidence) per segment; speaker_name is
+            None when the best match is below threshold
+        """
+        if self._enrolled_matrix is None or not segments:
+            return [(None, 0.0)] * len(segments)
+
+        names = self._enrolled_names
+        enrolled = self._enrolled_matrix
+
+        embeddings = self._load_or_extract_embeddings(audio_path, segments, cache_key)
+        if embeddings.shape[1] != enrolled.shape[1]:
+            if embeddings.shape[1]:
+                print(f"Segment embedding dimension {embeddings.shape[1]} does not match "
+                      f"enrolled voice prints ({enrolled.shape[1]})")
+            return [(None, 0.0)] * len(segments)
+
+        valid = ~np.isnan(embeddings).any(axis=1)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        similarities = np.nan_to_num(embeddings / norms) @ enrolled.T
+
+        best_idx = similarities.argmax(axis=1)
+        best_sim = similarities[np.arange(len(segments)), best_idx]
+
+        results = []
+        for i in range(len(segments)):
+            if not valid[i]:
+                results.append((None, 0.0))
+            elif best_sim[i] >= threshold:
+                results.append((names[best_idx[i]], float(best_sim[i])))
+            else:
+                results.append((None, float(best_sim[i])))
+        return results
+
     def remove_speaker(self, speaker_name: str) -> bool:
         """Remove a speaker from the database"""
         if speaker_name in self.speaker_database:
             del self.speaker_database[speaker_name]
+            self._rebuild_enrolled_matrix()
             self._save_database()
             print(f"Removed speaker: {speaker_name}")
             return True
@@ -239,6 +428,18 @@ class SpeakerRecognitionSystem:
         return None
 
 
+    def list_speakers_info(self) -> List[Dict]:
+        """Get information about all enrolled speakers in one pass"""
+        return [
+            {
+                'name': name,
+                'samples_count': speaker_data['samples_count'],
+                'embedding_shape': speaker_data['embedding'].shape
+            }
+            for name, speaker_data in self.speaker_database.items()
+        ]
+
+
 # Global instance
 _speaker_recognition_system = None
 
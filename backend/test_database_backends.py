@@ -20,6 +20,7 @@ os.environ["DATABASE_PATH"] = "test_transcriptions.db"
 # Import after setting env vars
 from database import (
     init_db,
+    close_db,
     store_transcription,
     get_transcription,
     list_transcriptions,
@@ -93,6 +94,7 @@ retrieved = get_transcription(test_hash)
 print(f"   Verified deletion: {retrieved is None}")
 
 # Cleanup
+close_db()
 import os
 if os.path.exists("test_transcriptions.db"):
     os.remove("test_transcriptions.db")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk speaker embedding cache in utils.embedding_cache
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from utils import embedding_cache
+
+
+@pytest.fixture
+def cache_dir(monkeypatch, tmp_path):
+    settings = embedding_cache.settings
+    monkeypatch.setattr(settings, "SPEAKER_EMBEDDING_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "SPEAKER_EMBEDDING_CACHE_MAX_MB", 256)
+    monkeypatch.setattr(settings, "SPEAKER_EMBEDDING_CACHE_MAX_AGE_HOURS", 168)
+    return tmp_path
+
+
+def test_round_trip_and_row_check(cache_dir):
+    path = embedding_cache.cache_path("video-a", [(0.0, 1.5), (1.5, 3.0)])
+    embeddings = np.ones((2, 4), dtype=np.float32)
+
+    embedding_cache.save(path, embeddings)
+
+    assert np.array_equal(embedding_cache.load(path, 2), embeddings)
+    assert embedding_cache.load(path, 3) is None, "Row count must match the segments"
+    assert embedding_cache.cache_path("video-a", [(0.0, 1.5)]) != path
+
+
+def test_prune_drops_old_entries_then_least_recently_used(cache_dir, monkeypatch):
+    old = embedding_cache.cache_path("video-a", [(0.0, 1.0)])
+    embedding_cache.save(old, np.zeros((1, 4)))
+    two_weeks_ago = time.time() - 14 * 24 * 3600
+    os.utime(old, (two_weeks_ago, two_weeks_ago))
+
+    # Every save prunes, so writing new entries drops the expired one
+    paths = [embedding_cache.cache_path("video-b", [(float(i), i + 1.0)]) for i in range(3)]
+    for i, path in enumerate(paths):
+        embedding_cache.save(path, np.zeros((1, 4)))
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+    assert not os.path.exists(old), "Entries past the max age are removed"
+
+    # Cap the cache at roughly two entries: the least recently used one goes
+    entry_size = os.path.getsize(paths[0])
+    monkeypatch.setattr(embedding_cache.settings, "SPEAKER_EMBEDDING_CACHE_MAX_MB", (2 * entry_size) / (1024 * 1024))
+    assert embedding_cache.prune() == 1
+    assert [os.path.exists(p) for p in paths] == [False, True, True]
+
+
+def test_delete_video_removes_only_that_video(cache_dir):
+    a = embedding_cache.cache_path("video-a", [(0.0, 1.0)])
+    b = embedding_cache.cache_path("video-b", [(0.0, 1.0)])
+    embedding_cache.save(a, np.zeros((1, 4)))
+    embedding_cache.save(b, np.zeros((1, 4)))
+
+    assert embedding_cache.delete_video("video-a") == 1
+    assert not os.path.exists(a) and os.path.exists(b)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
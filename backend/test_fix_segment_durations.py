@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 """
 Test script for fix_segment_durations function
-Verifies that the fix correctly handles overly long segments
+Verifies that the fix correctly handles overly long segments, and that the
+vectorized implementation in utils.transcript_utils matches the original
+per-segment loop (kept below as the reference)
 """
 
+import copy
+import random
 from typing import List, Dict
 
+from utils.transcript_utils import fix_segment_durations
+
 
 def format_timestamp(seconds: float) -> str:
     """Convert seconds to HH:MM:SS.mmm format with millisecond precision"""
@@ -19,9 +25,11 @@ def format_timestamp(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
 
 
-def fix_segment_durations(segments: List[Dict], max_duration_per_word: float = 2.0,
-                          min_duration: float = 0.5, max_segment_duration: float = 30.0) -> List[Dict]:
+def reference_fix_segment_durations(segments: List[Dict], max_duration_per_word: float = 2.0,
+                                    min_duration: float = 0.5, max_segment_duration: float = 30.0) -> List[Dict]:
     """
+    Original per-segment implementation of fix_segment_durations.
+
     Fix segments with unreasonably long durations caused by chunk boundary processing.
 
     This addresses the issue where Whisper creates incorrectly long segments during chunk
@@ -101,6 +109,8 @@ def test_fix_segment_durations():
 
     print(f"After:  '{fixed_1[0]['text']}' - Duration: {fixed_1[0]['end'] - fixed_1[0]['start']:.1f}s")
     print(f"New end time: {fixed_1[0]['end_time']}")
+    assert fixed_1[0]['end'] == 2.0, "One word should be capped at 2s"
+    assert fixed_1[0]['end_time'] == "00:00:02.000"
 
     # Test Case 2: Normal segments (should not be modified)
     test_segments_2 = [
@@ -131,6 +141,7 @@ def test_fix_segment_durations():
         print(f"Before: '{seg['text']}' - Duration: {seg['end'] - seg['start']:.1f}s")
 
     fixed_2 = fix_segment_durations(test_segments_2)
+    assert [seg['end'] for seg in fixed_2] == [2.5, 5.0], "Normal segments should not change"
 
     for seg in fixed_2:
         print(f"After:  '{seg['text']}' - Duration: {seg['end'] - seg['start']:.1f}s")
@@ -153,6 +164,7 @@ def test_fix_segment_durations():
     print(f"Before: '{test_segments_3[0]['text'][:50]}...' - Duration: {test_segments_3[0]['end'] - test_segments_3[0]['start']:.1f}s")
 
     fixed_3 = fix_segment_durations(test_segments_3)
+    assert fixed_3[0]['end'] == 15.0, "Long segment with many words should not change"
 
     print(f"After:  '{fixed_3[0]['text'][:50]}...' - Duration: {fixed_3[0]['end'] - fixed_3[0]['start']:.1f}s")
 
@@ -175,6 +187,7 @@ def test_fix_segment_durations():
     print(f"Before: '{test_segments_4[0]['text']}' - Duration: {test_segments_4[0]['end'] - test_segments_4[0]['start']:.1f}s")
 
     fixed_4 = fix_segment_durations(test_segments_4)
+    assert fixed_4[0]['end'] == 30.0, "Silent segments should not change"
 
     print(f"After:  '{fixed_4[0]['text']}' - Duration: {fixed_4[0]['end'] - fixed_4[0]['start']:.1f}s")
 
@@ -217,6 +230,7 @@ def test_fix_segment_durations():
         print(f"Before: '{seg['text'][:30]}...' - Duration: {seg['end'] - seg['start']:.1f}s")
 
     fixed_5 = fix_segment_durations(test_segments_5)
+    assert [seg['end'] for seg in fixed_5] == [298.0, 300.0, 478.5], "Only the chunk boundary segment should be capped"
 
     for seg in fixed_5:
         print(f"After:  '{seg['text'][:30]}...' - Duration: {seg['end'] - seg['start']:.1f}s")
@@ -226,5 +240,77 @@ def test_fix_segment_durations():
     print("="*60)
 
 
+
+def _segment(start: float, end: float, text, **extra) -> Dict:
+    segment = {
+        "id": f"seg-{start}",
+        "start": start,
+        "end": end,
+        "start_time": format_timestamp(start),
+        "end_time": format_timestamp(end),
+        "text": text,
+    }
+    segment.update(extra)
+    return segment
+
+
+def _assert_matches_reference(segments: List[Dict], **kwargs) -> None:
+    expected = reference_fix_segment_durations(copy.deepcopy(segments), **kwargs)
+    actual = fix_segment_durations(copy.deepcopy(segments), **kwargs)
+    assert actual == expected, f"Mismatch for {segments} {kwargs}:\n{actual}\n!=\n{expected}"
+
+
+def test_matches_reference_edge_cases():
+    """The vectorized fix_segment_durations matches the original loop on edge cases"""
+    _assert_matches_reference([])
+
+    # Exactly at the 3x tolerance (not fixed) and just over it (fixed)
+    _assert_matches_reference([_segment(0.0, 6.0, "Sí."), _segment(10.0, 16.000001, "Sí.")])
+
+    # Empty / whitespace-only text counts as one word
+    _assert_matches_reference([_segment(0.0, 10.0, ""), _segment(10.0, 20.0, "   ")])
+
+    # Missing text, start or end keys
+    _assert_matches_reference([{"start": 5.0, "end": 100.0}, {"text": "hola", "end": 50.0}, {"text": "hola"}])
+
+    # Many words: capped by max_segment_duration (30s * 3 tolerance)
+    long_text = " ".join(["palabra"] * 40)
+    _assert_matches_reference([_segment(0.0, 90.0, long_text), _segment(100.0, 190.5, long_text)])
+
+    # Silent segments are never touched, even when is_silent is truthy but not True
+    _assert_matches_reference([
+        _segment(0.0, 500.0, "[No speech detected]", is_silent=True),
+        _segment(0.0, 500.0, "[No speech detected]", is_silent=1),
+        _segment(0.0, 500.0, "[No speech detected]", is_silent=False),
+    ])
+
+    # Negative and zero durations
+    _assert_matches_reference([_segment(10.0, 5.0, "al revés"), _segment(3.0, 3.0, "nada")])
+
+    # Custom limits, including min_duration above the per-word estimate
+    segments = [_segment(0.0, 4.0, "a"), _segment(4.0, 40.0, "a b c"), _segment(40.0, 41.0, "a b")]
+    _assert_matches_reference(segments, max_duration_per_word=0.25, min_duration=1.0, max_segment_duration=5.0)
+
+
+def test_matches_reference_random():
+    """The vectorized fix_segment_durations matches the original loop on random input"""
+    rng = random.Random(1234)
+    words = ["sí", "no", "hola", "que", "tal", "bien", "gracias"]
+    for _ in range(300):
+        segments = []
+        t = 0.0
+        for _ in range(rng.randint(0, 20)):
+            start = round(t, 3)
+            end = round(start + rng.choice([rng.uniform(0, 5), rng.uniform(0, 400)]), 3)
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 25)))
+            extra = {"is_silent": True} if rng.random() < 0.1 else {}
+            segments.append(_segment(start, end, text, **extra))
+            t = end
+        _assert_matches_reference(segments)
+
+
 if __name__ == "__main__":
     test_fix_segment_durations()
+    test_matches_reference_edge_cases()
+    test_matches_reference_random()
+    print("All fix_segment_durations tests passed")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched FFmpeg screenshot extractors in services.video_service,
+with FFmpeg replaced by a fake that writes the requested output files
+"""
+
+import os
+
+import pytest
+
+from services import video_service
+from services.video_service import VideoService
+
+
+class FakeFFmpeg:
+    """Stand-in for subprocess.run: writes every output path of an FFmpeg command"""
+
+    def __init__(self, fail_timestamps=()):
+        self.commands = []
+        self.fail_timestamps = {str(ts) for ts in fail_timestamps}
+
+    def __call__(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        seeks = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-ss']
+        outputs = [arg for arg in cmd if arg.endswith('.jpg')]
+        for seek, output_path in zip(seeks, outputs):
+            if seek not in self.fail_timestamps:
+                with open(output_path, 'wb') as f:
+                    f.write(b'\xff\xd8jpeg')
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    ffmpeg = FakeFFmpeg()
+    monkeypatch.setattr(video_service.subprocess, "run", ffmpeg)
+    return ffmpeg
+
+
+def test_local_extraction_batches_timestamps(fake_ffmpeg, tmp_path):
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b'video')
+    tasks = [(float(i), str(tmp_path / f"a_{i}.jpg")) for i in range(5)]
+
+    results = VideoService.extract_screenshots(str(video), tasks, batch_size=2)
+
+    assert results == [True] * 5
+    assert len(fake_ffmpeg.commands) == 3, "One FFmpeg process per batch"
+    assert all(os.path.getsize(path) > 0 for _, path in tasks)
+
+
+def test_local_extraction_of_a_missing_video_fails_every_task(fake_ffmpeg, tmp_path):
+    tasks = [(1.0, str(tmp_path / "a_1.jpg")), (2.0, str(tmp_path / "a_2.jpg"))]
+
+    assert VideoService.extract_screenshots(str(tmp_path / "missing.mp4"), tasks) == [False, False]
+    assert fake_ffmpeg.commands == []
+
+
+def test_batch_uses_one_process_with_an_input_per_timestamp(fake_ffmpeg, tmp_path):
+    batch = [(1.0, str(tmp_path / "a_1.00.jpg")), (2.5, str(tmp_path / "a_2.50.jpg"))]
+    retried = []
+
+    results = VideoService._extract_screenshot_batch(
+        "video.mp4", batch, lambda *args: retried.append(args) or False
+    )
+
+    assert results == [True, True]
+    assert retried == []
+    assert len(fake_ffmpeg.commands) == 1
+    cmd = fake_ffmpeg.commands[0]
+    assert cmd.count('-i') == 2 and cmd.count('video.mp4') == 2
+    assert '0:v:0' in cmd and '1:v:0' in cmd, "Each input is mapped to its own output"
+
+
+def test_batch_retries_missing_outputs_individually(monkeypatch, tmp_path):
+    monkeypatch.setattr(video_service.subprocess, "run", FakeFFmpeg(fail_timestamps=[2.5]))
+    stale = tmp_path / "a_2.50.jpg"
+    stale.write_bytes(b'old frame')
+    batch = [(1.0, str(tmp_path / "a_1.00.jpg")), (2.5, str(stale))]
+    retried = []
+
+    results = VideoService._extract_screenshot_batch(
+        "video.mp4", batch, lambda source, ts, path: retried.append((source, ts, path)) or True
+    )
+
+    assert results == [True, True]
+    assert retried == [("video.mp4", 2.5, str(stale))], "Stale outputs must not count as extracted"
+
+
+def test_batched_from_url_maps_every_timestamp(fake_ffmpeg, tmp_path):
+    timestamps = [float(i) for i in range(20)]
+
+    results = VideoService.extract_screenshots_batched_from_url(
+        source_url="https://example.com/video.mp4",
+        timestamps=timestamps,
+        output_dir=str(tmp_path),
+        video_hash="abc",
+        batch_size=8,
+        max_workers=2,
+    )
+
+    assert len(fake_ffmpeg.commands) == 3
+    assert sorted(results) == timestamps
+    for ts, path in results.items():
+        assert path == os.path.join(str(tmp_path), f"abc_{ts:.2f}.jpg")
+        assert os.path.getsize(path) > 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for plan_summary_sections in utils.transcript_utils, which groups
+transcript segments into the sections summarized by /generate_summary/
+and /generate_summary_stream/
+"""
+
+import pytest
+
+from utils.time_utils import format_timestamp
+from utils.transcript_utils import plan_summary_sections
+
+
+def _segment(start, end, text, translation=None, screenshot_url=None):
+    return {
+        "start": start,
+        "end": end,
+        "start_time": format_timestamp(start),
+        "end_time": format_timestamp(end),
+        "text": text,
+        "translation": translation,
+        "screenshot_url": screenshot_url,
+    }
+
+
+def test_plan_summary_sections_breaks_on_pause_after_a_minute():
+    segments = [
+        _segment(0, 30, "uno"),
+        _segment(35, 50, "dos"),      # 5s pause, but the section is under a minute old
+        _segment(50, 65, "tres"),
+        _segment(70, 80, "cuatro", screenshot_url="https://example.com/4.jpg"),  # pause after 1min: new section
+        _segment(80, 90, "cinco", screenshot_url="https://example.com/5.jpg"),
+    ]
+    transcription = {"transcription": {"language": "en", "segments": segments}}
+
+    count, entries, texts = plan_summary_sections(transcription)
+
+    assert count == 2
+    assert texts == ["uno dos tres", "cuatro cinco"]
+    assert [(e["start"], e["end"]) for e in entries] == [
+        ("00:00:00", segments[2]["end_time"]),
+        (segments[3]["start_time"], segments[4]["end_time"]),
+    ]
+    assert [e["screenshot_url"] for e in entries] == [None, "https://example.com/4.jpg"]
+
+
+def test_plan_summary_sections_caps_at_three_minutes():
+    # Back-to-back 20s segments with no pauses
+    segments = [_segment(i * 20, (i + 1) * 20, f"s{i}") for i in range(15)]
+    transcription = {"transcription": {"language": "en", "segments": segments}}
+
+    count, entries, texts = plan_summary_sections(transcription)
+
+    assert count == 2
+    assert texts[0] == " ".join(f"s{i}" for i in range(9))
+    assert entries[1]["start"] == segments[9]["start_time"]
+
+
+def test_plan_summary_sections_uses_translations_and_skips_empty_sections():
+    segments = [
+        _segment(0, 70, "hola", translation="hello"),
+        _segment(80, 90, ""),  # empty section after a pause
+    ]
+    transcription = {"transcription": {"language": "es", "segments": segments}}
+
+    count, entries, texts = plan_summary_sections(transcription)
+
+    assert count == 2, "Empty sections still count towards sections_count"
+    assert texts == ["hello"]
+    assert len(entries) == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
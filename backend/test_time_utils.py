@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized time helpers in utils.time_utils
+Verifies that format_timestamps and times_to_seconds give exactly the same
+results as their scalar counterparts
+"""
+
+import random
+
+from utils.time_utils import format_timestamp, format_timestamps, time_to_seconds, times_to_seconds
+
+
+def test_format_timestamps_matches_scalar():
+    """format_timestamps returns the same strings as format_timestamp"""
+    rng = random.Random(42)
+    values = [0.0, 0.0005, 0.999, 1.0, 59.9995, 59.999999, 3599.999, 3600.0, 86399.5, 360000.123]
+    values += [rng.uniform(0, 20000) for _ in range(5000)]
+    values += [round(rng.uniform(0, 20000), 3) for _ in range(5000)]
+
+    assert format_timestamps(values) == [format_timestamp(v) for v in values]
+    assert format_timestamps([]) == []
+
+
+def test_times_to_seconds_matches_scalar():
+    """times_to_seconds equals time_to_seconds exactly for formatted timestamps"""
+    rng = random.Random(7)
+    with_millis = [
+        f"{rng.randrange(100):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}.{rng.randrange(1000):03d}"
+        for _ in range(20000)
+    ]
+    without_millis = [
+        f"{rng.randrange(100):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}"
+        for _ in range(20000)
+    ]
+
+    for time_strs in (with_millis, without_millis):
+        assert times_to_seconds(time_strs).tolist() == [time_to_seconds(t) for t in time_strs]
+
+
+def test_times_to_seconds_fallback():
+    """Mixed widths and malformed values fall back to time_to_seconds per string"""
+    time_strs = ["00:01:02.500", "01:02", "bad", "00:00:05", "1:2:3", "00:0x:00.000", "00:00:01.000"]
+    assert times_to_seconds(time_strs).tolist() == [time_to_seconds(t) for t in time_strs]
+
+    # Fixed width but wrong separators or non-ASCII digits
+    time_strs = ["00-01-02.500", "00:01:02.500"]
+    assert times_to_seconds(time_strs).tolist() == [time_to_seconds(t) for t in time_strs]
+    time_strs = ["00:01:0٣.500", "00:01:02.500"]
+    assert times_to_seconds(time_strs).tolist() == [time_to_seconds(t) for t in time_strs]
+
+    assert times_to_seconds([]).tolist() == []
+
+
+if __name__ == "__main__":
+    test_format_timestamps_matches_scalar()
+    test_times_to_seconds_matches_scalar()
+    test_times_to_seconds_fallback()
+    print("All time_utils tests passed")
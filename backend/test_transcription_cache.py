@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process transcription caches in services.transcription_cache
+"""
+
+import pytest
+
+from services import transcription_cache as tc
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """Start and end every test with empty module-level caches"""
+    def clear():
+        with tc._transcription_cache_lock:
+            tc._transcription_cache.clear()
+            tc._transcription_cache_versions.clear()
+        with tc._transcription_source_cache_lock:
+            tc._transcription_source_cache.clear()
+
+    clear()
+    yield
+    clear()
+
+
+# =============================================================================
+# get_transcription_from_any_source cache
+# =============================================================================
+
+def _counting_loader(monkeypatch, result):
+    calls = []
+
+    def load(video_hash):
+        calls.append(video_hash)
+        return result
+
+    monkeypatch.setattr(tc, "_load_transcription_from_any_source", load)
+    return calls
+
+
+def test_source_cache_hit_returns_independent_copies(monkeypatch):
+    calls = _counting_loader(monkeypatch, {"transcription": {"segments": [{"speaker": "SPEAKER_00"}]}})
+
+    first = tc.get_transcription_from_any_source("abc")
+    first["transcription"]["segments"][0]["speaker"] = "Anna"
+    second = tc.get_transcription_from_any_source("abc")
+
+    assert calls == ["abc"], "Second lookup should be served from the cache"
+    assert second["transcription"]["segments"][0]["speaker"] == "SPEAKER_00", "Callers must not share a copy"
+
+
+def test_source_cache_bypass_and_invalidation(monkeypatch):
+    calls = _counting_loader(monkeypatch, {"transcription": {"segments": []}})
+
+    tc.get_transcription_from_any_source("abc")
+    tc.get_transcription_from_any_source("abc", use_cache=False)
+    assert calls == ["abc", "abc"], "use_cache=False must always load"
+
+    tc._invalidate_transcription_cache("abc")
+    tc.get_transcription_from_any_source("abc")
+    assert calls == ["abc", "abc", "abc"], "Invalidation must drop the cached copy"
+
+
+def test_source_cache_skips_misses_and_expires(monkeypatch):
+    calls = _counting_loader(monkeypatch, None)
+    assert tc.get_transcription_from_any_source("missing") is None
+    assert tc.get_transcription_from_any_source("missing") is None
+    assert calls == ["missing", "missing"], "Misses are not cached"
+
+    calls = _counting_loader(monkeypatch, {"transcription": {"segments": []}})
+    now = [1000.0]
+    monkeypatch.setattr(tc.time, "monotonic", lambda: now[0])
+    tc.get_transcription_from_any_source("abc")
+    now[0] += tc.TRANSCRIPTION_SOURCE_CACHE_TTL + 1
+    tc.get_transcription_from_any_source("abc")
+    assert calls == ["abc", "abc"], "Expired entries must be reloaded"
+
+
+def test_source_cache_is_bounded(monkeypatch):
+    _counting_loader(monkeypatch, {"transcription": {"segments": []}})
+    for i in range(tc.TRANSCRIPTION_SOURCE_CACHE_SIZE + 5):
+        tc.get_transcription_from_any_source(f"hash-{i}")
+
+    assert len(tc._transcription_source_cache) == tc.TRANSCRIPTION_SOURCE_CACHE_SIZE
+    assert "hash-0" not in tc._transcription_source_cache, "Least recently used entries are evicted first"
+
+
+# =============================================================================
+# /transcription/{video_hash} ETag cache
+# =============================================================================
+
+def test_prepared_transcription_is_cached(monkeypatch):
+    prepared = ("etag", {"transcription": {"segments": []}})
+    monkeypatch.setattr(tc, "_prepare_transcription", lambda video_hash: prepared)
+
+    assert tc.prepare_and_cache_transcription("abc") == prepared
+    assert tc.get_cached_transcription("abc") == prepared
+
+
+def test_load_racing_an_invalidation_is_not_cached(monkeypatch):
+    prepared = ("stale-etag", {"transcription": {"segments": []}})
+
+    def prepare(video_hash):
+        # A write lands while the load is still running
+        tc._invalidate_transcription_cache(video_hash)
+        return prepared
+
+    monkeypatch.setattr(tc, "_prepare_transcription", prepare)
+
+    assert tc.prepare_and_cache_transcription("abc") == prepared
+    assert tc.get_cached_transcription("abc") is None, "A stale load must not overwrite the invalidation"
+
+
+def test_missing_transcription_is_not_cached(monkeypatch):
+    monkeypatch.setattr(tc, "_prepare_transcription", lambda video_hash: None)
+
+    assert tc.prepare_and_cache_transcription("abc") is None
+    assert tc.get_cached_transcription("abc") is None
+
+
+def test_prepared_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(tc, "_prepare_transcription", lambda video_hash: (video_hash, {}))
+    for i in range(tc.TRANSCRIPTION_CACHE_SIZE + 5):
+        tc.prepare_and_cache_transcription(f"hash-{i}")
+
+    assert len(tc._transcription_cache) == tc.TRANSCRIPTION_CACHE_SIZE
+    assert tc.get_cached_transcription("hash-0") is None, "Least recently used entries are evicted first"
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
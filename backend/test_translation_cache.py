@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for TranslationService.translate_segments text deduplication and the
+(source_lang, text) translation LRU, with the model calls faked out
+"""
+
+import pytest
+
+from services import translation_service
+from services.translation_service import TranslationService
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Route translate_segments through a fake CTranslate2 path that records each batch"""
+    batches = []
+
+    def fake_translate_ct2(translator, tokenizer, texts, max_batch_size):
+        batches.append(list(texts))
+        return [f"EN:{text}" for text in texts]
+
+    monkeypatch.setattr(TranslationService, "get_marian_model", classmethod(lambda cls, lang: (None, None)))
+    monkeypatch.setattr(TranslationService, "get_ct2_translator", classmethod(lambda cls, lang: object()))
+    monkeypatch.setattr(TranslationService, "_translate_ct2", staticmethod(fake_translate_ct2))
+    monkeypatch.setattr(translation_service, "_cuda_available", lambda: False)
+    monkeypatch.setattr(translation_service.settings, "TRANSLATION_NUM_BEAMS", 1)
+    monkeypatch.setattr(TranslationService, "_translation_cache", type(TranslationService._translation_cache)())
+    return batches
+
+
+def test_repeated_texts_are_translated_once(fake_model):
+    segments = [{"text": "Sí."}, {"text": "Hola"}, {"text": " Sí. "}, {"text": ""}]
+
+    TranslationService.translate_segments(segments, "es")
+
+    assert [sorted(batch) for batch in fake_model] == [["Hola", "Sí."]]
+    assert [s["translation"] for s in segments] == ["EN:Sí.", "EN:Hola", "EN:Sí.", "[No speech detected]"]
+
+
+def test_cached_translations_skip_the_model(fake_model):
+    TranslationService.translate_segments([{"text": "Hola"}], "es")
+    progress = []
+    segments = [{"text": "Hola"}, {"text": "Adiós"}]
+
+    TranslationService.translate_segments(segments, "es", progress_callback=lambda done, total: progress.append((done, total)))
+
+    assert fake_model == [["Hola"], ["Adiós"]], "Only the uncached text reaches the model"
+    assert [s["translation"] for s in segments] == ["EN:Hola", "EN:Adiós"]
+    assert progress == [(1, 2), (2, 2)]
+
+    # The cache is keyed by source language too
+    TranslationService.translate_segments([{"text": "Hola"}], "it")
+    assert fake_model[-1] == ["Hola"]
+
+
+def test_translation_cache_evicts_least_recently_used(fake_model, monkeypatch):
+    monkeypatch.setattr(translation_service.settings, "TRANSLATION_CACHE_SIZE", 2)
+
+    TranslationService.translate_segments([{"text": "uno"}, {"text": "dos"}], "es")
+    TranslationService.translate_segments([{"text": "uno"}], "es")  # refreshes "uno"
+    TranslationService.translate_segments([{"text": "tres"}], "es")  # evicts "dos"
+
+    assert list(TranslationService._translation_cache) == [("es", "uno"), ("es", "tres")]
+
+
+def test_failed_translations_are_not_cached(fake_model, monkeypatch):
+    def failing_translate_ct2(translator, tokenizer, texts, max_batch_size):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(TranslationService, "_translate_ct2", staticmethod(failing_translate_ct2))
+    monkeypatch.setattr(
+        TranslationService, "_translate_texts_individually",
+        classmethod(lambda cls, texts, tokenizer, model: [None] * len(texts))
+    )
+    segments = [{"text": "Hola"}]
+
+    TranslationService.translate_segments(segments, "es")
+
+    assert segments[0]["translation"] is None
+    assert ("es", "Hola") not in TranslationService._translation_cache
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
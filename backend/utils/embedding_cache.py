@@ -0,0 +1,107 @@
+"""
+On-disk cache of per-video speaker segment embeddings
+
+Files are named <video key>_<segments digest>.npy inside
+settings.SPEAKER_EMBEDDING_CACHE_DIR, so every entry of a video can be
+removed with its transcription. The directory is capped by age and total
+size (on Cloud Run the writable filesystem is instance memory).
+"""
+import glob
+import hashlib
+import json
+import os
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+
+
+def _video_key(cache_key: str) -> str:
+    """Filesystem-safe prefix shared by all entries of one video"""
+    return hashlib.sha1(cache_key.encode()).hexdigest()[:16]
+
+
+def cache_path(cache_key: str, segments: List[Tuple[float, float]], tag: str = "") -> str:
+    """Path of the entry for these segments of the given video"""
+    digest = hashlib.sha1(
+        f"{tag}|{json.dumps([[float(s), float(e)] for s, e in segments])}".encode()
+    ).hexdigest()
+    return os.path.join(settings.SPEAKER_EMBEDDING_CACHE_DIR, f"{_video_key(cache_key)}_{digest}.npy")
+
+
+def load(path: str, expected_rows: int) -> Optional[np.ndarray]:
+    """Load a cached entry, or None if missing/invalid; hits are touched to stay recent"""
+    if not os.path.exists(path):
+        return None
+    try:
+        embeddings = np.load(path)
+        if embeddings.shape[0] != expected_rows:
+            return None
+        os.utime(path)
+        return embeddings
+    except Exception as e:
+        print(f"Error loading cached embeddings {path}: {e}")
+        return None
+
+
+def save(path: str, embeddings: np.ndarray) -> None:
+    """Write an entry, then prune the cache back under its limits"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.save(path, embeddings)
+    except Exception as e:
+        print(f"Error caching embeddings to {path}: {e}")
+        return
+    prune()
+
+
+def prune() -> int:
+    """Drop entries older than the max age, then the least recently used ones over the size cap
+
+    Returns:
+        Number of files removed
+    """
+    max_age = settings.SPEAKER_EMBEDDING_CACHE_MAX_AGE_HOURS * 3600
+    max_bytes = settings.SPEAKER_EMBEDDING_CACHE_MAX_MB * 1024 * 1024
+    now = time.time()
+
+    entries = []
+    for path in glob.glob(os.path.join(settings.SPEAKER_EMBEDDING_CACHE_DIR, "*.npy")):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()  # oldest first
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        if now - mtime <= max_age and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+        total -= size
+    return removed
+
+
+def delete_video(cache_key: str) -> int:
+    """Remove every cached entry of a video
+
+    Returns:
+        Number of files removed
+    """
+    removed = 0
+    pattern = os.path.join(settings.SPEAKER_EMBEDDING_CACHE_DIR, f"{_video_key(cache_key)}_*.npy")
+    for path in glob.glob(pattern):
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError as e:
+            print(f"Error deleting cached embeddings {path}: {e}")
+    return removed
@@ -2,18 +2,41 @@
 File utility functions
 """
 import hashlib
+import os
+import shutil
 
 
 def generate_file_hash(file_path: str) -> str:
-    """Generate a unique hash for a file based on its content"""
-    BUF_SIZE = 65536  # 64kb chunks
+    """Generate a unique hash for a file based on its content.
+
+    Must stay a full-content SHA-256: the frontend computes the same digest
+    client-side (utils/file.ts) and uses it as the video_hash for uploads.
+    """
+    BUF_SIZE = 8 * 1024 * 1024  # 8MB chunks, matching the frontend hasher
     sha256 = hashlib.sha256()
+    buffer = bytearray(BUF_SIZE)
+    view = memoryview(buffer)
 
-    with open(file_path, 'rb') as f:
+    # readinto reuses one buffer instead of allocating a bytes object per chunk;
+    # hashlib releases the GIL while digesting large chunks
+    with open(file_path, 'rb', buffering=0) as f:
         while True:
-            data = f.read(BUF_SIZE)
-            if not data:
+            size = f.readinto(buffer)
+            if not size:
                 break
-            sha256.update(data)
+            sha256.update(view[:size])
 
     return sha256.hexdigest()
+
+
+def link_or_copy(src: str, dst: str) -> None:
+    """Place src at dst without rewriting its bytes when possible.
+
+    A hardlink is O(1) and keeps the data alive after src (e.g. a temp file) is
+    removed; across filesystems (EXDEV) or where links are unsupported it falls
+    back to a full copy.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
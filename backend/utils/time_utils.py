@@ -1,6 +1,9 @@
 """
 Time and timestamp formatting utilities
 """
+from typing import List, Sequence
+
+import numpy as np
 
 
 def format_timestamp(seconds: float) -> str:
@@ -17,6 +20,27 @@ def format_timestamp(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
 
 
+def format_timestamps(seconds: Sequence[float]) -> List[str]:
+    """Format many values like format_timestamp, doing the arithmetic as array ops.
+
+    Gives identical strings: truncation and floor division follow the same
+    float64/int rules as the scalar version.
+    """
+    seconds = np.asarray(seconds, dtype=np.float64)
+    total_secs = np.trunc(seconds)
+    milliseconds = ((seconds - total_secs) * 1000).astype(np.int64)  # truncates toward zero like int()
+    total_secs = total_secs.astype(np.int64)
+
+    hours = total_secs // 3600
+    minutes = (total_secs % 3600) // 60
+    secs = total_secs % 60
+
+    return [
+        f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+        for h, m, s, ms in zip(hours.tolist(), minutes.tolist(), secs.tolist(), milliseconds.tolist())
+    ]
+
+
 def format_srt_timestamp(seconds: float) -> str:
     """Convert seconds to SRT subtitle format (HH:MM:SS,mmm)"""
     total_secs = int(seconds)
@@ -59,6 +83,45 @@ def time_to_seconds(time_str: str) -> float:
         return 0.0
 
 
+def times_to_seconds(time_strs: Sequence[str]) -> np.ndarray:
+    """Convert many HH:MM:SS[.mmm] time strings to seconds at once.
+
+    Timestamps produced by format_timestamp are fixed-width, so they are parsed
+    as one uint8 digit matrix; anything else falls back to time_to_seconds per
+    string. Results equal time_to_seconds exactly: the seconds field is rounded
+    once from its millisecond count, as float() parses it, and added last.
+    """
+    count = len(time_strs)
+    if count == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    width = len(time_strs[0])
+    if width in (8, 12) and all(isinstance(t, str) and len(t) == width for t in time_strs):
+        try:
+            chars = np.frombuffer("".join(time_strs).encode("ascii"), dtype=np.uint8).reshape(count, width)
+        except UnicodeEncodeError:
+            chars = None
+
+        if chars is not None:
+            digit_cols = [0, 1, 3, 4, 6, 7] + ([9, 10, 11] if width == 12 else [])
+            digits = chars[:, digit_cols].astype(np.int64) - ord("0")
+            separators_ok = (chars[:, 2] == ord(":")).all() and (chars[:, 5] == ord(":")).all() and (
+                width == 8 or (chars[:, 8] == ord(".")).all()
+            )
+            if separators_ok and ((digits >= 0) & (digits <= 9)).all():
+                hours_minutes = (
+                    (digits[:, 0] * 10 + digits[:, 1]) * 3600
+                    + (digits[:, 2] * 10 + digits[:, 3]) * 60
+                ).astype(np.float64)
+                secs = digits[:, 4] * 10 + digits[:, 5]
+                if width == 12:
+                    millis = secs * 1000 + digits[:, 6] * 100 + digits[:, 7] * 10 + digits[:, 8]
+                    return hours_minutes + millis / 1000.0
+                return hours_minutes + secs
+
+    return np.fromiter((time_to_seconds(t) for t in time_strs), dtype=np.float64, count=count)
+
+
 def time_diff_minutes(start_time: str, end_time: str) -> float:
     """Calculate the difference between two timestamps in minutes"""
     try:
@@ -0,0 +1,174 @@
+"""
+Transcript helpers shared by the transcription endpoints and background jobs
+"""
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.time_utils import format_timestamp, times_to_seconds
+
+logger = logging.getLogger(__name__)
+
+# Source languages that need no translation; their 'translation' mirrors 'text'
+ENGLISH_LANGUAGE_CODES = frozenset({'en', 'english'})
+
+
+def fix_segment_durations(segments: List[Dict], max_duration_per_word: float = 2.0,
+                          min_duration: float = 0.5, max_segment_duration: float = 30.0) -> List[Dict]:
+    """
+    Fix segments with unreasonably long durations caused by chunk boundary processing.
+
+    This addresses the issue where Whisper creates incorrectly long segments during chunk
+    processing. When segments are discarded at chunk boundaries, the previous segment's
+    end time can be incorrectly extended (e.g., a single word spanning 178 seconds).
+
+    Args:
+        segments: List of segments to fix
+        max_duration_per_word: Maximum expected seconds per word (default: 2.0)
+        min_duration: Minimum segment duration in seconds (default: 0.5)
+        max_segment_duration: Absolute maximum segment duration in seconds (default: 30.0)
+
+    Returns:
+        Segments with corrected durations
+    """
+    n = len(segments)
+    if n == 0:
+        return segments
+
+    # Read the fields once into columns and test every segment in one vectorized pass;
+    # only the (rare) flagged segments are touched in Python
+    starts = np.fromiter((segment.get('start', 0) for segment in segments), dtype=np.float64, count=n)
+    ends = np.fromiter((segment.get('end', 0) for segment in segments), dtype=np.float64, count=n)
+    # Skip silent segments (they're meant to have longer durations)
+    silent = np.fromiter((bool(segment.get('is_silent', False)) for segment in segments), dtype=bool, count=n)
+    word_counts = np.fromiter(
+        (len((segment.get('text') or '').split()) or 1 for segment in segments), dtype=np.int64, count=n
+    )
+
+    # Calculate expected max duration based on word count
+    # Use a reasonable estimate: average speaking rate is ~2-3 words per second
+    # So 2 seconds per word is very generous
+    expected_max = np.minimum(np.maximum(word_counts * max_duration_per_word, min_duration), max_segment_duration)
+
+    # If duration is way too long, fix it (allow 3x tolerance before fixing)
+    durations = ends - starts
+    fixed = np.flatnonzero(~silent & (durations > expected_max * 3))
+
+    for i in fixed.tolist():
+        segment = segments[i]
+        duration = float(durations[i])
+        new_end = float(starts[i] + expected_max[i])
+        text = (segment.get('text') or '').strip()
+        print(f"Fixing segment duration: '{text[:50]}...' was {duration:.1f}s ({duration/60:.1f}min), now {expected_max[i]:.1f}s (words: {word_counts[i]})")
+        segment['end'] = new_end
+        # Update end_time string too
+        segment['end_time'] = format_timestamp(new_end)
+
+    if len(fixed) > 0:
+        print(f"Fixed {len(fixed)} segments with unreasonably long durations")
+
+    return segments
+
+
+def plan_summary_sections(transcription: Dict) -> Tuple[int, List[Dict], List[str]]:
+    """Group segments into sections and collect the text to summarize for each.
+
+    Returns:
+        (sections_count, section_entries, texts_to_summarize) where section_entries
+        holds the title/start/end/screenshot_url of each non-empty section, aligned
+        with texts_to_summarize
+    """
+    tr = transcription['transcription']
+    segments = tr['segments']
+    is_non_english = tr.get('language', '').lower() not in ENGLISH_LANGUAGE_CODES
+    logger.debug("[Summary] Found %d segments for summarization", len(segments))
+
+    # Read the segment dicts once into per-field columns; every pass below
+    # (grouping, text assembly, screenshot lookup) works on these arrays
+    segment_count = len(segments)
+    starts = times_to_seconds([seg['start_time'] for seg in segments])
+    ends = times_to_seconds([seg['end_time'] for seg in segments])
+    texts = np.array([seg.get("text") or "" for seg in segments], dtype=object)
+    translations = np.array(
+        [seg.get("translation") or seg.get("text") or "" for seg in segments], dtype=object
+    )
+    screenshot_urls = np.array([seg.get("screenshot_url") for seg in segments], dtype=object)
+    has_text = texts != ""
+    has_translation = translations != ""
+    has_screenshot = np.array([bool(url) for url in screenshot_urls], dtype=bool)
+
+    logger.debug("[Summary] Segments with screenshot_url: %d/%d", int(has_screenshot.sum()), segment_count)
+
+    # Group segments into logical sections (roughly 1-3 minutes each)
+    sections = []
+    min_section_duration = 1  # Minimum section duration in minutes
+    max_section_duration = 3  # Maximum section duration in minutes
+
+    # pauses[i] is the gap before segment i
+    pauses = np.zeros(segment_count, dtype=np.float64)
+    pauses[1:] = starts[1:] - ends[:-1]
+
+    section_bounds = []  # (a, b) segment index range of each section
+    section_start = "00:00:00"
+    section_base = 0.0
+    a = 0
+    while a < segment_count:
+        # Break before the first later segment where the section has reached the
+        # minimum duration and either follows a significant (>2s) pause or the
+        # section has reached the maximum duration
+        elapsed = (starts[a + 1:] - section_base) / 60
+        breaks = (elapsed >= min_section_duration) & (
+            (pauses[a + 1:] > 2) | (elapsed >= max_section_duration)
+        )
+        b = a + 1 + int(breaks.argmax()) if breaks.any() else segment_count
+
+        sections.append({
+            "start": section_start,
+            "end": segments[b - 1]['end_time'],
+        })
+        section_bounds.append((a, b))
+
+        if b < segment_count:
+            section_start = segments[b]['start_time']
+            section_base = starts[b]
+        a = b
+
+    logger.debug("[Summary] Created %d logical sections for summarization", len(sections))
+
+    # Collect the text to summarize for each non-empty section by slicing the text columns
+    section_entries = []
+    texts_to_summarize = []
+    for section, (a, b) in zip(sections, section_bounds):
+        section_text = " ".join(texts[a:b][has_text[a:b]])
+
+        # Only use translation if it's different from the original
+        text_to_summarize = section_text
+        if is_non_english:
+            translated_text = " ".join(translations[a:b][has_translation[a:b]])
+            if translated_text != section_text:
+                text_to_summarize = translated_text
+
+        # Skip empty sections
+        if not text_to_summarize:
+            continue
+
+        # Get screenshot_url from first segment of the section
+        section_has_screenshot = has_screenshot[a:b]
+        screenshot_url = None
+        if section_has_screenshot.any():
+            screenshot_url = screenshot_urls[a + int(section_has_screenshot.argmax())]
+
+        # Debug log for first few sections
+        if len(section_entries) < 3:
+            logger.debug("[Summary] Section %d: screenshot_url=%s", len(section_entries), screenshot_url)
+
+        section_entries.append({
+            "title": f"Section {section['start']}-{section['end']}",
+            "start": section["start"],
+            "end": section["end"],
+            "screenshot_url": screenshot_url
+        })
+        texts_to_summarize.append(text_to_summarize)
+
+    return len(sections), section_entries, texts_to_summarize
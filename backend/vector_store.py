@@ -871,101 +871,36 @@ class VectorStore:
             "audio_updated": 0
         }
 
-        # Update text collection (video_{hash})
-        try:
-            collection_name = f"video_{video_hash}"
-            collection = self.client.get_collection(name=collection_name)
-
-            # Get all items in the collection
-            all_items = collection.get(
-                include=["metadatas"]
-            )
-
-            if all_items and all_items['ids']:
-                # Find items with the old speaker name
-                ids_to_update = []
-                updated_metadatas = []
-
-                for i, metadata in enumerate(all_items['metadatas']):
-                    if metadata.get('speaker') == old_speaker:
-                        ids_to_update.append(all_items['ids'][i])
-                        # Create updated metadata
-                        new_metadata = metadata.copy()
-                        new_metadata['speaker'] = new_speaker
-                        updated_metadatas.append(new_metadata)
-
-                # Update the items with new metadata
-                if ids_to_update:
-                    collection.update(
-                        ids=ids_to_update,
-                        metadatas=updated_metadatas
-                    )
-                    results['text_updated'] = len(ids_to_update)
-                    print(f"Updated {len(ids_to_update)} text chunks from '{old_speaker}' to '{new_speaker}'")
-
-        except Exception as e:
-            print(f"Error updating text collection: {str(e)}")
-
-        # Update image collection (video_{hash}_images)
-        try:
-            collection_name = f"video_{video_hash}_images"
-            collection = self.client.get_collection(name=collection_name)
-
-            # Get all items in the collection
-            all_items = collection.get(
-                include=["metadatas"]
-            )
-
-            if all_items and all_items['ids']:
-                # Find items with the old speaker name
-                ids_to_update = []
-                updated_metadatas = []
-
-                for i, metadata in enumerate(all_items['metadatas']):
-                    if metadata.get('speaker') == old_speaker:
-                        ids_to_update.append(all_items['ids'][i])
-                        # Create updated metadata
-                        new_metadata = metadata.copy()
-                        new_metadata['speaker'] = new_speaker
-                        updated_metadatas.append(new_metadata)
-
-                # Update the items with new metadata
-                if ids_to_update:
-                    collection.update(
-                        ids=ids_to_update,
-                        metadatas=updated_metadatas
-                    )
-                    results['images_updated'] = len(ids_to_update)
-                    print(f"Updated {len(ids_to_update)} images from '{old_speaker}' to '{new_speaker}'")
-
-        except Exception as e:
-            print(f"Error updating image collection: {str(e)}")
-
-        # Update audio collection (video_{hash}_audio)
-        try:
-            collection_name = f"video_{video_hash}_audio"
-            collection = self.client.get_collection(name=collection_name)
-
-            all_items = collection.get(include=["metadatas"])
-
-            if all_items and all_items['ids']:
-                ids_to_update = []
-                updated_metadatas = []
-
-                for i, metadata in enumerate(all_items['metadatas']):
-                    if metadata.get('speaker') == old_speaker:
-                        ids_to_update.append(all_items['ids'][i])
-                        new_metadata = metadata.copy()
-                        new_metadata['speaker'] = new_speaker
-                        updated_metadatas.append(new_metadata)
+        # Text (video_{hash}), image (video_{hash}_images) and audio
+        # (video_{hash}_audio) collections all carry a 'speaker' metadata field
+        collections = (
+            ("", "text_updated", "text chunks"),
+            ("_images", "images_updated", "images"),
+            ("_audio", "audio_updated", "audio events"),
+        )
 
-                if ids_to_update:
-                    collection.update(ids=ids_to_update, metadatas=updated_metadatas)
-                    results['audio_updated'] = len(ids_to_update)
-                    print(f"Updated {len(ids_to_update)} audio events from '{old_speaker}' to '{new_speaker}'")
+        for suffix, result_key, label in collections:
+            try:
+                collection = self.client.get_collection(name=f"video_{video_hash}{suffix}")
+
+                # Let Chroma filter on the old speaker instead of pulling every
+                # item's metadata and scanning it here
+                matching = collection.get(
+                    where={"speaker": old_speaker},
+                    include=["metadatas"]
+                )
+
+                if matching and matching['ids']:
+                    updated_metadatas = [
+                        {**metadata, 'speaker': new_speaker}
+                        for metadata in matching['metadatas']
+                    ]
+                    collection.update(ids=matching['ids'], metadatas=updated_metadatas)
+                    results[result_key] = len(matching['ids'])
+                    print(f"Updated {len(matching['ids'])} {label} from '{old_speaker}' to '{new_speaker}'")
 
-        except Exception as e:
-            print(f"Error updating audio collection: {str(e)}")
+            except Exception as e:
+                print(f"Error updating {label} collection: {str(e)}")
 
         return results
 